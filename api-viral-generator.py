@@ -8,9 +8,15 @@ import json
 import os
 import sys
 import time
-import requests
 from datetime import datetime
 
+import script_store
+from artifact_catalog import record_artifacts
+from job_workspace import JobWorkspace
+from sse_client import sse
+
+API_URL = os.environ.get('API_URL', 'http://localhost:3000')
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -25,14 +31,12 @@ class Colors:
     END = '\033[0m'
 
 def load_viral_scripts():
-    """Cargar scripts virales"""
-    script_path = 'data/viral-scripts.json'
-    if not os.path.exists(script_path):
-        print(f"{Colors.RED}❌ viral-scripts.json no encontrado!{Colors.END}")
+    """Cargar los scripts del menú (5 por canal) desde el script store"""
+    scripts_data = script_store.load_viral_scripts(limit=5)
+    if not any(scripts_data.values()):
+        print(f"{Colors.RED}❌ No hay scripts virales (data/viral-scripts.json o {script_store.DB_PATH})!{Colors.END}")
         sys.exit(1)
-    
-    with open(script_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return scripts_data
 
 def animated_progress_bar(current, total, message="", width=50):
     """Display animated progress bar"""
@@ -126,11 +130,11 @@ def prepare_and_send_to_api(script):
         synced_data['segments'].append(segment)
         current_time += time_per_segment
     
-    # Guardar en synced-data.json para que la API lo use
-    with open('src/remotion/synced-data.json', 'w', encoding='utf-8') as f:
-        json.dump(synced_data, f, indent=2, ensure_ascii=False)
+    # Guardar en el manifiesto de un job propio, que se pasa a la API
+    workspace = JobWorkspace.create(f"viral_{script['id']}")
+    workspace.write_manifest(synced_data)
     
-    return video_style, synced_data
+    return video_style, synced_data, workspace
 
 def generate_viral_video_direct(script):
     """Generar video usando la API directamente"""
@@ -144,8 +148,8 @@ def generate_viral_video_direct(script):
     
     # Preparar datos
     print(f"{Colors.YELLOW}Preparando contenido viral...{Colors.END}")
-    video_style, synced_data = prepare_and_send_to_api(script)
-    print(f"{Colors.GREEN}✅ Contenido preparado{Colors.END}")
+    video_style, synced_data, workspace = prepare_and_send_to_api(script)
+    print(f"{Colors.GREEN}✅ Contenido preparado (job {workspace.id}){Colors.END}")
     print(f"{Colors.CYAN}🎨 Estilo visual: {video_style}{Colors.END}\n")
     
     # Conectar con la API usando SSE
@@ -153,82 +157,72 @@ def generate_viral_video_direct(script):
     
     try:
         # Usar el endpoint de generación sincronizada con los parámetros correctos
-        url = f'http://localhost:3000/api/video/generate-synced?duration={script["duration"]}&style={video_style}'
-        
-        response = requests.get(
-            url,
-            stream=True,
-            timeout=1200  # 20 minutos
-        )
+        url = f'{API_URL}/api/video/generate-synced?{workspace.query(duration=script["duration"], style=video_style)}'
         
         video_path = None
         last_progress = 0
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        
-                        if data['type'] == 'start':
-                            animated_progress_bar(0, 100, data['message'])
-                            
-                        elif data['type'] == 'progress':
-                            progress = data.get('progress', last_progress)
-                            last_progress = progress
-                            
-                            # Mostrar detalles si están disponibles
-                            message = data['message']
-                            if 'details' in data:
-                                if 'segment' in data['details']:
-                                    segment_info = data['details']['segment']
-                                    if isinstance(segment_info, str) and len(segment_info) > 40:
-                                        segment_info = segment_info[:40] + "..."
-                                    message = f"{message} [{segment_info}]"
-                            
-                            animated_progress_bar(progress, 100, message)
-                            
-                        elif data['type'] == 'complete':
-                            animated_progress_bar(100, 100, "¡Completado!")
-                            video_path = data['videoPath']
-                            
-                            print(f"\n\n{Colors.GREEN}{'🎉' * 25}{Colors.END}")
-                            print(f"{Colors.BOLD}{Colors.GREEN}¡VIDEO VIRAL GENERADO EXITOSAMENTE!{Colors.END}")
-                            print(f"{Colors.GREEN}{'🎉' * 25}{Colors.END}\n")
-                            
-                            print(f"{Colors.WHITE}📁 Video guardado en:{Colors.END}")
-                            print(f"   {Colors.CYAN}{video_path}{Colors.END}")
-                            print(f"\n{Colors.YELLOW}📊 Métricas esperadas:{Colors.END}")
-                            print(f"   Views: {Colors.GREEN}{script['expectedViews']}{Colors.END}")
-                            print(f"   Duración: {Colors.GREEN}{script['duration']}s{Colors.END}")
-                            print(f"   Tags: {Colors.GREEN}{', '.join(script['tags'])}{Colors.END}")
-                            
-                            # Guardar metadata
-                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                            metadata_path = f"output/viral_{script['id']}_{timestamp}.json"
-                            
-                            metadata = {
-                                'script': script,
-                                'videoPath': video_path,
-                                'generatedAt': datetime.now().isoformat(),
-                                'videoStyle': video_style,
-                                'syncedData': synced_data
-                            }
-                            
-                            with open(metadata_path, 'w', encoding='utf-8') as f:
-                                json.dump(metadata, f, indent=2, ensure_ascii=False)
-                            
-                            print(f"\n{Colors.GREEN}📝 Metadata guardada en:{Colors.END}")
-                            print(f"   {Colors.CYAN}{metadata_path}{Colors.END}")
-                            break
-                            
-                        elif data['type'] == 'error':
-                            print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                            return None
-                            
-                    except json.JSONDecodeError as e:
-                        pass  # Ignorar líneas que no son JSON
+        for data in sse.json_events('GET', url):
+            if data['type'] == 'start':
+                animated_progress_bar(0, 100, data['message'])
+                
+            elif data['type'] == 'progress':
+                progress = data.get('progress', last_progress)
+                last_progress = progress
+                
+                # Mostrar detalles si están disponibles
+                message = data['message']
+                if 'details' in data:
+                    if 'segment' in data['details']:
+                        segment_info = data['details']['segment']
+                        if isinstance(segment_info, str) and len(segment_info) > 40:
+                            segment_info = segment_info[:40] + "..."
+                        message = f"{message} [{segment_info}]"
+                
+                animated_progress_bar(progress, 100, message)
+                
+            elif data['type'] == 'complete':
+                animated_progress_bar(100, 100, "¡Completado!")
+                video_path = data['videoPath']
+                
+                print(f"\n\n{Colors.GREEN}{'🎉' * 25}{Colors.END}")
+                print(f"{Colors.BOLD}{Colors.GREEN}¡VIDEO VIRAL GENERADO EXITOSAMENTE!{Colors.END}")
+                print(f"{Colors.GREEN}{'🎉' * 25}{Colors.END}\n")
+                
+                print(f"{Colors.WHITE}📁 Video guardado en:{Colors.END}")
+                print(f"   {Colors.CYAN}{video_path}{Colors.END}")
+                print(f"\n{Colors.YELLOW}📊 Métricas esperadas:{Colors.END}")
+                print(f"   Views: {Colors.GREEN}{script['expectedViews']}{Colors.END}")
+                print(f"   Duración: {Colors.GREEN}{script['duration']}s{Colors.END}")
+                print(f"   Tags: {Colors.GREEN}{', '.join(script['tags'])}{Colors.END}")
+                
+                # Guardar metadata
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                metadata_path = f"output/viral_{script['id']}_{timestamp}.json"
+                
+                metadata = {
+                    'script': script,
+                    'videoPath': video_path,
+                    'generatedAt': datetime.now().isoformat(),
+                    'videoStyle': video_style,
+                    'jobId': workspace.id,
+                    'syncedData': synced_data
+                }
+                
+                with open(metadata_path, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, indent=2, ensure_ascii=False)
+                record_artifacts(
+                    {video_path: 'render', metadata_path: 'metadata', workspace.manifest_path: 'manifest'},
+                    job_id=workspace.id, script_id=script['id']
+                )
+                
+                print(f"\n{Colors.GREEN}📝 Metadata guardada en:{Colors.END}")
+                print(f"   {Colors.CYAN}{metadata_path}{Colors.END}")
+                break
+                
+            elif data['type'] == 'error':
+                print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                return None
         
         return video_path
         
@@ -262,7 +256,7 @@ def main():
     # Verificar servidor
     print(f"{Colors.CYAN}Verificando servidor...{Colors.END}")
     try:
-        response = requests.get('http://localhost:3000/health', timeout=2)
+        response = sse.request('GET', f'{API_URL}/health', timeout=2)
         if response.status_code != 200:
             raise Exception("Server not healthy")
         print(f"{Colors.GREEN}✓ Servidor activo{Colors.END}\n")
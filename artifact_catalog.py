@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Artifact catalog for output/
+Every file a generator produces (segment WAVs, combined audio, transcripts,
+B-roll, videos, metadata) is recorded with its job id, script id, stage,
+sha256, size, duration and creation time in an append-only JSONL file, so
+clients look artifacts up by job/script/stage instead of globbing output/ and
+guessing file names.
+
+Writers append one line per change under an exclusive lock; readers keep an
+in-memory index and only read the lines appended since their last refresh.
+Each process shares one catalog per file (default_catalog), so the index is
+built once and a write only applies its own line.
+A partially written last line is ignored until it is complete. Removing an
+artifact appends a tombstone; `compact` rewrites the file without them.
+
+Usage:
+    from artifact_catalog import default_catalog
+    catalog = default_catalog()
+    catalog.record(video_path, job_id=workspace.id, script_id='psych_001', stage='render')
+    latest = catalog.latest(script_id='psych_001', stage='render')
+
+Run:
+    python3 artifact_catalog.py list --script psych_001 --stage render
+    python3 artifact_catalog.py compact
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import wave
+from collections import defaultdict
+from datetime import datetime
+
+# Directory of this file; catalog paths inside it are stored relative to it
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CATALOG_PATH = os.environ.get('ARTIFACT_CATALOG_PATH', os.path.join(PROJECT_ROOT, 'output', 'catalog.jsonl'))
+
+# Fields with a secondary index; find() starts from the smallest matching set
+INDEXED = ('job_id', 'script_id', 'stage')
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def media_duration(path):
+    """Duration in seconds of a WAV (read directly) or other media file (ffprobe, if installed), else None"""
+    if path.endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as w:
+                return w.getnframes() / w.getframerate()
+        except (wave.Error, EOFError):
+            return None
+    if path.endswith(('.mp4', '.mp3', '.m4a', '.webm')) and shutil.which('ffprobe'):
+        probe = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', path],
+            capture_output=True, text=True
+        )
+        try:
+            return float(probe.stdout.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def catalog_key(path):
+    """Catalog paths are relative to the project root when inside it, so nodes sharing output/ agree"""
+    absolute = os.path.abspath(path)
+    relative = os.path.relpath(absolute, PROJECT_ROOT)
+    return absolute if relative.startswith('..') else relative
+
+
+def resolve_key(key):
+    """Absolute path of a catalog key, whatever the working directory"""
+    return os.path.join(PROJECT_ROOT, key)
+
+
+class ArtifactCatalog:
+    """Append-only artifact log with an in-memory index"""
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._reset()
+
+    # Index
+
+    def _reset(self, inode=None):
+        self._inode = inode
+        self._offset = 0
+        self._entries = {}
+        self._index = {field: defaultdict(set) for field in INDEXED}
+
+    def _apply(self, entry):
+        key = entry['path']
+        previous = self._entries.pop(key, None)
+        if previous:
+            for field in INDEXED:
+                self._index[field][previous.get(field)].discard(key)
+        if entry.get('removed'):
+            return
+        self._entries[key] = entry
+        for field in INDEXED:
+            self._index[field][entry.get(field)].add(key)
+
+    def refresh(self):
+        """Read the lines other processes appended since the last refresh"""
+        if not os.path.exists(self.path):
+            return self
+        with open(self.path, 'rb') as f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._inode:
+                # First read, or compacted (replaced) by another process: rebuild
+                self._reset(inode)
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                self._offset += len(line)
+                if line.strip():
+                    self._apply(json.loads(line))
+        return self
+
+    # Writes
+
+    def _append(self, entry):
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        while True:
+            with open(self.path, 'ab') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    stat = os.fstat(f.fileno())
+                    # compact() may have replaced the file while we waited for the lock
+                    if stat.st_ino != os.stat(self.path).st_ino:
+                        continue
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    break
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        if stat.st_ino == self._inode and stat.st_size == self._offset:
+            # Nobody else appended since our last read: index our own line without re-reading the file
+            self._offset += len(line)
+            self._apply(entry)
+        else:
+            self.refresh()
+        return entry
+
+    def record(self, path, job_id=None, script_id=None, stage=None, sha256=None, duration=None, **extra):
+        """Record a produced file; a file recorded again replaces its earlier entry"""
+        stat = os.stat(path)
+        return self._append({
+            'path': catalog_key(path),
+            'job_id': job_id,
+            'script_id': script_id,
+            'stage': stage,
+            'sha256': sha256 or file_digest(path),
+            'size': stat.st_size,
+            'duration': duration if duration is not None else media_duration(path),
+            'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            **extra
+        })
+
+    def remove(self, path):
+        """Forget a file (it was deleted)"""
+        return self._append({'path': catalog_key(path), 'removed': True, 'removed_at': datetime.now().isoformat()})
+
+    def compact(self):
+        """Rewrite the log with only the live entries; returns how many lines were dropped"""
+        with open(self.path, 'ab') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                with open(self.path, 'rb') as f:
+                    lines = sum(1 for _ in f)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    for entry in sorted(self._entries.values(), key=lambda e: e['created_at']):
+                        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                os.replace(temp_path, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self.refresh()
+        return lines - len(self._entries)
+
+    # Reads
+
+    def get(self, path):
+        return self.refresh()._entries.get(catalog_key(path))
+
+    def find(self, **filters):
+        """Entries matching every given field, newest first"""
+        self.refresh()
+        indexed = [self._index[field].get(value, set()) for field, value in filters.items() if field in INDEXED]
+        keys = min(indexed, key=len) if indexed else self._entries.keys()
+        entries = [
+            self._entries[key] for key in keys
+            if all(self._entries[key].get(field) == value for field, value in filters.items())
+        ]
+        return sorted(entries, key=lambda e: e['created_at'], reverse=True)
+
+    def latest(self, **filters):
+        """Newest entry matching the filters, or None"""
+        entries = self.find(**filters)
+        return entries[0] if entries else None
+
+    def __len__(self):
+        return len(self.refresh()._entries)
+
+
+_catalogs = {}
+
+
+def default_catalog(path=CATALOG_PATH):
+    """The process-wide catalog for a file, so its index is built once rather than on every lookup"""
+    key = os.path.abspath(path)
+    if key not in _catalogs:
+        _catalogs[key] = ArtifactCatalog(path)
+    return _catalogs[key]
+
+
+def record_artifacts(stages, catalog=None, **fields):
+    """Record {path: stage} for the files that exist on this host (a remote render's video may not)"""
+    catalog = catalog or default_catalog()
+    return [catalog.record(path, stage=stage, **fields) for path, stage in stages.items() if path and os.path.exists(path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Artifact catalog for output/')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help='Catalog file (default: %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', help='List artifacts, newest first')
+    list_parser.add_argument('--job', default=None)
+    list_parser.add_argument('--script', default=None)
+    list_parser.add_argument('--stage', default=None)
+    list_parser.add_argument('--limit', type=int, default=20)
+
+    commands.add_parser('compact', help='Drop removed and superseded entries from the log')
+
+    args = parser.parse_args()
+    catalog = ArtifactCatalog(args.catalog)
+    if args.command == 'list':
+        filters = {k: v for k, v in (('job_id', args.job), ('script_id', args.script), ('stage', args.stage)) if v}
+        for entry in catalog.find(**filters)[:args.limit]:
+            duration = f"{entry['duration']:.1f}s" if entry.get('duration') is not None else '-'
+            print(f"{entry['created_at'][:19]}  {entry.get('stage') or '-':<10} {entry['size']:>12,}  {duration:>7}  {entry['path']}")
+    elif args.command == 'compact':
+        dropped = catalog.compact()
+        print(f"✅ {len(catalog)} artifacts, {dropped} stale lines dropped from {args.catalog}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
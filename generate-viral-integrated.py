@@ -8,10 +8,14 @@ import json
 import os
 import sys
 import time
-import requests
-import subprocess
 from datetime import datetime
 
+import script_store
+from artifact_catalog import record_artifacts
+from generate import API_URL, generate_synced_with_duration
+from job_workspace import JobWorkspace
+from sse_client import sse
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -26,17 +30,15 @@ class Colors:
     END = '\033[0m'
 
 def load_viral_scripts():
-    """Cargar scripts virales"""
-    script_path = 'data/viral-scripts.json'
-    if not os.path.exists(script_path):
-        print(f"{Colors.RED}❌ viral-scripts.json no encontrado!{Colors.END}")
+    """Cargar los scripts del menú (5 por canal) desde el script store"""
+    scripts_data = script_store.load_viral_scripts(limit=5)
+    if not any(scripts_data.values()):
+        print(f"{Colors.RED}❌ No hay scripts virales (data/viral-scripts.json o {script_store.DB_PATH})!{Colors.END}")
         sys.exit(1)
-    
-    with open(script_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return scripts_data
 
 def prepare_synced_data(script):
-    """Preparar el archivo synced-data.json con el contenido viral"""
+    """Preparar el manifiesto de un job nuevo con el contenido viral"""
     
     # Mapear estilos
     style_map = {
@@ -89,13 +91,12 @@ def prepare_synced_data(script):
         }
     }
     
-    # Guardar en archivo
-    output_path = 'src/remotion/synced-data.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(synced_data, f, indent=2, ensure_ascii=False)
+    # Guardar en el manifiesto del job
+    workspace = JobWorkspace.create(f"viral_{script['id']}")
+    workspace.write_manifest(synced_data)
     
-    print(f"{Colors.GREEN}✅ Script viral preparado en synced-data.json{Colors.END}")
-    return video_style
+    print(f"{Colors.GREEN}✅ Script viral preparado en {workspace.manifest_path}{Colors.END}")
+    return video_style, workspace
 
 def show_menu(scripts_data):
     """Mostrar menú de scripts virales"""
@@ -119,7 +120,7 @@ def show_menu(scripts_data):
     print(f"  {Colors.RED}12.{Colors.END} Salir\n")
 
 def generate_video_with_script(script, channel_name):
-    """Generar video usando generate.py con el contenido preparado"""
+    """Generar video con generate.py (importado) y el contenido preparado"""
     
     print(f"\n{Colors.CYAN}{'═' * 60}{Colors.END}")
     print(f"{Colors.BOLD}{Colors.WHITE}GENERANDO VIDEO VIRAL{Colors.END}")
@@ -128,40 +129,17 @@ def generate_video_with_script(script, channel_name):
     print(f"{Colors.CYAN}⏱️  Duración: {script['duration']} segundos{Colors.END}")
     print(f"{Colors.CYAN}{'═' * 60}{Colors.END}\n")
     
-    # Preparar synced-data.json
+    # Preparar el manifiesto del job
     print(f"{Colors.YELLOW}Preparando contenido viral...{Colors.END}")
-    video_style = prepare_synced_data(script)
+    video_style, workspace = prepare_synced_data(script)
     
-    # Ejecutar generate.py con respuestas automáticas
+    # Generar en este mismo proceso con la API de generate.py (sin menús ni subprocesos)
     print(f"{Colors.CYAN}Iniciando generación de video...{Colors.END}\n")
+    result = generate_synced_with_duration(script['duration'], video_style, workspace.manifest_path)
     
-    # Respuestas automáticas para generate.py
-    # 5 = Custom duration
-    # [duration] = duración del script
-    # [style] = estilo del video
-    # n = no abrir el video al final
-    responses = f"5\n{script['duration']}\n{video_style}\nn\n"
-    
-    # Ejecutar generate.py
-    process = subprocess.Popen(
-        ['python3', 'generate.py'],
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-        universal_newlines=True
-    )
-    
-    # Enviar respuestas y mostrar output en tiempo real
-    for line in process.stdout:
-        # Filtrar algunas líneas innecesarias
-        if not any(skip in line for skip in ['Checking server', 'Server is running', 'Enter choice']):
-            print(line, end='')
-    
-    process.stdin.write(responses)
-    process.stdin.flush()
-    process.wait()
+    if not result['success']:
+        print(f"\n{Colors.RED}❌ No se pudo generar el video: {result['error']}{Colors.END}")
+        return False
     
     # Guardar metadata
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -171,15 +149,23 @@ def generate_video_with_script(script, channel_name):
         'script': script,
         'channel': channel_name,
         'generatedAt': datetime.now().isoformat(),
-        'videoStyle': video_style
+        'videoStyle': video_style,
+        'jobId': workspace.id,
+        'videoPath': result['video_path'],
+        'generationSeconds': result['seconds']
     }
     
     with open(metadata_path, 'w', encoding='utf-8') as f:
         json.dump(metadata, f, indent=2, ensure_ascii=False)
+    record_artifacts(
+        {result['video_path']: 'render', metadata_path: 'metadata', workspace.manifest_path: 'manifest'},
+        job_id=workspace.id, script_id=script['id']
+    )
     
     print(f"\n{Colors.GREEN}{'🎉' * 20}{Colors.END}")
     print(f"{Colors.BOLD}{Colors.GREEN}¡VIDEO VIRAL GENERADO EXITOSAMENTE!{Colors.END}")
     print(f"{Colors.GREEN}{'🎉' * 20}{Colors.END}\n")
+    print(f"{Colors.WHITE}📁 Video: {result['video_path']}{Colors.END}")
     print(f"{Colors.WHITE}📝 Metadata guardada en: {metadata_path}{Colors.END}")
     
     return True
@@ -190,7 +176,7 @@ def main():
     # Verificar servidor
     print(f"{Colors.CYAN}Verificando servidor...{Colors.END}")
     try:
-        response = requests.get('http://localhost:3000/health', timeout=2)
+        response = sse.request('GET', f'{API_URL}/health', timeout=2)
         if response.status_code != 200:
             raise Exception("Server not healthy")
         print(f"{Colors.GREEN}✓ Servidor activo{Colors.END}\n")
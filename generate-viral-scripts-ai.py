@@ -10,6 +10,8 @@ import sys
 from datetime import datetime
 from openai import OpenAI
 
+import script_store
+
 # Colores ANSI
 class Colors:
     HEADER = '\033[95m'
@@ -162,37 +164,20 @@ def generate_viral_scripts_with_ai(channel_type="psychology", count=5):
         return None
 
 def save_viral_scripts(scripts, channel_type):
-    """Guardar scripts generados en archivo JSON"""
+    """Agregar los scripts generados al script store"""
     
-    # Cargar scripts existentes o crear estructura nueva
-    output_file = 'data/viral-scripts-ai-generated.json'
+    channel = "channel1_psychology" if channel_type == "psychology" else "channel2_horror"
     
-    if os.path.exists(output_file):
-        with open(output_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    else:
-        data = {
-            "channel1_psychology": [],
-            "channel2_horror": []
-        }
+    # Inserción append-only: no se relee ni reescribe la biblioteca completa
+    with script_store.open_store() as store:
+        ids = store.add(scripts, channel, source='ai')
+        total_psych = store.count(channel="channel1_psychology")
+        total_horror = store.count(channel="channel2_horror")
     
-    # Agregar nuevos scripts
-    if channel_type == "psychology":
-        data["channel1_psychology"].extend(scripts)
-    else:
-        data["channel2_horror"].extend(scripts)
-    
-    # Guardar
-    os.makedirs('data', exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n{Colors.GREEN}✅ Scripts guardados en: {output_file}{Colors.END}")
+    print(f"\n{Colors.GREEN}✅ {len(ids)} scripts guardados en: {script_store.DB_PATH}{Colors.END}")
+    print(f"{Colors.CYAN}Exportar a JSON: python3 script_store.py export data/viral-scripts-ai-generated.json --source ai{Colors.END}")
     
     # Generar resumen
-    total_psych = len(data["channel1_psychology"])
-    total_horror = len(data["channel2_horror"])
-    
     print(f"\n{Colors.CYAN}{'=' * 60}{Colors.END}")
     print(f"{Colors.BOLD}{Colors.WHITE}RESUMEN DE SCRIPTS GENERADOS{Colors.END}")
     print(f"{Colors.CYAN}{'=' * 60}{Colors.END}")
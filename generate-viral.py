@@ -5,6 +5,7 @@ Generates videos from viral scripts using existing infrastructure
 """
 
 import requests
+import asyncio
 import json
 import sys
 import time
@@ -13,6 +14,16 @@ from datetime import datetime
 import argparse
 import os
 
+import script_store
+from artifact_catalog import record_artifacts
+from host_pool import HOSTS_ENV, HostPool, parse_hosts
+from sse_client import AsyncSSEClient, SSEHTTPError, SSEIdleTimeout, idempotency_key, sse
+
+API_URL = os.environ.get('API_URL', 'http://localhost:3000')
+
+# --regenerate: submit new jobs instead of reattaching to the ones with the same script and parameters
+REGENERATE = False
+
 # Import colors from existing generate.py
 class Colors:
     HEADER = '\033[95m'
@@ -28,15 +39,13 @@ class Colors:
     END = '\033[0m'
 
 def load_viral_scripts():
-    """Load viral scripts from JSON file"""
-    script_path = 'data/viral-scripts.json'
-    if not os.path.exists(script_path):
-        print(f"{Colors.RED}❌ viral-scripts.json not found!{Colors.END}")
+    """Load viral scripts from the script store (data/viral-scripts.json is imported into it)"""
+    scripts_data = script_store.load_viral_scripts()
+    if not any(scripts_data.values()):
+        print(f"{Colors.RED}❌ No viral scripts found (data/viral-scripts.json or {script_store.DB_PATH})!{Colors.END}")
         print(f"{Colors.YELLOW}Run 'npm run test:viral' first to generate scripts{Colors.END}")
         sys.exit(1)
-    
-    with open(script_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return scripts_data
 
 def print_viral_header():
     """Print styled header for viral content"""
@@ -167,15 +176,8 @@ def get_style_number(style_name):
     }
     return style_map.get(style_name, 1)
 
-def generate_viral_video(script, channel_name):
-    """Generate video from viral script using existing API"""
-    print(f"\n{Colors.MAGENTA}{'═' * 60}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.WHITE}GENERATING VIRAL VIDEO{Colors.END}")
-    print(f"{Colors.YELLOW}Title: {script['title']}{Colors.END}")
-    print(f"{Colors.CYAN}Channel: {channel_name}{Colors.END}")
-    print(f"{Colors.GREEN}Expected Views: {script['expectedViews']}{Colors.END}")
-    print(f"{Colors.MAGENTA}{'═' * 60}{Colors.END}\n")
-    
+def build_payload(script):
+    """Request body for the generate-viral endpoint"""
     # Get style number
     style_num = get_style_number(script['style'])
     
@@ -190,88 +192,106 @@ def generate_viral_video(script, channel_name):
         # Add a default CTA if none exists
         full_script = f"{full_script} Follow for more content like this."
     
-    # Prepare the request
-    payload = {
+    return {
         'topic': script['title'],
         'script': full_script,
         'duration': script['duration'],
         'style': style_num,
         'hook': script['hook']  # Also send hook separately for reference
     }
+
+def save_metadata(script, channel_name, video_path):
+    """Write the script and channel next to the generated video"""
+    metadata = {
+        'script': script,
+        'channel': channel_name,
+        'videoPath': video_path,
+        'generatedAt': datetime.now().isoformat()
+    }
+    
+    metadata_path = video_path.replace('.mp4', '_metadata.json')
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    record_artifacts({video_path: 'render', metadata_path: 'metadata'}, script_id=script['id'])
+    return metadata_path
+
+def as_generation_event(data):
+    """Generation events as they are; a plain JSON answer becomes a complete or error event"""
+    if 'type' in data:
+        return data
+    if data.get('videoPath'):
+        return {'type': 'complete', 'videoPath': data['videoPath']}
+    return {'type': 'error', 'error': data.get('error', 'No video path returned')}
+
+def generation_key(viral_script, endpoint, **params):
+    """Idempotency key of one script on one endpoint; rerunning the CLI reattaches to the same job"""
+    # params is the request payload, which has its own 'script' field
+    return idempotency_key(viral_script['id'], REGENERATE, endpoint=endpoint, **params)
+
+def viral_events(script):
+    """Progress events for a viral video, falling back to the synced endpoint if the viral one refuses"""
+    payload = build_payload(script)
+    try:
+        key = generation_key(script, 'generate-viral', **payload)
+        for data in sse.job_events('POST', f'{API_URL}/api/video/generate-viral', key, json=payload):
+            yield as_generation_event(data)
+    except SSEHTTPError:
+        # Try fallback to regular synced endpoint
+        print(f"{Colors.YELLOW}Using fallback endpoint...{Colors.END}")
+        style_num = get_style_number(script['style'])
+        url = f'{API_URL}/api/video/generate-synced?duration={script["duration"]}&style={style_num}'
+        key = generation_key(script, 'generate-synced', duration=script['duration'], style=style_num)
+        for data in sse.job_events('GET', url, key):
+            yield as_generation_event(data)
+
+def generate_viral_video(script, channel_name):
+    """Generate video from viral script using existing API"""
+    print(f"\n{Colors.MAGENTA}{'═' * 60}{Colors.END}")
+    print(f"{Colors.BOLD}{Colors.WHITE}GENERATING VIRAL VIDEO{Colors.END}")
+    print(f"{Colors.YELLOW}Title: {script['title']}{Colors.END}")
+    print(f"{Colors.CYAN}Channel: {channel_name}{Colors.END}")
+    print(f"{Colors.GREEN}Expected Views: {script['expectedViews']}{Colors.END}")
+    print(f"{Colors.MAGENTA}{'═' * 60}{Colors.END}\n")
     
     try:
         # Start generation with SSE for progress
         print(f"{Colors.CYAN}Connecting to server...{Colors.END}")
         
-        response = requests.post(
-            'http://localhost:3000/api/video/generate-viral',
-            json=payload,
-            stream=True,
-            timeout=1200
-        )
-        
-        if response.status_code != 200:
-            # Try fallback to regular synced endpoint
-            print(f"{Colors.YELLOW}Using fallback endpoint...{Colors.END}")
-            response = requests.get(
-                f'http://localhost:3000/api/video/generate-synced?duration={script["duration"]}&style={style_num}',
-                stream=True,
-                timeout=1200
-            )
-        
         video_path = None
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        
-                        if data['type'] == 'start':
-                            animated_progress_bar(0, 100, data['message'])
-                            
-                        elif data['type'] == 'progress':
-                            animated_progress_bar(
-                                data['progress'], 
-                                100, 
-                                data['message']
-                            )
-                            
-                        elif data['type'] == 'complete':
-                            animated_progress_bar(100, 100, "Complete!")
-                            video_path = data['videoPath']
-                            
-                            # Success animation
-                            print(f"\n\n{Colors.GREEN}{'🎉' * 20}{Colors.END}")
-                            print(f"{Colors.BOLD}{Colors.GREEN}✅ VIRAL VIDEO GENERATED SUCCESSFULLY!{Colors.END}")
-                            print(f"{Colors.GREEN}{'🎉' * 20}{Colors.END}\n")
-                            
-                            print(f"{Colors.WHITE}📁 Path: {video_path}{Colors.END}")
-                            print(f"{Colors.YELLOW}📊 Expected Views: {script['expectedViews']}{Colors.END}")
-                            print(f"{Colors.CYAN}🏷️ Tags: {', '.join(script['tags'])}{Colors.END}")
-                            
-                            # Save metadata
-                            metadata = {
-                                'script': script,
-                                'channel': channel_name,
-                                'videoPath': video_path,
-                                'generatedAt': datetime.now().isoformat()
-                            }
-                            
-                            metadata_path = video_path.replace('.mp4', '_metadata.json')
-                            with open(metadata_path, 'w', encoding='utf-8') as f:
-                                json.dump(metadata, f, indent=2, ensure_ascii=False)
-                            
-                            print(f"{Colors.GREEN}📝 Metadata saved: {metadata_path}{Colors.END}")
-                            break
-                            
-                        elif data['type'] == 'error':
-                            print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                            break
-                            
-                    except json.JSONDecodeError:
-                        pass
+        for data in viral_events(script):
+            if data['type'] == 'start':
+                animated_progress_bar(0, 100, data['message'])
+                
+            elif data['type'] == 'progress':
+                animated_progress_bar(
+                    data['progress'], 
+                    100, 
+                    data['message']
+                )
+                
+            elif data['type'] == 'complete':
+                animated_progress_bar(100, 100, "Complete!")
+                video_path = data['videoPath']
+                
+                # Success animation
+                print(f"\n\n{Colors.GREEN}{'🎉' * 20}{Colors.END}")
+                print(f"{Colors.BOLD}{Colors.GREEN}✅ VIRAL VIDEO GENERATED SUCCESSFULLY!{Colors.END}")
+                print(f"{Colors.GREEN}{'🎉' * 20}{Colors.END}\n")
+                
+                print(f"{Colors.WHITE}📁 Path: {video_path}{Colors.END}")
+                print(f"{Colors.YELLOW}📊 Expected Views: {script['expectedViews']}{Colors.END}")
+                print(f"{Colors.CYAN}🏷️ Tags: {', '.join(script['tags'])}{Colors.END}")
+                
+                # Save metadata
+                metadata_path = save_metadata(script, channel_name, video_path)
+                
+                print(f"{Colors.GREEN}📝 Metadata saved: {metadata_path}{Colors.END}")
+                break
+                
+            elif data['type'] == 'error':
+                print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                break
         
         return video_path
         
@@ -279,55 +299,345 @@ def generate_viral_video(script, channel_name):
         print(f"\n{Colors.RED}❌ Connection error: {str(e)}{Colors.END}")
         return None
 
-def batch_generate(scripts_data, channel, count=3):
-    """Generate multiple videos in batch"""
+def pick_batch_scripts(scripts_data, channel, count):
+    """Scripts and channel name for a batch"""
     if channel == 'psychology':
-        scripts = scripts_data['channel1_psychology'][:count]
-        channel_name = "Psychology & Drama"
-    elif channel == 'horror':
-        scripts = scripts_data['channel2_horror'][:count]
-        channel_name = "Horror & Creepypasta"
-    else:
-        # Mix both channels
-        all_scripts = scripts_data['channel1_psychology'] + scripts_data['channel2_horror']
-        random.shuffle(all_scripts)
-        scripts = all_scripts[:count]
-        channel_name = "Mixed Viral"
-    
-    print(f"{Colors.BOLD}{Colors.CYAN}BATCH GENERATION MODE{Colors.END}")
-    print(f"{Colors.WHITE}Generating {count} videos from {channel_name}{Colors.END}\n")
-    
-    results = []
-    for i, script in enumerate(scripts):
-        print(f"\n{Colors.YELLOW}[{i+1}/{count}] Processing: {script['title']}{Colors.END}")
-        video_path = generate_viral_video(script, channel_name)
-        results.append({
-            'script': script,
-            'video': video_path,
-            'success': video_path is not None
-        })
-        
-        if i < count - 1:
-            print(f"\n{Colors.CYAN}Waiting 5 seconds before next video...{Colors.END}")
-            time.sleep(5)
-    
-    # Summary
+        return scripts_data['channel1_psychology'][:count], "Psychology & Drama"
+    if channel == 'horror':
+        return scripts_data['channel2_horror'][:count], "Horror & Creepypasta"
+    # Mix both channels
+    all_scripts = scripts_data['channel1_psychology'] + scripts_data['channel2_horror']
+    random.shuffle(all_scripts)
+    return all_scripts[:count], "Mixed Viral"
+
+def print_batch_summary(results, wall_time):
+    """Successes, generated videos, and wall-clock time against the sum of per-video times"""
     print(f"\n{Colors.MAGENTA}{'=' * 60}{Colors.END}")
     print(f"{Colors.BOLD}{Colors.WHITE}BATCH GENERATION COMPLETE{Colors.END}")
     print(f"{Colors.MAGENTA}{'=' * 60}{Colors.END}\n")
     
     successful = sum(1 for r in results if r['success'])
-    print(f"{Colors.GREEN}✅ Successful: {successful}/{count}{Colors.END}")
+    print(f"{Colors.GREEN}✅ Successful: {successful}/{len(results)}{Colors.END}")
     
     if successful > 0:
         print(f"\n{Colors.CYAN}Generated Videos:{Colors.END}")
         for r in results:
             if r['success']:
-                print(f"  • {r['script']['title']}")
-                print(f"    {Colors.WHITE}{r['video']}{Colors.END}")
+                print(f"  • {r['script']['title']} ({r['seconds']:.0f}s)")
+                # Videos rendered on another host are listed with the host they are on
+                location = f"{r['host']} {r['video']}" if r.get('remote') else r['video']
+                print(f"    {Colors.WHITE}{location}{Colors.END}")
+    
+    video_time = sum(r['seconds'] for r in results)
+    print(f"\n{Colors.CYAN}⏱️  Wall clock: {wall_time:.0f}s | Sum of per-video times: {video_time:.0f}s", end='')
+    if wall_time > 0:
+        print(f" | Speedup: {video_time / wall_time:.2f}x{Colors.END}")
+    else:
+        print(Colors.END)
+
+# Concurrent batch mode: how often the server is probed, what counts as a slow
+# answer, and the minimum time between two changes of the concurrency limit
+HEALTH_INTERVAL = 5
+HEALTH_SLOW_SECONDS = 1.0
+LIMIT_COOLDOWN = 15
+
+class AdaptiveLimit:
+    """Concurrency limit that grows by one while the server is healthy and halves when it struggles (AIMD);
+    already at one, trouble holds back the next start for LIMIT_COOLDOWN seconds instead"""
+    
+    def __init__(self, maximum):
+        self.maximum = maximum
+        self.limit = maximum
+        self.active = 0
+        self.peak = 0
+        self.last_change = 0.0
+        self.resume_at = 0.0
+        self.condition = asyncio.Condition()
+    
+    async def acquire(self):
+        while True:
+            async with self.condition:
+                await self.condition.wait_for(lambda: self.active < self.limit)
+                delay = self.resume_at - time.monotonic()
+                if delay <= 0:
+                    self.active += 1
+                    self.peak = max(self.peak, self.active)
+                    return
+            await asyncio.sleep(delay)
+    
+    async def release(self):
+        async with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+    
+    async def adjust(self, healthy, reason=''):
+        """Additive increase on a healthy signal, multiplicative decrease on trouble"""
+        async with self.condition:
+            now = time.monotonic()
+            if now - self.last_change < LIMIT_COOLDOWN:
+                return
+            previous = self.limit
+            self.limit = min(self.maximum, self.limit + 1) if healthy else max(1, self.limit // 2)
+            if not healthy and previous == 1:
+                self.last_change = now
+                self.resume_at = now + LIMIT_COOLDOWN
+                print(f"{Colors.YELLOW}⚖️  Holding the next video {LIMIT_COOLDOWN}s{f' ({reason})' if reason else ''}{Colors.END}")
+            elif self.limit != previous:
+                self.last_change = now
+                color = Colors.GREEN if healthy else Colors.YELLOW
+                print(f"{color}⚖️  Concurrency {previous} → {self.limit}{f' ({reason})' if reason else ''}{Colors.END}")
+                self.condition.notify_all()
+
+async def watch_health(client, limit, done):
+    """Probe /health until the batch finishes, feeding the result into the limit"""
+    import aiohttp
+    
+    while not done.is_set():
+        started = time.perf_counter()
+        try:
+            async with client.session.get(f'{API_URL}/health', timeout=aiohttp.ClientTimeout(total=HEALTH_SLOW_SECONDS * 3)) as response:
+                elapsed = time.perf_counter() - started
+                if response.status != 200:
+                    await limit.adjust(False, f'health returned {response.status}')
+                elif elapsed > HEALTH_SLOW_SECONDS:
+                    await limit.adjust(False, f'health took {elapsed:.1f}s')
+                else:
+                    await limit.adjust(True)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            await limit.adjust(False, 'health check failed')
+        try:
+            await asyncio.wait_for(done.wait(), HEALTH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+async def stream_generation(client, api_url, script, label, payload=None):
+    """Generate one video on one server, printing compact progress; returns the video path or None"""
+    reported = -1
+    payload = payload or build_payload(script)
+    key = generation_key(script, 'generate-viral', **payload)
+    async for data in client.job_events('POST', f'{api_url}/api/video/generate-viral', key, json=payload):
+        data = as_generation_event(data)
+        if data['type'] == 'progress':
+            # One line per 25% per video, since several streams share the terminal
+            step = int(data.get('progress', 0)) // 25
+            if step > reported:
+                reported = step
+                print(f"{Colors.CYAN}{label} {int(data.get('progress', 0)):3d}% {data.get('message', '')}{Colors.END}")
+        elif data['type'] == 'complete':
+            return data.get('videoPath')
+        elif data['type'] == 'error':
+            raise RuntimeError(data.get('error') or data.get('message', 'Unknown error'))
+    return None
+
+async def generate_one(client, limit, script, channel_name, label):
+    """Generate one video once a concurrency slot is free"""
+    import aiohttp
+    
+    await limit.acquire()
+    started = time.perf_counter()
+    video_path = None
+    try:
+        print(f"{Colors.YELLOW}{label} Started: {script['title']}{Colors.END}")
+        video_path = await stream_generation(client, API_URL, script, label)
+        
+        if video_path:
+            save_metadata(script, channel_name, video_path)
+            print(f"{Colors.GREEN}{label} ✅ {video_path}{Colors.END}")
+        else:
+            print(f"{Colors.RED}{label} ❌ No video path returned{Colors.END}")
+    except SSEHTTPError as e:
+        if e.status in (429, 502, 503, 504):
+            await limit.adjust(False, f'server answered {e.status}')
+        print(f"{Colors.RED}{label} ❌ Error: {e}{Colors.END}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        await limit.adjust(False, 'connection error')
+        print(f"{Colors.RED}{label} ❌ Connection error: {e or type(e).__name__}{Colors.END}")
+    except Exception as e:
+        print(f"{Colors.RED}{label} ❌ Error: {e}{Colors.END}")
+    finally:
+        await limit.release()
+    
+    return {
+        'script': script,
+        'video': video_path,
+        'success': video_path is not None,
+        'seconds': time.perf_counter() - started
+    }
+
+async def run_concurrent_batch(scripts, channel_name, concurrency):
+    """Keep up to `concurrency` generation streams open, returning (results, wall time)"""
+    limit = AdaptiveLimit(concurrency)
+    done = asyncio.Event()
+    batch_start = time.perf_counter()
+    
+    # Generation streams can stay open for minutes; don't cap the connection pool below the limit
+    async with AsyncSSEClient(pool_size=concurrency + 1) as client:
+        watcher = asyncio.create_task(watch_health(client, limit, done))
+        total = len(scripts)
+        try:
+            results = await asyncio.gather(*(
+                generate_one(client, limit, script, channel_name, f"[{i + 1}/{total}]")
+                for i, script in enumerate(scripts)
+            ))
+        finally:
+            done.set()
+            await watcher
+    
+    print(f"{Colors.CYAN}Peak concurrency: {limit.peak} (limit {limit.maximum}){Colors.END}")
+    return results, time.perf_counter() - batch_start
+
+def batch_generate_concurrent(scripts_data, channel, count=3, concurrency=2):
+    """Generate multiple videos with several generation streams open at once"""
+    scripts, channel_name = pick_batch_scripts(scripts_data, channel, count)
+    
+    if concurrency > 1:
+        print(f"{Colors.BOLD}{Colors.CYAN}CONCURRENT BATCH MODE{Colors.END}")
+        print(f"{Colors.WHITE}Generating {count} videos from {channel_name}, up to {concurrency} at a time{Colors.END}\n")
+    else:
+        print(f"{Colors.BOLD}{Colors.CYAN}BATCH GENERATION MODE{Colors.END}")
+        print(f"{Colors.WHITE}Generating {count} videos from {channel_name}{Colors.END}\n")
+    
+    results, wall_time = asyncio.run(run_concurrent_batch(scripts, channel_name, concurrency))
+    print_batch_summary(results, wall_time)
+    return results
+
+async def dispatch_one(client, pool, script, channel_name, label):
+    """Generate one video on the least-loaded host, retrying on another host if that host fails"""
+    import aiohttp
+    
+    started = time.perf_counter()
+    video_path = None
+    remote = False
+    tried = []
+    
+    def result():
+        return {
+            'script': script,
+            'video': video_path,
+            'success': video_path is not None,
+            'seconds': time.perf_counter() - started,
+            'host': tried[-1].url if tried else None,
+            'attempts': len(tried),
+            'remote': remote
+        }
+    
+    try:
+        payload = build_payload(script)
+    except Exception as e:
+        # A broken script fails the same way everywhere; don't hold it against a host
+        print(f"{Colors.RED}{label} ❌ Invalid script {script.get('id')}: {e!r}{Colors.END}")
+        return result()
+    
+    # Idempotency keys are per server: a host that already has this job (from an
+    # earlier run) gets the script back, so it reattaches instead of rendering again
+    key = generation_key(script, 'generate-viral', **payload)
+    known = await pool.find_job(client.session, key)
+    
+    while video_path is None and len(tried) < pool.max_attempts:
+        host = await pool.acquire(exclude=tried, prefer=known)
+        if host is None:
+            print(f"{Colors.RED}{label} ❌ No host left to try{Colors.END}")
+            break
+        tried.append(host)
+        print(f"{Colors.YELLOW}{label} {'Reattaching' if host is known else 'Started'} on {host.url}: {script['title']}{Colors.END}")
+        error, host_fault = '', False
+        try:
+            video_path = await stream_generation(client, host.url, script, label, payload)
+            if not video_path:
+                error = 'No video path returned'
+        except SSEHTTPError as e:
+            error = f'server answered {e.status}'
+            host_fault = e.status >= 500 or e.status == 429
+        except SSEIdleTimeout as e:
+            error, host_fault = str(e), True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error, host_fault = f'connection error: {e or type(e).__name__}', True
+        except Exception as e:
+            error = str(e)
+        await pool.release(host, error, host_fault)
+        if error and not host_fault:
+            # The server took the script and failed it; another host would do the same
+            print(f"{Colors.RED}{label} ❌ {host.url}: {error}{Colors.END}")
+            break
+        if error:
+            retry = ', retrying on another host' if len(tried) < pool.max_attempts else ''
+            print(f"{Colors.RED}{label} ❌ {host.url}: {error}{retry}{Colors.END}")
+    
+    if video_path:
+        # The path is on the host that rendered it; only write metadata when the video is on this disk
+        remote = not os.path.exists(video_path)
+        if not remote:
+            try:
+                save_metadata(script, channel_name, video_path)
+            except OSError as e:
+                print(f"{Colors.YELLOW}{label} ⚠️  Metadata not saved: {e}{Colors.END}")
+        print(f"{Colors.GREEN}{label} ✅ {tried[-1].url} {video_path}{Colors.END}")
+    return result()
+
+async def run_dispatched_batch(scripts, channel_name, pool):
+    """Spread the scripts over the pool's hosts, returning (results, wall time)"""
+    done = asyncio.Event()
+    batch_start = time.perf_counter()
+    
+    async with AsyncSSEClient(pool_size=pool.capacity + len(pool.hosts)) as client:
+        await pool.probe_all(client.session)
+        watcher = asyncio.create_task(pool.watch(client.session, done))
+        total = len(scripts)
+        try:
+            results = await asyncio.gather(*(
+                dispatch_one(client, pool, script, channel_name, f"[{i + 1}/{total}]")
+                for i, script in enumerate(scripts)
+            ))
+        finally:
+            done.set()
+            await watcher
+    
+    return results, time.perf_counter() - batch_start
+
+def print_host_summary(pool, results):
+    """Per-host videos, failed attempts and state at the end of a dispatched batch"""
+    print(f"\n{Colors.CYAN}Hosts:{Colors.END}")
+    for host in pool.hosts:
+        videos = sum(1 for r in results if r['success'] and r['host'] == host.url)
+        color = Colors.GREEN if host.healthy and host.failed == 0 else Colors.YELLOW
+        print(f"  {color}• {host.url}: {videos} videos, {host.failed} failed attempts "
+              f"({host.slots} slots, {host.status()}){Colors.END}")
+    retried = sum(1 for r in results if r['attempts'] > 1)
+    if retried:
+        print(f"{Colors.YELLOW}  {retried} scripts moved to another host after a failure{Colors.END}")
+    remote = sum(1 for r in results if r.get('remote'))
+    if remote:
+        print(f"{Colors.CYAN}  {remote} videos are on the host that rendered them (no local metadata written){Colors.END}")
+
+def batch_generate_dispatched(scripts_data, channel, count, pool):
+    """Generate a batch spread over several servers, least-loaded first"""
+    scripts, channel_name = pick_batch_scripts(scripts_data, channel, count)
     
+    print(f"{Colors.BOLD}{Colors.CYAN}MULTI-HOST BATCH MODE{Colors.END}")
+    print(f"{Colors.WHITE}Generating {count} videos from {channel_name} on {len(pool.hosts)} hosts "
+          f"({pool.capacity} slots){Colors.END}\n")
+    
+    results, wall_time = asyncio.run(run_dispatched_batch(scripts, channel_name, pool))
+    print_batch_summary(results, wall_time)
+    print_host_summary(pool, results)
     return results
 
+def check_hosts(hosts):
+    """Healthy hosts among [(url, slots)], printing each one's state"""
+    healthy = []
+    for url, slots in hosts:
+        try:
+            response = requests.get(f'{url}/health', timeout=2)
+            if response.status_code != 200:
+                raise Exception(f"health returned {response.status_code}")
+            print(f"{Colors.GREEN}✓ {url}{Colors.END}")
+            healthy.append((url, slots))
+        except requests.RequestException as e:
+            print(f"{Colors.YELLOW}✗ {url} ({type(e).__name__}){Colors.END}")
+        except Exception as e:
+            print(f"{Colors.YELLOW}✗ {url} ({e}){Colors.END}")
+    return healthy
+
 def main():
     """Main CLI interface"""
     parser = argparse.ArgumentParser(description='Generate viral YouTube Shorts')
@@ -346,30 +656,71 @@ def main():
         action='store_true',
         help='Generate random viral video'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Generate batch videos N at a time (lowered automatically while the server is unhealthy)'
+    )
+    parser.add_argument(
+        '--regenerate',
+        action='store_true',
+        help='Render again even if the server already has (or is rendering) a video for the same script'
+    )
+    parser.add_argument(
+        '--hosts',
+        help='Comma-separated render servers (host:port) to spread batch videos over, least-loaded first (default: $RENDER_HOSTS)'
+    )
+    parser.add_argument(
+        '--hosts-file',
+        help='File with one render server per line, optionally followed by its slot count'
+    )
     
     args = parser.parse_args()
+    global REGENERATE, API_URL
+    REGENERATE = args.regenerate
     
     print_viral_header()
     
-    # Check server
-    print(f"{Colors.CYAN}Checking server...{Colors.END}")
-    try:
-        response = requests.get('http://localhost:3000/health', timeout=2)
-        if response.status_code != 200:
-            raise Exception("Server not healthy")
-        print(f"{Colors.GREEN}✓ Server is running{Colors.END}\n")
-    except:
-        print(f"{Colors.RED}❌ Server is not running!{Colors.END}")
-        print(f"{Colors.YELLOW}Start it with: npm run dev{Colors.END}")
-        sys.exit(1)
+    if args.hosts or args.hosts_file or os.environ.get(HOSTS_ENV):
+        try:
+            hosts = parse_hosts(args.hosts, args.hosts_file, max(1, args.concurrency or 1))
+        except (OSError, ValueError) as e:
+            print(f"{Colors.RED}❌ Invalid hosts: {e}{Colors.END}")
+            sys.exit(1)
+        
+        print(f"{Colors.CYAN}Checking {len(hosts)} servers...{Colors.END}")
+        healthy = check_hosts(hosts)
+        if not healthy:
+            print(f"{Colors.RED}❌ No server is running!{Colors.END}")
+            sys.exit(1)
+        print()
+        # Single videos go to the first healthy host; batches use all of them (a down host may come back)
+        API_URL = healthy[0][0]
+    else:
+        hosts = None
+        # Check server
+        print(f"{Colors.CYAN}Checking server...{Colors.END}")
+        try:
+            response = requests.get(f'{API_URL}/health', timeout=2)
+            if response.status_code != 200:
+                raise Exception("Server not healthy")
+            print(f"{Colors.GREEN}✓ Server is running{Colors.END}\n")
+        except:
+            print(f"{Colors.RED}❌ Server is not running!{Colors.END}")
+            print(f"{Colors.YELLOW}Start it with: npm run dev{Colors.END}")
+            sys.exit(1)
     
     # Load scripts
     scripts_data = load_viral_scripts()
     
     # Handle different modes
-    if args.batch and args.channel:
-        # Batch mode
-        batch_generate(scripts_data, args.channel, args.batch)
+    if args.batch and args.channel and hosts:
+        # Multi-host batch mode
+        batch_generate_dispatched(scripts_data, args.channel, args.batch, HostPool(hosts))
+    elif args.batch and args.channel:
+        # Batch mode, one video at a time unless --concurrency is given; the health-driven
+        # limit paces it instead of a fixed wait between videos
+        batch_generate_concurrent(scripts_data, args.channel, args.batch, max(1, args.concurrency or 1))
     elif args.random:
         # Random single video
         all_scripts = scripts_data['channel1_psychology'] + scripts_data['channel2_horror']
@@ -2,14 +2,32 @@
 """
 YouTube Shorts Video Generator CLI
 Terminal-based interface with real-time progress
+
+Also importable: the generate_* functions return a result dict
+(success, video_path, error, seconds) and, given on_event, skip the terminal
+UI and pass each server event to the callback instead:
+
+    from generate import generate_synced_with_duration
+    result = generate_synced_with_duration(30, style=3, on_event=print)
+
+`python3 generate.py --json` runs without prompts and prints one JSON object
+per line for each event, ending with a {"type": "result", ...} line.
 """
 
-import requests
 import json
 import sys
 import time
 from datetime import datetime
 import argparse
+import os
+from urllib.parse import urlencode
+
+from sse_client import CONNECT_TIMEOUT, sse
+
+API_URL = os.environ.get('API_URL', 'http://localhost:3000')
+
+# Plain-JSON generation endpoints only answer once the video is rendered
+POST_TIMEOUT = 1200
 
 # ANSI color codes
 class Colors:
@@ -87,54 +105,86 @@ def progress_bar(current, total, message="", width=50):
     sys.stdout.write(f"{Colors.CYAN}[{bar}] {Colors.WHITE}{percent:3d}% {Colors.YELLOW}{message}{Colors.END}")
     sys.stdout.flush()
 
+def generation_events(url):
+    """Events of a server-side generation, always ending with one complete or error event"""
+    try:
+        for data in sse.json_events('GET', url):
+            yield data
+            if data.get('type') in ('complete', 'error'):
+                return
+        yield {'type': 'error', 'error': 'Stream ended without a result'}
+    except Exception as e:
+        yield {'type': 'error', 'error': f"Connection error: {e}"}
+
+def generation_result(event, started, **fields):
+    """Result dict from the final event of a generation"""
+    video_path = event.get('videoPath') if event.get('type') == 'complete' else None
+    return {
+        'success': video_path is not None,
+        'video_path': video_path,
+        'error': None if video_path else event.get('error', 'No video path returned'),
+        'seconds': round(time.time() - started, 2),
+        **fields
+    }
+
+def run_generation(url, on_event=None, **fields):
+    """Run a streamed generation without any terminal output"""
+    started = time.time()
+    for data in generation_events(url):
+        if on_event:
+            on_event(data)
+    return generation_result(data, started, **fields)
+
+def post_generation(path, payload=None):
+    """Run a generation endpoint that answers with plain JSON"""
+    started = time.time()
+    try:
+        data = sse.request('POST', f'{API_URL}{path}', json=payload, timeout=(CONNECT_TIMEOUT, POST_TIMEOUT)).json()
+    except Exception as e:
+        return generation_result({'type': 'error', 'error': str(e)}, started)
+    if data.get('success'):
+        return generation_result({'type': 'complete', 'videoPath': data.get('videoPath')}, started)
+    return generation_result({'type': 'error', 'error': data.get('error', 'Unknown error')}, started)
+
+def synced_url(duration_seconds=None, style=1, manifest=None):
+    """Synced generation endpoint for a duration, style and optional job manifest"""
+    if duration_seconds is None:
+        return f'{API_URL}/api/video/generate-synced'
+    params = {'duration': duration_seconds, 'style': style}
+    if manifest:
+        params['manifest'] = os.path.abspath(manifest)
+    return f'{API_URL}/api/video/generate-synced?{urlencode(params)}'
+
 def check_server():
     """Check if server is running"""
     try:
-        response = requests.get('http://localhost:3000/health', timeout=2)
+        response = sse.request('GET', f'{API_URL}/health', timeout=2)
         return response.status_code == 200
     except:
         return False
 
-def generate_quick_test():
+def print_post_result(result):
+    """Terminal output for a plain JSON generation"""
+    if result['success']:
+        print(f"\n{Colors.GREEN}✅ Success!{Colors.END}")
+        print(f"{Colors.WHITE}Video: {result['video_path']}{Colors.END}")
+    else:
+        print(f"\n{Colors.RED}❌ Failed: {result['error']}{Colors.END}")
+    return result
+
+def generate_quick_test(on_event=None):
     """Generate 2-second test video"""
+    if on_event is not None:
+        return post_generation('/api/test/quick-video')
     print(f"{Colors.CYAN}Generating 2-second test video...{Colors.END}")
-    
-    try:
-        response = requests.post('http://localhost:3000/api/test/quick-video')
-        data = response.json()
-        
-        if data.get('success'):
-            print(f"\n{Colors.GREEN}✅ Success!{Colors.END}")
-            print(f"{Colors.WHITE}Video: {data['videoPath']}{Colors.END}")
-            return data['videoPath']
-        else:
-            print(f"\n{Colors.RED}❌ Failed: {data.get('error', 'Unknown error')}{Colors.END}")
-            return None
-    except Exception as e:
-        print(f"\n{Colors.RED}❌ Error: {str(e)}{Colors.END}")
-        return None
+    return print_post_result(post_generation('/api/test/quick-video'))
 
-def generate_optimized(duration=10):
+def generate_optimized(duration=10, on_event=None):
     """Generate optimized video"""
+    if on_event is not None:
+        return post_generation('/api/test/optimized-video', {'duration': duration})
     print(f"{Colors.CYAN}Generating {duration}-second optimized video...{Colors.END}")
-    
-    try:
-        response = requests.post(
-            'http://localhost:3000/api/test/optimized-video',
-            json={'duration': duration}
-        )
-        data = response.json()
-        
-        if data.get('success'):
-            print(f"\n{Colors.GREEN}✅ Success!{Colors.END}")
-            print(f"{Colors.WHITE}Video: {data['videoPath']}{Colors.END}")
-            return data['videoPath']
-        else:
-            print(f"\n{Colors.RED}❌ Failed: {data.get('error', 'Unknown error')}{Colors.END}")
-            return None
-    except Exception as e:
-        print(f"\n{Colors.RED}❌ Error: {str(e)}{Colors.END}")
-        return None
+    return print_post_result(post_generation('/api/test/optimized-video', {'duration': duration}))
 
 def animated_progress_bar(current, total, message="", width=50):
     """Display animated progress bar with effects"""
@@ -180,8 +230,12 @@ def animated_progress_bar(current, total, message="", width=50):
     sys.stdout.write(f"{color}[{bar}] {Colors.WHITE}{percent:3d}% {frame} {pulse_indicator} {Colors.YELLOW}{message}{Colors.END}")
     sys.stdout.flush()
 
-def generate_synced_with_duration(duration_seconds, style=1):
-    """Generate synchronized video with specified duration and style"""
+def generate_synced_with_duration(duration_seconds, style=1, manifest=None, on_event=None):
+    """Generate synchronized video with specified duration and style, from a job manifest if given"""
+    url = synced_url(duration_seconds, style, manifest)
+    if on_event is not None:
+        return run_generation(url, on_event, duration=duration_seconds, style=style)
+    
     # Style names for display
     style_names = [
         'Clean Modern (Purple/Gold)',
@@ -241,86 +295,76 @@ def generate_synced_with_duration(duration_seconds, style=1):
         anim_thread.start()
         
         # Connect to SSE endpoint with duration and style parameters
-        response = requests.get(
-            f'http://localhost:3000/api/video/generate-synced?duration={duration_seconds}&style={style}',
-            stream=True,
-            timeout=1200  # 20 minutes timeout for slow TTS generation
-        )
-        
+        started = time.time()
         video_path = None
         last_message = ""
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        
-                        if data['type'] == 'start':
-                            animated_progress_bar(0, 100, data['message'])
-                            
-                        elif data['type'] == 'progress':
-                            # Stop animation temporarily
-                            animation_active = False
-                            time.sleep(0.1)
-                            
-                            # Clear previous line properly
-                            sys.stdout.write('\r\033[K')
-                            
-                            # Update current segment for animation
-                            message = data['message']
-                            current_segment = message
-                            
-                            # Show segment preview on same line
-                            if 'details' in data and 'text' in data['details']:
-                                preview = data['details']['text'][:40]
-                                message = f"{message}"
-                                
-                                # Show segment details inline (no new lines)
-                                if 'audio' in message.lower():
-                                    # Don't print new lines, include in progress message
-                                    segment_info = data['details'].get('segment', 'processing')
-                                    message = f"{message} [{segment_info}]"
-                                    animation_active = True
-                            
-                            animated_progress_bar(
-                                data['progress'], 
-                                100, 
-                                message
-                            )
-                            last_message = message
-                                
-                        elif data['type'] == 'complete':
-                            animation_active = False
-                            time.sleep(0.1)
-                            sys.stdout.write('\r\033[K')  # Clear line properly
-                            animated_progress_bar(100, 100, "Complete!")
-                            video_path = data['videoPath']
-                            print(f"\n\n{Colors.GREEN}✅ SYNCHRONIZED video generated!{Colors.END}")
-                            print(f"{Colors.WHITE}Path: {video_path}{Colors.END}")
-                            print(f"{Colors.CYAN}✨ Audio and text are perfectly synced!{Colors.END}")
-                            print(f"{Colors.YELLOW}📏 Duration: {duration_seconds} seconds{Colors.END}")
-                            break
-                            
-                        elif data['type'] == 'error':
-                            animation_active = False
-                            print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                            break
-                            
-                    except json.JSONDecodeError:
-                        pass
+        for data in generation_events(url):
+            if data['type'] == 'start':
+                animated_progress_bar(0, 100, data['message'])
+                
+            elif data['type'] == 'progress':
+                # Stop animation temporarily
+                animation_active = False
+                time.sleep(0.1)
+                
+                # Clear previous line properly
+                sys.stdout.write('\r\033[K')
+                
+                # Update current segment for animation
+                message = data['message']
+                current_segment = message
+                
+                # Show segment preview on same line
+                if 'details' in data and 'text' in data['details']:
+                    preview = data['details']['text'][:40]
+                    message = f"{message}"
+                    
+                    # Show segment details inline (no new lines)
+                    if 'audio' in message.lower():
+                        # Don't print new lines, include in progress message
+                        segment_info = data['details'].get('segment', 'processing')
+                        message = f"{message} [{segment_info}]"
+                        animation_active = True
+                
+                animated_progress_bar(
+                    data['progress'], 
+                    100, 
+                    message
+                )
+                last_message = message
+                    
+            elif data['type'] == 'complete':
+                animation_active = False
+                time.sleep(0.1)
+                sys.stdout.write('\r\033[K')  # Clear line properly
+                animated_progress_bar(100, 100, "Complete!")
+                video_path = data['videoPath']
+                print(f"\n\n{Colors.GREEN}✅ SYNCHRONIZED video generated!{Colors.END}")
+                print(f"{Colors.WHITE}Path: {video_path}{Colors.END}")
+                print(f"{Colors.CYAN}✨ Audio and text are perfectly synced!{Colors.END}")
+                print(f"{Colors.YELLOW}📏 Duration: {duration_seconds} seconds{Colors.END}")
+                break
+                
+            elif data['type'] == 'error':
+                animation_active = False
+                print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                break
         
         animation_active = False
-        return video_path
+        return generation_result(data, started, duration=duration_seconds, style=style)
         
     except Exception as e:
         animation_active = False
         print(f"\n{Colors.RED}❌ Connection error: {str(e)}{Colors.END}")
-        return None
+        return generation_result({'type': 'error', 'error': str(e)}, started)
 
-def generate_synced():
+def generate_synced(on_event=None):
     """Generate synchronized video with perfect audio-text sync"""
+    url = synced_url()
+    if on_event is not None:
+        return run_generation(url, on_event)
+    
     print(f"{Colors.BOLD}{Colors.GREEN}🎯 Generating SYNCHRONIZED video...{Colors.END}")
     print(f"{Colors.YELLOW}Audio and text will be perfectly synced!{Colors.END}")
     
@@ -369,134 +413,110 @@ def generate_synced():
         anim_thread.start()
         
         # Connect to SSE endpoint for real-time progress
-        response = requests.get(
-            'http://localhost:3000/api/video/generate-synced',
-            stream=True,
-            timeout=1200  # 20 minutes timeout for slow TTS generation
-        )
-        
+        started = time.time()
         video_path = None
         last_message = ""
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        
-                        if data['type'] == 'start':
-                            animated_progress_bar(0, 100, data['message'])
-                            
-                        elif data['type'] == 'progress':
-                            # Stop animation temporarily
-                            animation_active = False
-                            time.sleep(0.1)
-                            
-                            # Clear previous line properly
-                            sys.stdout.write('\r\033[K')
-                            
-                            # Update current segment for animation
-                            message = data['message']
-                            current_segment = message
-                            
-                            # Show segment preview on same line
-                            if 'details' in data and 'text' in data['details']:
-                                preview = data['details']['text'][:40]
-                                message = f"{message}"
-                                
-                                # Show segment details inline (no new lines)
-                                if 'audio' in message.lower():
-                                    # Don't print new lines, include in progress message
-                                    segment_info = data['details'].get('segment', 'processing')
-                                    message = f"{message} [{segment_info}]"
-                                    animation_active = True
-                            
-                            animated_progress_bar(
-                                data['progress'], 
-                                100, 
-                                message
-                            )
-                            last_message = message
-                                
-                        elif data['type'] == 'complete':
-                            animation_active = False
-                            time.sleep(0.1)
-                            sys.stdout.write('\r\033[K')  # Clear line properly
-                            animated_progress_bar(100, 100, "Complete!")
-                            video_path = data['videoPath']
-                            print(f"\n\n{Colors.GREEN}✅ SYNCHRONIZED video generated!{Colors.END}")
-                            print(f"{Colors.WHITE}Path: {video_path}{Colors.END}")
-                            print(f"{Colors.CYAN}✨ Audio and text are perfectly synced!{Colors.END}")
-                            break
-                            
-                        elif data['type'] == 'error':
-                            animation_active = False
-                            print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                            break
-                            
-                    except json.JSONDecodeError:
-                        pass
+        for data in generation_events(url):
+            if data['type'] == 'start':
+                animated_progress_bar(0, 100, data['message'])
+                
+            elif data['type'] == 'progress':
+                # Stop animation temporarily
+                animation_active = False
+                time.sleep(0.1)
+                
+                # Clear previous line properly
+                sys.stdout.write('\r\033[K')
+                
+                # Update current segment for animation
+                message = data['message']
+                current_segment = message
+                
+                # Show segment preview on same line
+                if 'details' in data and 'text' in data['details']:
+                    preview = data['details']['text'][:40]
+                    message = f"{message}"
+                    
+                    # Show segment details inline (no new lines)
+                    if 'audio' in message.lower():
+                        # Don't print new lines, include in progress message
+                        segment_info = data['details'].get('segment', 'processing')
+                        message = f"{message} [{segment_info}]"
+                        animation_active = True
+                
+                animated_progress_bar(
+                    data['progress'], 
+                    100, 
+                    message
+                )
+                last_message = message
+                    
+            elif data['type'] == 'complete':
+                animation_active = False
+                time.sleep(0.1)
+                sys.stdout.write('\r\033[K')  # Clear line properly
+                animated_progress_bar(100, 100, "Complete!")
+                video_path = data['videoPath']
+                print(f"\n\n{Colors.GREEN}✅ SYNCHRONIZED video generated!{Colors.END}")
+                print(f"{Colors.WHITE}Path: {video_path}{Colors.END}")
+                print(f"{Colors.CYAN}✨ Audio and text are perfectly synced!{Colors.END}")
+                break
+                
+            elif data['type'] == 'error':
+                animation_active = False
+                print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                break
         
         animation_active = False
-        return video_path
+        return generation_result(data, started)
         
     except Exception as e:
         animation_active = False
         print(f"\n{Colors.RED}❌ Connection error: {str(e)}{Colors.END}")
-        return None
+        return generation_result({'type': 'error', 'error': str(e)}, started)
 
-def generate_with_progress():
+def generate_with_progress(on_event=None):
     """Generate video with real-time progress updates"""
+    url = f'{API_URL}/api/video/generate-with-progress'
+    if on_event is not None:
+        return run_generation(url, on_event)
+    
     print(f"{Colors.CYAN}Generating full video with real-time progress...{Colors.END}")
     print(f"{Colors.YELLOW}This may take 3-5 minutes...{Colors.END}\n")
     
     try:
         # Connect to SSE endpoint
-        response = requests.get(
-            'http://localhost:3000/api/video/generate-with-progress',
-            stream=True,
-            timeout=600
-        )
-        
+        started = time.time()
         video_path = None
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        
-                        if data['type'] == 'start':
-                            progress_bar(0, 100, data['message'])
-                            
-                        elif data['type'] == 'progress':
-                            progress_bar(
-                                data['progress'], 
-                                100, 
-                                data['message']
-                            )
-                            
-                        elif data['type'] == 'complete':
-                            progress_bar(100, 100, "Complete!")
-                            video_path = data['videoPath']
-                            print(f"\n\n{Colors.GREEN}✅ Video generated successfully!{Colors.END}")
-                            print(f"{Colors.WHITE}Path: {video_path}{Colors.END}")
-                            break
-                            
-                        elif data['type'] == 'error':
-                            print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                            break
-                            
-                    except json.JSONDecodeError:
-                        pass
+        for data in generation_events(url):
+            if data['type'] == 'start':
+                progress_bar(0, 100, data['message'])
+                
+            elif data['type'] == 'progress':
+                progress_bar(
+                    data['progress'], 
+                    100, 
+                    data['message']
+                )
+                
+            elif data['type'] == 'complete':
+                progress_bar(100, 100, "Complete!")
+                video_path = data['videoPath']
+                print(f"\n\n{Colors.GREEN}✅ Video generated successfully!{Colors.END}")
+                print(f"{Colors.WHITE}Path: {video_path}{Colors.END}")
+                break
+                
+            elif data['type'] == 'error':
+                print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                break
         
-        return video_path
+        return generation_result(data, started)
         
     except Exception as e:
         print(f"\n{Colors.RED}❌ Connection error: {str(e)}{Colors.END}")
-        return None
+        return generation_result({'type': 'error', 'error': str(e)}, started)
 
 # Función generate_animated eliminada
 def generate_animated_removed():
@@ -536,77 +556,64 @@ def generate_animated_removed():
         continuous_thread.start()
         
         # Connect to SSE endpoint for animated video
-        response = requests.get(
-            'http://localhost:3000/api/video/generate-animated',
-            stream=True,
-            timeout=1200  # 20 minutes timeout for slow TTS generation
-        )
+        url = f'{API_URL}/api/video/generate-animated'
         
         video_path = None
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    try:
-                        data = json.loads(line[6:])
-                        
-                        if data['type'] == 'start':
-                            last_progress = 0
-                            last_message = data['message']
-                            animated_progress_bar(0, 100, data['message'])
-                            
-                        elif data['type'] == 'progress':
-                            message = data['message']
-                            last_progress = data.get('progress', last_progress)  # Use .get() to avoid KeyError
-                            last_message = message
-                            
-                            # Note: Animation type info is available but we're showing it in the progress bar
-                            # instead of a separate animation
-                            pass
-                            
-                            # Effects list is available in data['details']['effects'] if needed
-                            # but we don't print it to avoid disrupting the progress bar
-                            
-                            # Update progress (continuous animation will handle the display)
-                            animated_progress_bar(
-                                data['progress'], 
-                                100, 
-                                message
-                            )
-                                
-                        elif data['type'] == 'complete':
-                            animation_active = False
-                            last_progress = 0  # Stop continuous animation
-                            last_message = ""
-                            time.sleep(0.2)  # Give threads time to stop
-                            sys.stdout.write('\r\033[K')  # Clear line properly
-                            animated_progress_bar(100, 100, "Complete!")
-                            video_path = data['videoPath']
-                            
-                            # Celebration animation
-                            print(f"\n\n{Colors.MAGENTA}✨ ✨ ✨ ANIMATED VIDEO COMPLETE! ✨ ✨ ✨{Colors.END}")
-                            for _ in range(3):
-                                sys.stdout.write(f'\r{Colors.BOLD}{Colors.MAGENTA}★ ☆ ★ ☆ ★ SUCCESS! ★ ☆ ★ ☆ ★{Colors.END}')
-                                time.sleep(0.2)
-                                sys.stdout.write(f'\r{Colors.MAGENTA}☆ ★ ☆ ★ ☆ SUCCESS! ☆ ★ ☆ ★ ☆{Colors.END}')
-                                time.sleep(0.2)
-                            
-                            print(f"\n\n{Colors.WHITE}Path: {video_path}{Colors.END}")
-                            print(f"{Colors.CYAN}✨ Video includes animated visual effects!{Colors.END}")
-                            break
-                            
-                        elif data['type'] == 'error':
-                            animation_active = False
-                            last_progress = 0  # Stop continuous animation
-                            last_message = ""
-                            time.sleep(0.2)  # Give threads time to stop
-                            sys.stdout.write('\r\033[K')  # Clear line
-                            print(f"\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                            break
-                            
-                    except json.JSONDecodeError:
-                        pass
+        for data in sse.json_events('GET', url):
+            if data['type'] == 'start':
+                last_progress = 0
+                last_message = data['message']
+                animated_progress_bar(0, 100, data['message'])
+                
+            elif data['type'] == 'progress':
+                message = data['message']
+                last_progress = data.get('progress', last_progress)  # Use .get() to avoid KeyError
+                last_message = message
+                
+                # Note: Animation type info is available but we're showing it in the progress bar
+                # instead of a separate animation
+                pass
+                
+                # Effects list is available in data['details']['effects'] if needed
+                # but we don't print it to avoid disrupting the progress bar
+                
+                # Update progress (continuous animation will handle the display)
+                animated_progress_bar(
+                    data['progress'], 
+                    100, 
+                    message
+                )
+                    
+            elif data['type'] == 'complete':
+                animation_active = False
+                last_progress = 0  # Stop continuous animation
+                last_message = ""
+                time.sleep(0.2)  # Give threads time to stop
+                sys.stdout.write('\r\033[K')  # Clear line properly
+                animated_progress_bar(100, 100, "Complete!")
+                video_path = data['videoPath']
+                
+                # Celebration animation
+                print(f"\n\n{Colors.MAGENTA}✨ ✨ ✨ ANIMATED VIDEO COMPLETE! ✨ ✨ ✨{Colors.END}")
+                for _ in range(3):
+                    sys.stdout.write(f'\r{Colors.BOLD}{Colors.MAGENTA}★ ☆ ★ ☆ ★ SUCCESS! ★ ☆ ★ ☆ ★{Colors.END}')
+                    time.sleep(0.2)
+                    sys.stdout.write(f'\r{Colors.MAGENTA}☆ ★ ☆ ★ ☆ SUCCESS! ☆ ★ ☆ ★ ☆{Colors.END}')
+                    time.sleep(0.2)
+                
+                print(f"\n\n{Colors.WHITE}Path: {video_path}{Colors.END}")
+                print(f"{Colors.CYAN}✨ Video includes animated visual effects!{Colors.END}")
+                break
+                
+            elif data['type'] == 'error':
+                animation_active = False
+                last_progress = 0  # Stop continuous animation
+                last_message = ""
+                time.sleep(0.2)  # Give threads time to stop
+                sys.stdout.write('\r\033[K')  # Clear line
+                print(f"\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                break
         
         animation_active = False
         last_progress = 0
@@ -621,29 +628,74 @@ def generate_animated_removed():
         print(f"\n{Colors.RED}❌ Connection error: {str(e)}{Colors.END}")
         return None
 
+def print_json(data):
+    """One NDJSON line, flushed so a reading process sees it at once"""
+    print(json.dumps(data, ensure_ascii=False), flush=True)
+
+def run_json(args):
+    """Non-interactive mode for batch drivers; returns the exit code"""
+    if not check_server():
+        print_json({'type': 'result', 'success': False, 'video_path': None, 'error': 'Server is not running'})
+        return 1
+    
+    kind = args.type or 'synced'
+    if kind == 'quick':
+        result = generate_quick_test(on_event=print_json)
+    elif kind == 'optimized':
+        result = generate_optimized(args.duration or 10, on_event=print_json)
+    elif kind == 'full':
+        result = generate_with_progress(on_event=print_json)
+    elif kind == 'synced':
+        result = generate_synced_with_duration(args.duration or 30, args.style, args.manifest, on_event=print_json)
+    else:
+        result = {'success': False, 'video_path': None, 'error': f'{kind} videos are no longer available'}
+    
+    print_json({'type': 'result', **result})
+    return 0 if result['success'] else 1
+
 def main():
     """Main CLI interface"""
     parser = argparse.ArgumentParser(description='Generate YouTube Shorts videos')
     parser.add_argument(
         '--type',
-        choices=['quick', 'optimized', 'full', 'animated'],
+        choices=['quick', 'optimized', 'full', 'animated', 'synced'],
         default=None,
         help='Type of video to generate'
     )
     parser.add_argument(
         '--duration',
         type=int,
-        default=10,
-        help='Duration for optimized video (seconds)'
+        default=None,
+        help='Duration in seconds (default: 10 for optimized, 30 for synced)'
+    )
+    parser.add_argument(
+        '--style',
+        type=int,
+        choices=range(1, 7),
+        default=1,
+        help='Subtitle style for synced videos (1-6)'
     )
     parser.add_argument(
         '--auto',
         action='store_true',
         help='Run without interactive prompts'
     )
+    parser.add_argument(
+        '--manifest',
+        default=None,
+        help='Job manifest (output/jobs/<id>/manifest.json) with the content to render'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='No prompts or colors: print each event as a JSON line, then the result'
+    )
     
     args = parser.parse_args()
     
+    if args.json:
+        sys.exit(run_json(args))
+    
     print_header()
     
     # Check server
@@ -659,9 +711,11 @@ def main():
         if args.type == 'quick':
             generate_quick_test()
         elif args.type == 'optimized':
-            generate_optimized(args.duration)
+            generate_optimized(args.duration or 10)
         elif args.type == 'full':
             generate_with_progress()
+        elif args.type == 'synced':
+            generate_synced_with_duration(args.duration or 30, args.style, args.manifest)
         return
     
     # Simplified menu - only synchronized video with duration options
@@ -737,7 +791,7 @@ def main():
             style = 1
         
         print()
-        video_path = generate_synced_with_duration(duration, style)
+        video_path = generate_synced_with_duration(duration, style, args.manifest)['video_path']
     
     # Offer to open video
     if video_path:
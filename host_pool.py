@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Render host pool for the batch CLIs
+Spreads a batch over several servers: each host's /health (status and load)
+is polled in the background, every script goes to the least-loaded healthy
+host with a free slot, and a host that fails a job itself (connection error,
+timeout, 5xx/429) is backed off (doubling up to FAILURE_BACKOFF_MAX) so the
+retry and the following scripts go elsewhere. A script the server rejects or
+fails to render is not held against the host.
+
+Idempotency keys live in each server's own job registry, so a script whose key
+a host already knows (running or finished) is sent back to that host to
+reattach instead of being rendered again somewhere else.
+
+Hosts come from --hosts (comma separated), a hosts file (one per line, '#'
+comments, an optional slot count after the URL) or RENDER_HOSTS; without any
+of them the pool is just API_URL.
+
+Usage:
+    from host_pool import HostPool, parse_hosts
+    pool = HostPool(parse_hosts('render-1:3000,render-2:3000', default_slots=2))
+    async with AsyncSSEClient() as client:
+        watcher = asyncio.create_task(pool.watch(client.session, done))
+        host = await pool.acquire(prefer=await pool.find_job(client.session, key))
+        ...
+        await pool.release(host, error, host_fault)
+"""
+import asyncio
+import os
+import time
+
+DEFAULT_HOST = os.environ.get('API_URL', 'http://localhost:3000')
+HOSTS_ENV = 'RENDER_HOSTS'
+
+# How often hosts are probed and how long a probe may take
+HEALTH_INTERVAL = 5
+HEALTH_TIMEOUT = 3
+# Backoff after a failed job: doubles with each consecutive failure on the same host
+FAILURE_BACKOFF = 30
+FAILURE_BACKOFF_MAX = 600
+# Give up on a script when every host it can still try has been unhealthy this long
+HOSTS_DOWN_TIMEOUT = 600
+# Hosts one script is tried on before it counts as failed
+MAX_ATTEMPTS = 3
+
+
+def normalize_host(host):
+    """'render-1:3000' → 'http://render-1:3000'"""
+    host = host.strip().rstrip('/')
+    return host if '://' in host else f'http://{host}'
+
+
+def parse_hosts(hosts=None, hosts_file=None, default_slots=1):
+    """[(url, slots)] from a comma-separated list and/or a hosts file, else RENDER_HOSTS, else API_URL"""
+    entries = []
+    if hosts:
+        entries += [h for h in hosts.split(',') if h.strip()]
+    if hosts_file:
+        with open(hosts_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    entries.append(line)
+    if not entries:
+        entries = [h for h in os.environ.get(HOSTS_ENV, '').split(',') if h.strip()] or [DEFAULT_HOST]
+
+    parsed = {}
+    for entry in entries:
+        fields = entry.split()
+        slots = int(fields[1]) if len(fields) > 1 else default_slots
+        if slots < 1:
+            raise ValueError(f"Host {fields[0]} needs at least 1 slot")
+        parsed[normalize_host(fields[0])] = slots
+    return list(parsed.items())
+
+
+class RenderHost:
+    """One server of the pool, with what its last probe and our own jobs say about it"""
+
+    def __init__(self, url, slots=1):
+        self.url = url
+        self.slots = slots
+        self.active = 0           # jobs this batch has running on it
+        self.jobs = 0             # running jobs the server reported (any client), kept current between probes
+        self.cpu_load = 0.0       # 1-minute load average per CPU
+        self.healthy = None       # None until the first probe answers
+        self.failures = 0         # consecutive jobs lost to a host fault
+        self.backoff_until = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.last_error = ''
+
+    @property
+    def load(self):
+        return (max(self.jobs, self.active) / self.slots, self.cpu_load, self.active)
+
+    def usable(self, now):
+        return self.healthy is not False and now >= self.backoff_until
+
+    def available(self, now):
+        return self.usable(now) and self.active < self.slots
+
+    def status(self, now=None):
+        now = now or time.monotonic()
+        if self.healthy is False:
+            return f'down ({self.last_error})' if self.last_error else 'down'
+        if now < self.backoff_until:
+            return f'backing off {self.backoff_until - now:.0f}s'
+        return 'healthy' if self.healthy else 'unknown'
+
+
+class HostPool:
+    """Least-loaded dispatch over RenderHosts; use acquire()/release() around each job"""
+
+    def __init__(self, hosts):
+        self.hosts = [RenderHost(url, slots) for url, slots in hosts]
+        self.max_attempts = max(1, min(MAX_ATTEMPTS, len(self.hosts)))
+        self.condition = asyncio.Condition()
+
+    @property
+    def capacity(self):
+        return sum(host.slots for host in self.hosts)
+
+    # Health
+
+    async def probe(self, session, host):
+        """GET /health and record status and load; returns whether the host is healthy"""
+        import aiohttp
+
+        try:
+            async with session.get(f'{host.url}/health', timeout=aiohttp.ClientTimeout(total=HEALTH_TIMEOUT)) as response:
+                if response.status != 200:
+                    raise RuntimeError(f'health returned {response.status}')
+                health = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, RuntimeError, ValueError) as e:
+            healthy, error = False, str(e) or type(e).__name__
+        else:
+            healthy, error = True, ''
+            load = health.get('load') or {}
+            host.jobs = int(load.get('activeJobs', host.active))
+            host.cpu_load = float(load.get('loadAverage', 0)) / max(1, int(load.get('cpus', 1)))
+
+        async with self.condition:
+            host.healthy, host.last_error = healthy, error
+            self.condition.notify_all()
+        return healthy
+
+    async def probe_all(self, session):
+        return await asyncio.gather(*(self.probe(session, host) for host in self.hosts))
+
+    async def find_job(self, session, key):
+        """Host whose job registry has `key` running or finished, or None"""
+        import aiohttp
+
+        async def has_job(host):
+            try:
+                async with session.get(f'{host.url}/api/jobs/{key}', timeout=aiohttp.ClientTimeout(total=HEALTH_TIMEOUT)) as response:
+                    return response.status == 200 and (await response.json(content_type=None)).get('status') != 'error'
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return False
+
+        hosts = [host for host in self.hosts if host.healthy is not False]
+        found = await asyncio.gather(*(has_job(host) for host in hosts))
+        return next((host for host, has in zip(hosts, found) if has), None)
+
+    async def watch(self, session, done):
+        """Probe every host until `done` is set"""
+        while not done.is_set():
+            await self.probe_all(session)
+            try:
+                await asyncio.wait_for(done.wait(), HEALTH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    # Dispatch
+
+    async def acquire(self, exclude=(), prefer=None):
+        """Least-loaded available host not in `exclude`; None when there is none left to try.
+        A usable `prefer` host is waited for even when others are free"""
+        candidates = [host for host in self.hosts if host not in exclude]
+        down_since = None
+        async with self.condition:
+            while candidates:
+                now = time.monotonic()
+                if prefer in candidates and prefer.usable(now):
+                    available = [prefer] if prefer.available(now) else []
+                else:
+                    available = [host for host in candidates if host.available(now)]
+                if available:
+                    host = min(available, key=lambda h: h.load)
+                    host.active += 1
+                    host.jobs += 1
+                    return host
+
+                # Wait for a slot, a backoff to expire or a probe to bring a host back
+                if any(host.healthy is not False for host in candidates):
+                    down_since = None
+                else:
+                    down_since = down_since or now
+                    if now - down_since >= HOSTS_DOWN_TIMEOUT:
+                        return None
+                wake = min((host.backoff_until - now for host in candidates if host.backoff_until > now), default=HEALTH_INTERVAL)
+                try:
+                    await asyncio.wait_for(self.condition.wait(), max(0.1, min(wake, HEALTH_INTERVAL)))
+                except asyncio.TimeoutError:
+                    pass
+        return None
+
+    async def release(self, host, error='', host_fault=False):
+        """Free the host's slot; a host fault backs the host off so other hosts take the work"""
+        async with self.condition:
+            host.active -= 1
+            host.jobs = max(0, host.jobs - 1)
+            if not error:
+                host.completed += 1
+                host.failures = 0
+            else:
+                host.failed += 1
+                if host_fault:
+                    host.failures += 1
+                    host.last_error = error
+                    backoff = min(FAILURE_BACKOFF_MAX, FAILURE_BACKOFF * 2 ** (host.failures - 1))
+                    host.backoff_until = time.monotonic() + backoff
+            self.condition.notify_all()
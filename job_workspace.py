@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Per-job workspaces for video generation
+Each generation gets its own directory under output/jobs/<id>/ holding its
+manifest (the content to render) and its intermediate files, and the render
+endpoint is given the manifest path. Nothing is shared between jobs, so several
+can run on one host at once instead of overwriting src/remotion/synced-data.json.
+
+Usage:
+    from job_workspace import JobWorkspace
+    workspace = JobWorkspace.create('viral')
+    workspace.write_manifest(synced_data)
+    url = f'{API_URL}/api/video/generate-synced?{workspace.query()}'
+"""
+import json
+import os
+import secrets
+import socket
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlencode
+
+# Same directory the Node side (src/utils/jobWorkspace.ts) accepts manifests from
+JOBS_DIR = os.path.join('output', 'jobs')
+MANIFEST_NAME = 'manifest.json'
+# Present while a process works in the job; output_gc.py never evicts such a job
+LIVE_NAME = 'live.json'
+
+
+def new_job_id(prefix='job'):
+    """Sortable, collision-free id: prefix, timestamp and random suffix"""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+
+
+class JobWorkspace:
+    """Directory and manifest owned by a single generation job"""
+
+    def __init__(self, job_id, jobs_dir=JOBS_DIR):
+        self.id = job_id
+        self.dir = os.path.abspath(os.path.join(jobs_dir, job_id))
+        self.manifest_path = os.path.join(self.dir, MANIFEST_NAME)
+
+    @classmethod
+    def create(cls, prefix='job', jobs_dir=JOBS_DIR):
+        """Create a fresh workspace directory"""
+        workspace = cls(new_job_id(prefix), jobs_dir)
+        os.makedirs(workspace.dir)
+        return workspace
+
+    @classmethod
+    def open(cls, manifest_path):
+        """Workspace of an existing manifest"""
+        directory = os.path.dirname(os.path.abspath(manifest_path))
+        return cls(os.path.basename(directory), os.path.dirname(directory))
+
+    def path(self, *parts):
+        """Path of a file inside the workspace"""
+        return os.path.join(self.dir, *parts)
+
+    def write_manifest(self, data):
+        """Write the manifest atomically, so a render never reads half a file"""
+        manifest = {**data, 'jobId': self.id}
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+        return self.manifest_path
+
+    def read_manifest(self):
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @contextmanager
+    def live(self):
+        """Mark the job as in use by this process for the duration of the block"""
+        live_path = self.path(LIVE_NAME)
+        with open(live_path, 'w', encoding='utf-8') as f:
+            json.dump({'host': socket.gethostname(), 'pid': os.getpid(), 'startedAt': datetime.now().isoformat()}, f)
+        try:
+            yield self
+        finally:
+            try:
+                os.remove(live_path)
+            except FileNotFoundError:
+                pass
+
+    def query(self, **params):
+        """Query string for the render endpoints, including the manifest path"""
+        return urlencode({**params, 'manifest': self.manifest_path})
+
+    def __repr__(self):
+        return f"JobWorkspace({self.id!r})"
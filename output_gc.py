@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Garbage collector for the output directories
+Each managed directory has a byte budget. When it is over budget, its entries
+(the files and subdirectories directly inside it, so a job directory goes as a
+whole) are evicted least recently used first, by last access time, until it
+fits again. Never evicted:
+  - pinned paths (`output_gc.py pin output/videos/final.mp4`)
+  - jobs that are live: a live.json marker from a running pipeline (see
+    JobWorkspace.live), or any file changed within --live-window
+  - files a live job's manifest references (segment audio, B-roll...)
+
+Reclaiming is incremental: files are deleted one at a time, large files are
+truncated in steps before the unlink, and deletion is throttled to --rate so a
+pass never competes with a render for disk I/O. Deleted files are removed
+from the artifact catalog.
+
+Relative budget directories and the pins file are taken from the repo root,
+so a pass sees the same files whatever directory it is started from.
+
+Run:
+    python3 output_gc.py                          # one pass with the default budgets
+    python3 output_gc.py --dry-run                # show what would be evicted
+    python3 output_gc.py --watch 600              # keep running, one pass every 10 min
+    python3 output_gc.py --budget output/audio=500M --budget output/jobs=50G
+    python3 output_gc.py pin output/videos/final.mp4
+    python3 output_gc.py status
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from datetime import datetime
+
+from artifact_catalog import PROJECT_ROOT, catalog_key, default_catalog, resolve_key
+from job_workspace import JOBS_DIR, LIVE_NAME, MANIFEST_NAME
+
+PINS_PATH = os.environ.get('OUTPUT_GC_PINS', os.path.join(PROJECT_ROOT, 'output', 'gc-pins.json'))
+
+# Directory → byte budget; OUTPUT_GC_BUDGETS="output/audio=2G,output/jobs=20G" replaces these
+DEFAULT_BUDGETS = {
+    os.path.join('output', 'audio'): '2G',
+    os.path.join('output', 'temp'): '1G',
+    os.path.join('output', 'broll'): '5G',
+    os.path.join('public', 'broll'): '2G',
+    JOBS_DIR: '20G',
+    os.path.join('output', 'videos'): '50G',
+    os.path.join('output', 'idempotency'): '50M',
+}
+
+LIVE_WINDOW = 3600        # seconds since the last change for a job to count as live
+LIVE_MARKER_TTL = 6 * 3600  # a live.json from another host older than this is stale
+RATE = 256 * 1024 ** 2    # bytes deleted per second
+TRUNCATE_STEP = 256 * 1024 ** 2
+
+UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_size(value):
+    """'500M', '2G', '1.5T' or plain bytes"""
+    value = str(value).strip().upper().rstrip('B')
+    if value and value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+    return int(value)
+
+
+def format_size(size):
+    for unit in ('B', 'K', 'M', 'G'):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}" if unit != 'B' else f"{size}B"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+def parse_budgets(specs):
+    """['dir=2G', ...] → {dir: bytes}"""
+    budgets = {}
+    for spec in specs:
+        directory, _, size = spec.partition('=')
+        if not size:
+            raise ValueError(f"Budget must look like DIR=SIZE, got {spec!r}")
+        budgets[os.path.normpath(directory)] = parse_size(size)
+    return budgets
+
+
+def default_budgets():
+    env = os.environ.get('OUTPUT_GC_BUDGETS')
+    if env:
+        return parse_budgets([spec for spec in env.split(',') if spec.strip()])
+    return {directory: parse_size(size) for directory, size in DEFAULT_BUDGETS.items()}
+
+
+# Pins
+
+def load_pins(path=PINS_PATH):
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return set(json.load(f))
+
+
+def save_pins(pins, path=PINS_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(sorted(pins), f, indent=2)
+    os.replace(temp_path, path)
+
+
+# Scanning
+
+def entry_usage(path):
+    """(bytes, last access) of a file, or of everything under a directory"""
+    if not os.path.isdir(path) or os.path.islink(path):
+        stat = os.lstat(path)
+        # max() because noatime/relatime mounts may leave atime older than the last write
+        return stat.st_size, max(stat.st_atime, stat.st_mtime)
+    size, last = 0, os.lstat(path).st_mtime
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.lstat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            last = max(last, stat.st_atime, stat.st_mtime)
+    return size, last
+
+
+def newest_change(path):
+    latest = os.lstat(path).st_mtime
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                latest = max(latest, os.lstat(os.path.join(root, name)).st_mtime)
+            except FileNotFoundError:
+                continue
+    return latest
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def is_live_job(job_dir, now, live_window=LIVE_WINDOW):
+    """A process marked the job live and is still running, or something in it changed recently"""
+    marker = os.path.join(job_dir, LIVE_NAME)
+    if os.path.exists(marker):
+        try:
+            with open(marker, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            info = {}
+        if info.get('host') == socket.gethostname():
+            if process_alive(info.get('pid', -1)):
+                return True
+        elif now - os.path.getmtime(marker) < LIVE_MARKER_TTL:
+            return True
+    return now - newest_change(job_dir) < live_window
+
+
+def manifest_references(job_dir):
+    """Existing files a job's manifest points at, wherever they live"""
+    try:
+        with open(os.path.join(job_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return set()
+
+    strings = []
+
+    def collect(value):
+        if isinstance(value, str):
+            strings.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    collect(manifest)
+    references = set()
+    for value in strings:
+        if '/' not in value or len(value) > 4096:
+            continue
+        # Absolute, relative to the job, or a Remotion public path (/broll/... → public/broll/...)
+        for candidate in (value, os.path.join(job_dir, value), resolve_key(os.path.join('public', value.lstrip('/')))):
+            if os.path.isfile(candidate):
+                references.add(os.path.abspath(candidate))
+                break
+    return references
+
+
+def live_jobs(now, live_window=LIVE_WINDOW, jobs_dir=JOBS_DIR):
+    """Directories of the live jobs and the files they reference"""
+    jobs, references = set(), set()
+    jobs_dir = resolve_key(jobs_dir)
+    if not os.path.isdir(jobs_dir):
+        return jobs, references
+    for entry in os.scandir(jobs_dir):
+        if entry.is_dir(follow_symlinks=False) and is_live_job(entry.path, now, live_window):
+            jobs.add(os.path.abspath(entry.path))
+            references |= manifest_references(entry.path)
+    return jobs, references
+
+
+def overlaps(path, protected):
+    """Path is, contains, or is inside one of the protected paths"""
+    prefix = path + os.sep
+    return any(p == path or p.startswith(prefix) or path.startswith(p + os.sep) for p in protected)
+
+
+# Reclaiming
+
+class Throttle:
+    """Sleeps so that deletions average at most `rate` bytes per second"""
+
+    def __init__(self, rate=RATE):
+        self.rate = rate
+        self.started = time.monotonic()
+        self.bytes = 0
+
+    def spend(self, size):
+        self.bytes += size
+        if self.rate:
+            delay = self.bytes / self.rate - (time.monotonic() - self.started)
+            if delay > 0:
+                time.sleep(delay)
+
+
+def reclaim_file(path, throttle):
+    """Delete a file, shrinking a large one in steps first so the unlink never frees gigabytes at once"""
+    size = os.lstat(path).st_size
+    if size > TRUNCATE_STEP and not os.path.islink(path):
+        with open(path, 'r+b') as f:
+            remaining = size
+            while remaining > TRUNCATE_STEP:
+                remaining -= TRUNCATE_STEP
+                f.truncate(remaining)
+                throttle.spend(TRUNCATE_STEP)
+        size = remaining
+    os.remove(path)
+    throttle.spend(size)
+
+
+def reclaim(path, throttle, catalog):
+    """Delete a file or directory tree; returns the bytes freed"""
+    files = [path] if not os.path.isdir(path) or os.path.islink(path) else [
+        os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+    ]
+    freed = 0
+    for file_path in files:
+        try:
+            size = os.lstat(file_path).st_size
+            reclaim_file(file_path, throttle)
+        except FileNotFoundError:
+            continue
+        freed += size
+        if catalog.get(file_path):
+            catalog.remove(file_path)
+    if os.path.isdir(path) and not os.path.islink(path):
+        for root, dirs, _ in os.walk(path, topdown=False):
+            for name in dirs:
+                try:
+                    os.rmdir(os.path.join(root, name))
+                except OSError:
+                    pass
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+    return freed
+
+
+def collect_directory(directory, budget, protected, throttle, catalog, dry_run=False):
+    """Evict a directory's least recently used entries until it fits its budget"""
+    report = {'directory': directory, 'budget': budget, 'used': 0, 'reclaimed': 0, 'evicted': 0, 'protected': 0}
+    directory = resolve_key(directory)
+    if not os.path.isdir(directory):
+        return report
+
+    entries = []
+    for entry in os.scandir(directory):
+        try:
+            size, last_access = entry_usage(entry.path)
+        except FileNotFoundError:
+            continue
+        entries.append((last_access, size, os.path.abspath(entry.path)))
+        report['used'] += size
+
+    over = report['used'] - budget
+    for last_access, size, path in sorted(entries):
+        if over <= 0:
+            break
+        if os.path.basename(path) in (os.path.basename(PINS_PATH), os.path.basename(catalog.path)):
+            continue
+        if overlaps(path, protected):
+            report['protected'] += 1
+            continue
+        freed = size if dry_run else reclaim(path, throttle, catalog)
+        over -= freed
+        report['reclaimed'] += freed
+        report['evicted'] += 1
+        print(f"   🗑️  {'[dry-run] ' if dry_run else ''}{catalog_key(path)}  {format_size(freed)}"
+              f"  (last used {datetime.fromtimestamp(last_access):%Y-%m-%d %H:%M})")
+    return report
+
+
+def run_pass(budgets, pins_path=PINS_PATH, rate=RATE, live_window=LIVE_WINDOW, dry_run=False, catalog=None):
+    """One collection pass over every budgeted directory; returns the per-directory reports"""
+    catalog = catalog or default_catalog()
+    now = time.time()
+    jobs, references = live_jobs(now, live_window)
+    protected = {resolve_key(p) for p in load_pins(pins_path)} | jobs | references
+    # B-roll staged for a live job's render lives in public/broll/<job>/
+    protected |= {resolve_key(os.path.join('public', 'broll', os.path.basename(job))) for job in jobs}
+    throttle = Throttle(rate)
+    return [
+        collect_directory(directory, budget, protected, throttle, catalog, dry_run)
+        for directory, budget in budgets.items()
+    ]
+
+
+def print_reports(reports):
+    total = 0
+    for report in reports:
+        total += report['reclaimed']
+        print(f"📂 {report['directory']:<20} {format_size(report['used']):>8} / {format_size(report['budget']):>8}"
+              f"  reclaimed {format_size(report['reclaimed'])} ({report['evicted']} entries"
+              f"{', %d protected' % report['protected'] if report['protected'] else ''})")
+    print(f"✅ Reclaimed {format_size(total)}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Budgeted LRU garbage collector for output directories')
+    parser.add_argument('command', nargs='?', default='run', choices=('run', 'status', 'pin', 'unpin', 'pins'))
+    parser.add_argument('paths', nargs='*', help='Paths to pin or unpin')
+    parser.add_argument('--budget', action='append', default=[], metavar='DIR=SIZE',
+                        help='Byte budget for a directory, e.g. output/audio=2G (repeatable; replaces the defaults)')
+    parser.add_argument('--pins', default=PINS_PATH, help='Pin list (default: %(default)s)')
+    parser.add_argument('--rate', type=parse_size, default=RATE, help='Max bytes deleted per second (default: 256M, 0 = unthrottled)')
+    parser.add_argument('--live-window', type=float, default=LIVE_WINDOW,
+                        help='Jobs changed within this many seconds are live (default: %(default)s)')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be evicted without deleting')
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS', help='Keep running, one pass every SECONDS')
+    args = parser.parse_args()
+
+    if args.command in ('pin', 'unpin'):
+        pins = load_pins(args.pins)
+        for path in args.paths:
+            if args.command == 'pin':
+                pins.add(catalog_key(path))
+            else:
+                pins.discard(catalog_key(path))
+        save_pins(pins, args.pins)
+        print(f"📌 {len(pins)} pinned paths in {args.pins}")
+        return 0
+    if args.command == 'pins':
+        for path in sorted(load_pins(args.pins)):
+            print(f"📌 {path}")
+        return 0
+
+    budgets = parse_budgets(args.budget) if args.budget else default_budgets()
+    if args.command == 'status':
+        for directory, budget in budgets.items():
+            path = resolve_key(directory)
+            used = sum(entry_usage(e.path)[0] for e in os.scandir(path)) if os.path.isdir(path) else 0
+            flag = '⚠️ ' if used > budget else '  '
+            print(f"{flag}{directory:<20} {format_size(used):>8} / {format_size(budget):>8}")
+        return 0
+
+    while True:
+        reports = run_pass(budgets, args.pins, args.rate, args.live_window, args.dry_run)
+        print_reports(reports)
+        if args.watch is None:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Resumable, stage-checkpointed generation pipeline
+A job runs script → TTS segments → combined audio → transcript → B-roll →
+render inside its workspace (output/jobs/<id>/). After each stage a checkpoint
+records a hash of the stage's inputs and the sha256 of every file it wrote, so
+a rerun skips each stage whose inputs and outputs are unchanged and resumes at
+the first one that is not: after a crash, after the script was edited, or on
+another node that sees the same job directory. Checkpoint paths are relative
+to the job directory; the TTS server and the Node API must see it too, since
+they write the audio, B-roll and video into it.
+
+Run:
+    python3 pipeline.py psych_001                # resume the script's latest job, or start one
+    python3 pipeline.py psych_001 --new          # start a fresh job
+    python3 pipeline.py psych_001 --from broll   # redo B-roll and everything after it
+    python3 pipeline.py psych_001 --status       # show which stages are still valid
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import wave
+from datetime import datetime
+
+import requests
+
+import script_store
+from artifact_catalog import default_catalog, file_digest
+from job_workspace import JOBS_DIR, JobWorkspace
+from sse_client import SSEClient
+
+API_URL = os.environ.get('API_URL', 'http://localhost:3000')
+TTS_URL = os.environ.get('TTS_SERVER_URL', 'http://localhost:5555')
+
+CHECKPOINTS_NAME = 'checkpoints.json'
+STAGES = ('script', 'tts', 'audio', 'transcript', 'broll', 'render')
+
+# The debug renderer reads hook, segment_0..4 and cta
+MAX_SEGMENTS = 5
+TTS_TIMEOUT = 600
+
+
+class PipelineError(Exception):
+    """A stage failed; its checkpoint is not written"""
+
+
+def value_digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def write_json(path, data):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def split_segments(text, max_segments=MAX_SEGMENTS):
+    """Script body as up to max_segments runs of whole sentences"""
+    sentences = [s for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s]
+    count = min(max_segments, len(sentences))
+    return [' '.join(sentences[i * len(sentences) // count:(i + 1) * len(sentences) // count]) for i in range(count)]
+
+
+def concat_wavs(paths, output_path):
+    """Concatenate segment wavs; ffmpeg only when their formats differ"""
+    temp_path = f"{output_path}.tmp.wav"
+    params = []
+    for path in paths:
+        with wave.open(path, 'rb') as w:
+            params.append(w.getparams())
+    if len({p[:3] for p in params}) == 1:
+        with wave.open(temp_path, 'wb') as out:
+            out.setparams(params[0])
+            for path in paths:
+                with wave.open(path, 'rb') as w:
+                    out.writeframes(w.readframes(w.getnframes()))
+    else:
+        inputs = sum((['-i', path] for path in paths), [])
+        graph = ''.join(f'[{i}:a]' for i in range(len(paths))) + f'concat=n={len(paths)}:v=0:a=1'
+        subprocess.run(['ffmpeg', '-y', '-v', 'error', *inputs, '-filter_complex', graph, temp_path], check=True)
+    os.replace(temp_path, output_path)
+
+
+class Checkpoints:
+    """Per-job record of completed stages: input hash and output file hashes"""
+
+    def __init__(self, workspace):
+        self.workspace = workspace
+        self.path = workspace.path(CHECKPOINTS_NAME)
+        self.stages = read_json(self.path)['stages'] if os.path.exists(self.path) else {}
+
+    def is_valid(self, stage, inputs_hash):
+        """Completed with these inputs and every output still on disk, unchanged"""
+        record = self.stages.get(stage)
+        if not record or record['inputs'] != inputs_hash:
+            return False
+        for relpath, digest in record['outputs'].items():
+            path = self.workspace.path(relpath)
+            if not os.path.exists(path) or file_digest(path) != digest:
+                return False
+        return True
+
+    def record(self, stage, inputs_hash, outputs):
+        self.stages[stage] = {
+            'inputs': inputs_hash,
+            'outputs': {relpath: file_digest(self.workspace.path(relpath)) for relpath in outputs},
+            'completedAt': datetime.now().isoformat()
+        }
+        write_json(self.path, {'jobId': self.workspace.id, 'stages': self.stages})
+
+    def invalidate(self, stage):
+        """Forget a stage and everything after it"""
+        for name in STAGES[STAGES.index(stage):]:
+            self.stages.pop(name, None)
+        write_json(self.path, {'jobId': self.workspace.id, 'stages': self.stages})
+
+    def outputs_hash(self, stage):
+        return value_digest(self.stages[stage]['outputs'])
+
+
+class Pipeline:
+    """Runs a script's stages in a job workspace, skipping the ones still valid"""
+
+    def __init__(self, workspace, script_id, seed=None, style=3, on_event=None, catalog=None):
+        self.workspace = workspace
+        self.script_id = script_id
+        self.seed = seed
+        self.style = style
+        self.on_event = on_event or (lambda event: None)
+        self.checkpoints = Checkpoints(workspace)
+        self.catalog = catalog or default_catalog()
+
+    def emit(self, type, stage, **fields):
+        self.on_event({'type': type, 'stage': stage, 'jobId': self.workspace.id, **fields})
+
+    def stage_inputs(self, stage):
+        """What a stage's result depends on: its parameters and the outputs of the stages it reads"""
+        if stage == 'script':
+            script = script_store.load_script(self.script_id)
+            if script is None:
+                raise PipelineError(f"Script {self.script_id} not found")
+            return {'script': script}
+        upstream = {
+            'tts': ['script'],
+            'audio': ['tts'],
+            'transcript': ['tts'],
+            'broll': ['script'],
+            'render': ['script', 'audio', 'transcript', 'broll'],
+        }[stage]
+        params = {'tts': {'seed': self.seed}, 'render': {'style': self.style}}.get(stage, {})
+        return {**params, 'upstream': {name: self.checkpoints.outputs_hash(name) for name in upstream}}
+
+    def run(self, from_stage=None):
+        """Run every stage that is not valid; returns the final manifest"""
+        with self.workspace.live():
+            if from_stage:
+                self.checkpoints.invalidate(from_stage)
+            for stage in STAGES:
+                inputs = self.stage_inputs(stage)
+                inputs_hash = value_digest(inputs)
+                if self.checkpoints.is_valid(stage, inputs_hash):
+                    self.emit('skip', stage)
+                    continue
+                self.emit('start', stage)
+                outputs = getattr(self, f'run_{stage}')(inputs)
+                self.checkpoints.record(stage, inputs_hash, outputs)
+                for relpath, digest in self.checkpoints.stages[stage]['outputs'].items():
+                    self.catalog.record(
+                        self.workspace.path(relpath), job_id=self.workspace.id, script_id=self.script_id, stage=stage, sha256=digest
+                    )
+                self.emit('done', stage, outputs=outputs)
+            return self.workspace.read_manifest()
+
+    def status(self):
+        """{stage: True/False} without running anything; stops checking at the first invalid stage"""
+        result, valid = {}, True
+        for stage in STAGES:
+            if valid:
+                try:
+                    valid = self.checkpoints.is_valid(stage, value_digest(self.stage_inputs(stage)))
+                except (KeyError, PipelineError):
+                    valid = False
+            result[stage] = valid
+        return result
+
+    # Stages; each writes its files into the workspace and returns their relative paths
+
+    def script(self):
+        return read_json(self.workspace.path('script.json'))
+
+    def run_script(self, inputs):
+        write_json(self.workspace.path('script.json'), inputs['script'])
+        return ['script.json']
+
+    def run_tts(self, inputs):
+        script = self.script()
+        texts = [('hook', script['hook'])]
+        texts += [(f'segment_{i}', text) for i, text in enumerate(split_segments(script['script']))]
+        if script.get('cta'):
+            texts.append(('cta', script['cta']))
+
+        os.makedirs(self.workspace.path('audio'), exist_ok=True)
+        items = [{'text': text, 'output_path': self.workspace.path('audio', f'{name}.wav')} for name, text in texts]
+        payload = {'items': items, **({'seed': self.seed} if self.seed is not None else {})}
+        response = requests.post(f'{TTS_URL}/batch', json=payload, timeout=TTS_TIMEOUT)
+        response.raise_for_status()
+        results = response.json()['results']
+
+        segments = []
+        for (name, text), result in zip(texts, results):
+            if not result.get('success'):
+                raise PipelineError(f"TTS failed for {name}: {result.get('error')}")
+            segments.append({
+                'name': name,
+                'text': text,
+                'file': f'audio/{name}.wav',
+                'duration': result['duration'],
+                'words': result.get('words', [])
+            })
+        write_json(self.workspace.path('tts.json'), {'seed': self.seed, 'segments': segments})
+        return ['tts.json'] + [segment['file'] for segment in segments]
+
+    def run_audio(self, inputs):
+        segments = read_json(self.workspace.path('tts.json'))['segments']
+        concat_wavs([self.workspace.path(s['file']) for s in segments], self.workspace.path('audio', 'combined.wav'))
+        return ['audio/combined.wav']
+
+    def run_transcript(self, inputs):
+        segments = read_json(self.workspace.path('tts.json'))['segments']
+        words, offset = [], 0.0
+        for segment in segments:
+            timed = segment['words']
+            if not timed:
+                # Without timestamps spread the words evenly, as the debug renderer does
+                plain = segment['text'].split()
+                step = segment['duration'] / max(1, len(plain))
+                timed = [{'word': w, 'start': i * step, 'end': (i + 1) * step, 'confidence': 0.0} for i, w in enumerate(plain)]
+            for word in timed:
+                words.append({
+                    'word': word['word'],
+                    'start': round(word['start'] + offset, 4),
+                    'end': round(word['end'] + offset, 4),
+                    'confidence': word.get('confidence', 1.0)
+                })
+            offset += segment['duration']
+        write_json(self.workspace.path('transcript.json'), {
+            'words': words,
+            'text': ' '.join(w['word'] for w in words),
+            'duration': offset
+        })
+        return ['transcript.json']
+
+    def run_broll(self, inputs):
+        response = requests.post(f'{API_URL}/api/viral-debug/broll', json={
+            'viralScript': self.script(),
+            'manifest': self.workspace.manifest_path
+        }, timeout=TTS_TIMEOUT)
+        if response.status_code != 200:
+            raise PipelineError(f"B-roll failed: {response.text}")
+        videos = [os.path.relpath(path, self.workspace.dir) for path in response.json()['brollVideos']]
+        if any(video.startswith('..') for video in videos):
+            raise PipelineError('B-roll was not copied into the job')
+        write_json(self.workspace.path('broll.json'), {'brollVideos': videos})
+        return ['broll.json'] + videos
+
+    def run_render(self, inputs):
+        script = self.script()
+        transcript = read_json(self.workspace.path('transcript.json'))
+        self.workspace.write_manifest({
+            'title': script['title'],
+            'duration': transcript['duration'],
+            'words': transcript['words'],
+            'text': transcript['text'],
+            'audioPath': 'audio/combined.wav',
+            'brollVideos': read_json(self.workspace.path('broll.json'))['brollVideos'],
+            'style': self.style,
+            'metadata': {'scriptId': script['id'], 'tags': script.get('tags', [])}
+        })
+        # Stale videos of earlier renders must not count as this one's output
+        for old in glob.glob(self.workspace.path('video*.mp4')):
+            os.remove(old)
+
+        client = SSEClient()
+        url = f'{API_URL}/api/viral-debug/generate'
+        for data in client.json_events('POST', url, json={'viralScript': script, 'manifest': self.workspace.manifest_path}):
+            if data.get('type') == 'progress':
+                self.emit('progress', 'render', progress=data.get('progress', 0), message=data.get('message', ''))
+            elif data.get('type') == 'complete':
+                video = os.path.relpath(data['videoPath'], self.workspace.dir)
+                if video.startswith('..'):
+                    raise PipelineError(f"Render wrote outside the job: {data['videoPath']}")
+                # The renderer rewrites the manifest as the composition's props; without word timings there are no captions
+                props = read_json(self.workspace.manifest_path)
+                captioned = sum(len(segment.get('wordTimings') or []) for segment in props.get('segments') or [])
+                if captioned < len(transcript['words']):
+                    raise PipelineError(f"Render had captions for {captioned} of {len(transcript['words'])} words")
+                return [video]
+            elif data.get('type') == 'error':
+                raise PipelineError(f"Render failed: {data.get('error') or data.get('message')}")
+        raise PipelineError('Render stream ended without a result')
+
+
+def latest_job(script_id, jobs_dir=JOBS_DIR, catalog=None):
+    """Pipeline workspace of the script's most recent artifact, or None (looked up in the artifact catalog)"""
+    entries = (catalog or default_catalog()).find(script_id=script_id)
+    job_id = next((e['job_id'] for e in entries if (e.get('job_id') or '').startswith(f'pipeline_{script_id}_')), None)
+    return JobWorkspace(job_id, jobs_dir) if job_id and os.path.isdir(os.path.join(jobs_dir, job_id)) else None
+
+
+def workspace_for(script_id, new=False):
+    """Resume the script's latest job unless a new one is asked for"""
+    workspace = None if new else latest_job(script_id)
+    if workspace is None:
+        workspace = JobWorkspace.create(f'pipeline_{script_id}')
+        workspace.write_manifest({'metadata': {'scriptId': script_id}})
+    return workspace
+
+
+def print_event(event):
+    if event['type'] == 'skip':
+        print(f"⏭️  {event['stage']}: checkpoint valid, skipped")
+    elif event['type'] == 'start':
+        print(f"▶️  {event['stage']}...")
+    elif event['type'] == 'done':
+        print(f"✅ {event['stage']}: {len(event['outputs'])} files")
+    elif event['type'] == 'progress':
+        print(f"   [{event['progress']}%] {event['message']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumable viral video pipeline')
+    parser.add_argument('script_id')
+    parser.add_argument('--job', default=None, help='Job id to resume (default: latest job of the script)')
+    parser.add_argument('--new', action='store_true', help='Start a fresh job')
+    parser.add_argument('--from', dest='from_stage', choices=STAGES, default=None, help='Rerun from this stage')
+    parser.add_argument('--seed', type=int, default=None, help='TTS seed (default: server default)')
+    parser.add_argument('--style', type=int, default=3, choices=range(1, 7))
+    parser.add_argument('--status', action='store_true', help='Show stage checkpoints and exit')
+    args = parser.parse_args()
+
+    if script_store.load_script(args.script_id) is None:
+        print(f"❌ Script {args.script_id} not found in {script_store.DB_PATH}")
+        return 1
+    workspace = JobWorkspace(args.job) if args.job else workspace_for(args.script_id, args.new)
+    pipeline = Pipeline(workspace, args.script_id, args.seed, args.style, print_event)
+    print(f"📂 Job {workspace.id}")
+
+    if args.status:
+        for stage, valid in pipeline.status().items():
+            print(f"   {'✅' if valid else '⏳'} {stage}")
+        return 0
+
+    try:
+        manifest = pipeline.run(args.from_stage)
+    except (PipelineError, requests.RequestException, subprocess.CalledProcessError) as e:
+        print(f"❌ {e}\n   Rerun the same command to resume from the failed stage")
+        return 1
+    video = pipeline.checkpoints.stages['render']['outputs']
+    print(f"🎬 {workspace.path(next(iter(video)))}  ({manifest['title']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+SQLite script store for viral scripts
+Scripts live in one indexed table (id, channel, style, tags) instead of a JSON
+file that every CLI parses whole and that generators rewrite whole. Inserts are
+append-only, lookups by id and channel/tag/style queries use indexes, and
+listings are paginated by insertion order.
+
+data/viral-scripts.json keeps working: it is imported again whenever it
+changes (scripts removed from it are removed from the store), and
+load_viral_scripts() / export_json() return the same
+{"channel1_psychology": [...], "channel2_horror": [...]} shape.
+load_viral_scripts() only returns the file's scripts, as the CLIs did before;
+AI-generated scripts (source 'ai') stay out of menus and batches unless asked for.
+
+Run:
+    python3 script_store.py import data/viral-scripts.json
+    python3 script_store.py export data/viral-scripts-ai-generated.json --source ai
+    python3 script_store.py list --channel channel2_horror --tag creepypasta --limit 10
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+from artifact_catalog import PROJECT_ROOT, catalog_key
+
+# Anchored on the repo, not the working directory, so every CLI opens the same store
+DB_PATH = os.environ.get('SCRIPT_STORE_PATH', os.path.join(PROJECT_ROOT, 'data', 'scripts.db'))
+JSON_PATH = os.path.join(PROJECT_ROOT, 'data', 'viral-scripts.json')
+
+# Channel keys of the legacy JSON file, in display order
+CHANNELS = ('channel1_psychology', 'channel2_horror')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scripts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    channel TEXT NOT NULL,
+    style TEXT,
+    title TEXT,
+    source TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scripts_channel ON scripts (channel, seq);
+CREATE INDEX IF NOT EXISTS idx_scripts_style ON scripts (style, seq);
+CREATE TABLE IF NOT EXISTS script_tags (
+    tag TEXT NOT NULL,
+    script_seq INTEGER NOT NULL REFERENCES scripts (seq),
+    PRIMARY KEY (tag, script_seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS json_imports (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+
+def json_source(path=JSON_PATH):
+    """Source recorded for scripts imported from a JSON file: its path relative to the repo when inside it,
+    so the rows still match after the checkout moves"""
+    return catalog_key(path)
+
+
+def _tags_of(script):
+    return sorted({str(tag).strip().lower() for tag in script.get('tags') or [] if str(tag).strip()})
+
+
+class ScriptStore:
+    """Indexed, append-only collection of scripts in a SQLite file"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # WAL lets CLIs read while a generator is inserting
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA foreign_keys=ON')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Writes
+
+    def _insert(self, script, channel, source):
+        cursor = self.db.execute(
+            'INSERT INTO scripts (id, channel, style, title, source, data, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (script['id'], channel, script.get('style'), script.get('title'), source,
+             json.dumps(script, ensure_ascii=False), datetime.now().isoformat())
+        )
+        self.db.executemany(
+            'INSERT INTO script_tags (tag, script_seq) VALUES (?, ?)',
+            [(tag, cursor.lastrowid) for tag in _tags_of(script)]
+        )
+
+    def _free_id(self, script_id):
+        """script_id, or script_id_2, _3... if it is taken"""
+        candidate, n = script_id, 1
+        while self.db.execute('SELECT 1 FROM scripts WHERE id = ?', (candidate,)).fetchone():
+            n += 1
+            candidate = f"{script_id}_{n}"
+        return candidate
+
+    def add(self, scripts, channel, source='manual'):
+        """Append scripts to a channel; a taken id gets a numeric suffix. Returns the stored ids"""
+        ids = []
+        with self.db:
+            for script in scripts:
+                script = {**script, 'id': self._free_id(script.get('id') or f"{channel}_script")}
+                self._insert(script, channel, source)
+                ids.append(script['id'])
+        return ids
+
+    def import_json(self, path=JSON_PATH):
+        """Import a legacy JSON file; scripts already imported from it are updated or, when
+        no longer in it, removed. Scripts from other sources are kept as they are
+
+        Returns (added, updated, removed, skipped ids): an id that belongs to a
+        script from another source is skipped.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        source = json_source(path)
+        added = updated = 0
+        seen, skipped = set(), []
+        with self.db:
+            # Rows imported when sources were absolute paths
+            self.db.execute('UPDATE scripts SET source = ? WHERE source = ?', (source, os.path.abspath(path)))
+            for channel, scripts in data.items():
+                if not isinstance(scripts, list):
+                    continue
+                for script in scripts:
+                    if not script.get('id'):
+                        continue
+                    seen.add(script['id'])
+                    row = self.db.execute('SELECT seq, source, data FROM scripts WHERE id = ?', (script['id'],)).fetchone()
+                    encoded = json.dumps(script, ensure_ascii=False)
+                    if row is not None and row[1] != source:
+                        skipped.append(script['id'])
+                    elif row is None:
+                        self._insert(script, channel, source)
+                        added += 1
+                    elif row[1] == source and row[2] != encoded:
+                        # Edited in the file it came from
+                        self.db.execute(
+                            'UPDATE scripts SET channel = ?, style = ?, title = ?, data = ? WHERE seq = ?',
+                            (channel, script.get('style'), script.get('title'), encoded, row[0])
+                        )
+                        self.db.execute('DELETE FROM script_tags WHERE script_seq = ?', (row[0],))
+                        self.db.executemany(
+                            'INSERT INTO script_tags (tag, script_seq) VALUES (?, ?)',
+                            [(tag, row[0]) for tag in _tags_of(script)]
+                        )
+                        updated += 1
+
+            # Deleted from the file since the last import
+            gone = [
+                seq for seq, script_id in self.db.execute('SELECT seq, id FROM scripts WHERE source = ?', (source,))
+                if script_id not in seen
+            ]
+            self.db.executemany('DELETE FROM script_tags WHERE script_seq = ?', [(seq,) for seq in gone])
+            self.db.executemany('DELETE FROM scripts WHERE seq = ?', [(seq,) for seq in gone])
+            stat = os.stat(path)
+            self.db.execute(
+                'INSERT OR REPLACE INTO json_imports (path, mtime, size) VALUES (?, ?, ?)',
+                (source, stat.st_mtime, stat.st_size)
+            )
+        return added, updated, len(gone), skipped
+
+    def sync_json(self, path=JSON_PATH):
+        """Import a JSON file if it changed since the last import; returns whether it did"""
+        if not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        row = self.db.execute('SELECT mtime, size FROM json_imports WHERE path = ?', (json_source(path),)).fetchone()
+        if row == (stat.st_mtime, stat.st_size):
+            return False
+        skipped = self.import_json(path)[3]
+        if skipped:
+            print(f"⚠️  {path}: ids already used by scripts from another source, not imported: {', '.join(skipped)}", file=sys.stderr)
+        return True
+
+    # Reads
+
+    def get(self, script_id):
+        """Script by id, or None"""
+        row = self.db.execute('SELECT data FROM scripts WHERE id = ?', (script_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _where(self, channel=None, tag=None, style=None, source=None):
+        clauses, params = [], []
+        if channel:
+            clauses.append('channel = ?')
+            params.append(channel)
+        if style:
+            clauses.append('style = ?')
+            params.append(style)
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if tag:
+            clauses.append('seq IN (SELECT script_seq FROM script_tags WHERE tag = ?)')
+            params.append(tag.strip().lower())
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, channel=None, tag=None, style=None, source=None, limit=50, after=0):
+        """One page of scripts in insertion order, starting after the `after` cursor
+
+        Returns (scripts, cursor); pass the cursor back as `after` for the next
+        page, it is None after the last one.
+        """
+        where, params = self._where(channel, tag, style, source)
+        where += (' AND' if where else ' WHERE') + ' seq > ?'
+        rows = self.db.execute(
+            f'SELECT seq, data FROM scripts{where} ORDER BY seq LIMIT ?',
+            params + [after, limit + 1]
+        ).fetchall()
+        cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [json.loads(data) for _, data in rows[:limit]], cursor
+
+    def iter_scripts(self, page_size=500, **filters):
+        """All matching scripts, read a page at a time"""
+        after = 0
+        while after is not None:
+            scripts, after = self.query(limit=page_size, after=after, **filters)
+            yield from scripts
+
+    def count(self, **filters):
+        where, params = self._where(**filters)
+        return self.db.execute(f'SELECT COUNT(*) FROM scripts{where}', params).fetchone()[0]
+
+    def channels(self):
+        """Channels in the legacy order, then any others by name"""
+        names = {row[0] for row in self.db.execute('SELECT DISTINCT channel FROM scripts')}
+        return [c for c in CHANNELS if c in names] + sorted(names - set(CHANNELS))
+
+    def export_json(self, path=None, limit=None, **filters):
+        """Scripts in the legacy channel → list shape; written to path if given"""
+        filters.pop('channel', None)
+        data = {channel: [] for channel in CHANNELS}
+        for channel in self.channels():
+            if limit is None:
+                data[channel] = list(self.iter_scripts(channel=channel, **filters))
+            else:
+                data[channel] = self.query(channel=channel, limit=limit, **filters)[0]
+        if path:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, path)
+        return data
+
+
+def open_store(path=DB_PATH, json_path=JSON_PATH):
+    """Store with the legacy JSON file imported if it changed"""
+    store = ScriptStore(path)
+    store.sync_json(json_path)
+    return store
+
+
+def load_viral_scripts(limit=None, source=None):
+    """Drop-in for the CLIs' JSON load: {channel: [scripts]}, at most `limit` per channel
+
+    Only data/viral-scripts.json's scripts unless another source is given (e.g. 'ai').
+    """
+    with open_store() as store:
+        return store.export_json(limit=limit, source=source or json_source())
+
+
+def load_script(script_id):
+    """Script by id, or None"""
+    with open_store() as store:
+        return store.get(script_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Viral script store')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite file (default: %(default)s)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help='Import a viral-scripts JSON file')
+    import_parser.add_argument('path', nargs='?', default=JSON_PATH)
+
+    export_parser = commands.add_parser('export', help='Write scripts as a viral-scripts JSON file')
+    export_parser.add_argument('path')
+    export_parser.add_argument('--source', default=None, help='Only scripts from this source (e.g. ai)')
+
+    list_parser = commands.add_parser('list', help='List scripts, one page at a time')
+    list_parser.add_argument('--channel', default=None)
+    list_parser.add_argument('--tag', default=None)
+    list_parser.add_argument('--style', default=None)
+    list_parser.add_argument('--limit', type=int, default=20)
+    list_parser.add_argument('--after', type=int, default=0, help='Cursor printed by the previous page')
+
+    args = parser.parse_args()
+    # Listing and exporting first pick up changes to the legacy JSON file
+    with (ScriptStore(args.db) if args.command == 'import' else open_store(args.db)) as store:
+        if args.command == 'import':
+            added, updated, removed, skipped = store.import_json(args.path)
+            print(f"✅ {args.path}: {added} added, {updated} updated, {removed} removed ({store.count()} scripts in {args.db})")
+            if skipped:
+                print(f"⚠️  Skipped, id used by a script from another source: {', '.join(skipped)}")
+        elif args.command == 'export':
+            data = store.export_json(args.path, source=args.source)
+            print(f"✅ {sum(len(s) for s in data.values())} scripts written to {args.path}")
+        elif args.command == 'list':
+            scripts, cursor = store.query(args.channel, args.tag, args.style, limit=args.limit, after=args.after)
+            for script in scripts:
+                print(f"{script['id']:<20} {script.get('style') or '-':<16} {script.get('title', '')}")
+            if cursor is not None:
+                print(f"... next page: --after {cursor}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,12 +8,16 @@ import json
 import argparse
 from pathlib import Path
 
-def generate_with_chatterbox(text, output_path, voice_ref=None):
+def generate_with_chatterbox(text, output_path, voice_ref=None, seed=None):
     """Genera audio usando Chatterbox TTS"""
     try:
         import torch
         import torchaudio as ta
-        from chatterbox.tts import ChatterboxTTS
+        from tts_snapshot import load_chatterbox
+        from tts_seed import resolve_seed, seed_everything
+        
+        # Misma semilla y mismo texto dan el mismo audio
+        seed = resolve_seed(seed)
         
         # Detectar dispositivo disponible
         device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -21,10 +25,11 @@ def generate_with_chatterbox(text, output_path, voice_ref=None):
         
         # Cargar modelo
         print("Cargando modelo Chatterbox...", file=sys.stderr)
-        model = ChatterboxTTS.from_pretrained(device=device)
+        model = load_chatterbox(device)
         
         # Generar audio
-        print(f"Generando audio...", file=sys.stderr)
+        print(f"Generando audio (semilla {seed})...", file=sys.stderr)
+        seed_everything(seed)
         
         if voice_ref and Path(voice_ref).exists():
             # Usar voz de referencia para clonación
@@ -41,7 +46,8 @@ def generate_with_chatterbox(text, output_path, voice_ref=None):
             "output": output_path,
             "sample_rate": model.sr,
             "device": device,
-            "model": "chatterbox"
+            "model": "chatterbox",
+            "seed": seed
         }
         
     except ImportError as e:
@@ -103,11 +109,12 @@ def main():
     parser.add_argument('--output', required=True, help='Archivo de salida')
     parser.add_argument('--voice', help='Archivo de audio de referencia para clonar voz')
     parser.add_argument('--fallback', action='store_true', help='Usar fallback si Chatterbox falla')
+    parser.add_argument('--seed', type=int, help='Semilla para generar audio reproducible (por defecto TTS_DEFAULT_SEED)')
     
     args = parser.parse_args()
     
     # Intentar con Chatterbox primero
-    result = generate_with_chatterbox(args.text, args.output, args.voice)
+    result = generate_with_chatterbox(args.text, args.output, args.voice, args.seed)
     
     # Si falla y se permite fallback, usar alternativa
     if result['status'] == 'error' and args.fallback:
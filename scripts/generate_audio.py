@@ -1,33 +1,37 @@
 #!/usr/bin/env python3
 """
 Script simplificado para generar audio con Chatterbox TTS
-Uso: python3 generate_audio.py "texto" output.wav
+Uso: python3 generate_audio.py "texto" output.wav [seed]
 """
 
 import sys
 import json
 import torch
 import torchaudio as ta
-from chatterbox.tts import ChatterboxTTS
+from tts_snapshot import load_chatterbox
+from tts_seed import resolve_seed, seed_everything
 
 def main():
     if len(sys.argv) < 3:
-        print(json.dumps({"error": "Usage: python3 generate_audio.py 'text' output.wav"}))
+        print(json.dumps({"error": "Usage: python3 generate_audio.py 'text' output.wav [seed]"}))
         sys.exit(1)
     
     text = sys.argv[1]
     output_path = sys.argv[2]
     
     try:
+        seed = resolve_seed(sys.argv[3] if len(sys.argv) > 3 else None)
+        
         # Detectar dispositivo
         device = "cuda" if torch.cuda.is_available() else "cpu"
         
         # Cargar modelo
         print(f"Loading Chatterbox model on {device}...", file=sys.stderr)
-        model = ChatterboxTTS.from_pretrained(device=device)
+        model = load_chatterbox(device)
         
         # Generar audio
-        print(f"Generating audio for: {text[:50]}...", file=sys.stderr)
+        print(f"Generating audio for: {text[:50]}... (seed {seed})", file=sys.stderr)
+        seed_everything(seed)
         wav = model.generate(text)
         
         # Guardar audio
@@ -38,7 +42,8 @@ def main():
             "status": "success",
             "output": output_path,
             "sample_rate": model.sr,
-            "device": device
+            "device": device,
+            "seed": seed
         }
         print(json.dumps(result))
         
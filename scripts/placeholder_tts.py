@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Placeholder TTS for tests and pipeline dry runs
+Turns text into one tone (or noise) burst per word, timed with a syllable-count
+model of natural speech, and returns the exact word timestamps it used. Built
+with NumPy array ops: a sentence (about five seconds of audio) takes a few
+milliseconds on CPU, roughly a thousand times real time, so full pipeline
+load tests can run without the model.
+
+Usage: python3 scripts/placeholder_tts.py --text "Hola mundo" --output out.wav
+"""
+import argparse
+import json
+import re
+import sys
+import wave
+import zlib
+
+import numpy as np
+
+SAMPLE_RATE = 24000
+
+# Speech timing model: seconds per syllable, gap between words, pauses after punctuation
+SYLLABLE_SECONDS = 0.2
+WORD_GAP = 0.05
+PAUSES = {',': 0.2, ';': 0.25, ':': 0.25, '.': 0.4, '!': 0.4, '?': 0.4}
+LEAD_SECONDS = 0.1
+TAIL_SECONDS = 0.2
+
+# Attack/decay of each burst, so word boundaries show up in waveforms and alignment
+RAMP_SECONDS = 0.01
+
+# Samples in the single-period tone table (power of two for cheap wrap-around)
+WAVETABLE_SIZE = 1024
+
+VOWEL_GROUPS = re.compile(r"[aeiouyáéíóúüàèìòù]+")
+LETTERS = re.compile(r"[^a-záéíóúüñàèìòù0-9']")
+
+
+def syllable_count(word):
+    """Approximate syllables in an English or Spanish word"""
+    word = LETTERS.sub('', word.lower())
+    if not word:
+        return 0
+    digits = sum(c.isdigit() for c in word)
+    count = len(VOWEL_GROUPS.findall(word))
+    # Silent final e in English ("make", "time"), but not "le"/"ee" endings
+    if count > 1 and word.endswith('e') and not word.endswith(('le', 'ee')):
+        count -= 1
+    # Numbers are read out: roughly one and a half syllables per digit
+    return max(1, count + round(digits * 1.5))
+
+
+def tokenize(text):
+    """Whitespace-separated words, with punctuation-only tokens ("—", "...", "¡") joined to a neighbouring word"""
+    tokens = []
+    leading = ''
+    for token in text.split():
+        if not LETTERS.sub('', token.lower()):
+            # No letters or digits: it would be a zero-length word
+            if tokens:
+                tokens[-1] += token
+            else:
+                leading += token
+            continue
+        tokens.append(leading + token)
+        leading = ''
+    return tokens
+
+
+def word_timings(text, rate=1.0):
+    """Word start/end times in seconds, and the total duration"""
+    tokens = tokenize(text)
+    if not tokens:
+        return [], LEAD_SECONDS + TAIL_SECONDS
+
+    durations = np.array([syllable_count(t) for t in tokens], dtype=np.float64) * SYLLABLE_SECONDS / rate
+    pauses = np.array([WORD_GAP + PAUSES.get(t[-1], 0.0) for t in tokens]) / rate
+    starts = LEAD_SECONDS + np.concatenate(([0.0], np.cumsum(durations + pauses)[:-1]))
+    ends = starts + durations
+
+    words = [
+        {"word": token, "start": round(float(start), 4), "end": round(float(end), 4)}
+        for token, start, end in zip(tokens, starts, ends)
+    ]
+    return words, float(ends[-1] + TAIL_SECONDS)
+
+
+def _wavetable(size=WAVETABLE_SIZE):
+    """One period of a voice-like tone (fundamental plus two harmonics)"""
+    phase = np.arange(size, dtype=np.float32) * (2 * np.pi / size)
+    table = np.sin(phase) + 0.5 * np.sin(2 * phase) + 0.25 * np.sin(3 * phase)
+    return (table / np.abs(table).max()).astype(np.float32)
+
+
+WAVETABLE = _wavetable()
+
+
+def synthesize(text, sr=SAMPLE_RATE, mode='tone', rate=1.0, seed=0):
+    """Return (float32 samples, word timestamps) for a text"""
+    words, duration = word_timings(text, rate)
+    samples = np.zeros(int(np.ceil(duration * sr)), dtype=np.float32)
+    if not words:
+        return samples, words
+
+    # Work only on samples inside words: per-sample word index and offset into the word
+    starts = np.round(np.array([w['start'] for w in words]) * sr).astype(np.int64)
+    lengths = np.round(np.array([w['end'] - w['start'] for w in words]) * sr).astype(np.int64)
+    index = np.repeat(np.arange(len(words)), lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    local = np.arange(lengths.sum(), dtype=np.int64) - np.repeat(offsets, lengths)
+
+    if mode == 'noise':
+        signal = np.random.default_rng(seed).standard_normal(local.size, dtype=np.float32) * 0.5
+    else:
+        # A speech-like pitch per word, stable for the same word
+        pitches = np.array([110 + zlib.crc32(w['word'].lower().encode('utf-8')) % 150 for w in words])
+        step = (pitches * WAVETABLE_SIZE / sr)[index]
+        signal = WAVETABLE[(local * step).astype(np.int64) & (WAVETABLE_SIZE - 1)]
+
+    ramp = max(1, int(RAMP_SECONDS * sr))
+    envelope = np.minimum(np.minimum(local, lengths[index] - local), ramp).astype(np.float32) * (0.3 / ramp)
+    samples[local + np.repeat(starts, lengths)] = signal * envelope
+    return samples, words
+
+
+def save_wav(path, samples, sr=SAMPLE_RATE):
+    """Write float samples in [-1, 1] as 16-bit mono WAV"""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sr)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def generate(text, output_path, sr=SAMPLE_RATE, mode='tone', rate=1.0, seed=0):
+    """Write placeholder audio for a text and return the result with word timestamps"""
+    samples, words = synthesize(text, sr, mode, rate, seed)
+    save_wav(output_path, samples, sr)
+    return {
+        "status": "success",
+        "output": output_path,
+        "duration": samples.size / sr,
+        "sample_rate": sr,
+        "words": words,
+        "mode": "placeholder"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Placeholder TTS with exact word timestamps')
+    parser.add_argument('--text', required=True)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--mode', choices=['tone', 'noise'], default='tone')
+    parser.add_argument('--rate', type=float, default=1.0, help='Speaking rate multiplier')
+    parser.add_argument('--sample-rate', type=int, default=SAMPLE_RATE)
+    parser.add_argument('--seed', type=int, default=0, help='Noise seed (noise mode)')
+    args = parser.parse_args()
+
+    try:
+        result = generate(args.text, args.output, args.sample_rate, args.mode, args.rate, args.seed)
+        print(json.dumps(result))
+    except Exception as e:
+        print(json.dumps({"status": "error", "error": str(e)}))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
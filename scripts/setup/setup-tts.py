@@ -38,45 +38,17 @@ def setup_fallback_tts():
     tts_script = """#!/usr/bin/env python3
 import sys
 import json
-import wave
-import struct
-import math
+from pathlib import Path
 
-def generate_sine_wave(frequency=440, duration=1.0, sample_rate=44100):
-    \"\"\"Genera una onda sinusoidal simple\"\"\"
-    num_samples = int(sample_rate * duration)
-    samples = []
-    
-    for i in range(num_samples):
-        t = float(i) / sample_rate
-        value = int(32767 * math.sin(2 * math.pi * frequency * t))
-        samples.append(struct.pack('<h', value))
-    
-    return b''.join(samples)
+# Placeholder vectorizado con tiempos por palabra (scripts/placeholder_tts.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from placeholder_tts import generate
 
 def create_audio_file(text, output_path):
-    \"\"\"Crea un archivo de audio básico\"\"\"
-    # Duración basada en longitud del texto (aprox 150 palabras por minuto)
-    words = len(text.split())
-    duration = max(0.5, min(10, words * 0.4))
-    
-    # Generar audio
-    sample_rate = 44100
-    audio_data = generate_sine_wave(duration=duration, sample_rate=sample_rate)
-    
-    # Guardar como WAV
-    with wave.open(output_path, 'wb') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)   # 16-bit
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio_data)
-    
-    return {
-        "status": "success",
-        "output": output_path,
-        "duration": duration,
-        "mode": "fallback"
-    }
+    \"\"\"Crea un archivo de audio placeholder con una ráfaga de tono por palabra\"\"\"
+    result = generate(text, output_path)
+    result["mode"] = "fallback"
+    return result
 
 if __name__ == "__main__":
     import argparse
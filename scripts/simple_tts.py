@@ -13,30 +13,35 @@ sys.stdout = StringIO()
 
 import torch
 import torchaudio as ta
-from chatterbox.tts import ChatterboxTTS
+from tts_snapshot import load_chatterbox
+from tts_seed import resolve_seed, seed_everything
 
 # Restore stdout for our output
 sys.stdout = old_stdout
 
 if len(sys.argv) < 3:
-    print(json.dumps({"error": "Usage: python3 simple_tts.py 'text' output.wav"}))
+    print(json.dumps({"error": "Usage: python3 simple_tts.py 'text' output.wav [seed]"}))
     sys.exit(1)
 
 text = sys.argv[1]
 output_path = sys.argv[2]
+requested_seed = sys.argv[3] if len(sys.argv) > 3 else None
 
 try:
+    seed = resolve_seed(requested_seed)
+    
     # Suppress output during model loading
     old_stdout = sys.stdout
     sys.stdout = StringIO()
     
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = ChatterboxTTS.from_pretrained(device=device)
+    model = load_chatterbox(device)
     
     # Restore stdout
     sys.stdout = old_stdout
     
-    # Generate audio
+    # Generate audio (same seed, same audio)
+    seed_everything(seed)
     wav = model.generate(text)
     
     # Save
@@ -46,7 +51,8 @@ try:
     print(json.dumps({
         "success": True,
         "output": output_path,
-        "sample_rate": model.sr
+        "sample_rate": model.sr,
+        "seed": seed
     }))
     
 except Exception as e:
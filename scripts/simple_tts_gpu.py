@@ -27,19 +27,23 @@ def get_optimal_device():
         return "cpu"
 
 # Import after setting up device detection
-from chatterbox.tts import ChatterboxTTS
+from tts_snapshot import load_chatterbox
+from tts_seed import resolve_seed, seed_everything
 
 # Restore stdout for our output
 sys.stdout = old_stdout
 
 if len(sys.argv) < 3:
-    print(json.dumps({"error": "Usage: python3 simple_tts_gpu.py 'text' output.wav"}))
+    print(json.dumps({"error": "Usage: python3 simple_tts_gpu.py 'text' output.wav [seed]"}))
     sys.exit(1)
 
 text = sys.argv[1]
 output_path = sys.argv[2]
+requested_seed = sys.argv[3] if len(sys.argv) > 3 else None
 
 try:
+    seed = resolve_seed(requested_seed)
+    
     # Suppress output during model loading
     old_stdout = sys.stdout
     sys.stdout = StringIO()
@@ -56,7 +60,7 @@ try:
         print(f"Using CPU (no GPU acceleration available)")
     
     # Load model on the optimal device
-    model = ChatterboxTTS.from_pretrained(device=device)
+    model = load_chatterbox(device)
     
     # For MPS, optimize the model
     if device == "mps":
@@ -75,13 +79,16 @@ try:
         # Note: Some models might not support autocast, so we try with and without
         try:
             # Try with automatic mixed precision for faster inference
+            seed_everything(seed)
             with torch.autocast(device_type="mps", dtype=torch.float16):
                 wav = model.generate(text)
         except:
             # Fallback to standard generation if autocast fails
+            seed_everything(seed)
             wav = model.generate(text)
     else:
         # Standard generation for CPU or CUDA
+        seed_everything(seed)
         wav = model.generate(text)
     
     # Restore stdout
@@ -96,7 +103,8 @@ try:
         "output": output_path,
         "sample_rate": model.sr,
         "device": device,
-        "gpu_accelerated": device in ["cuda", "mps"]
+        "gpu_accelerated": device in ["cuda", "mps"],
+        "seed": seed
     }))
     
 except Exception as e:
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead micro-benchmark for tts_server
+Runs the server in-process on the stub backend and measures what each endpoint
+costs on top of the model call itself (HTTP handling, queueing, file writing,
+SSE framing). Needs torch/torchaudio/flask but no model weights or network.
+
+Run: python3 scripts/testing/benchmark_tts_overhead.py --iterations 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Server modules live in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('TTS_BACKEND', 'stub')
+os.environ.setdefault('TTS_MEMORY_SAMPLE_INTERVAL', '0')
+os.environ.setdefault('TTS_TRACEMALLOC_FRAMES', '0')
+
+import tts_server
+from tts_backends import StubModel
+
+TEXTS = {
+    "short": "Did you know this?",
+    "medium": "Scientists found that people who talk to themselves are often more focused and remember more.",
+    "long": " ".join(["The house had been empty for years, but every night at three the lights came on."] * 4)
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values):
+    """Summary in microseconds"""
+    return {
+        "mean_us": sum(values) / len(values) * 1e6,
+        "p50_us": percentile(values, 50) * 1e6,
+        "p95_us": percentile(values, 95) * 1e6,
+        "p99_us": percentile(values, 99) * 1e6
+    }
+
+
+def time_model(model, text, iterations):
+    """Cost of the bare model call, subtracted from endpoint latency"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model.generate(text)
+        timings.append(time.perf_counter() - start)
+    return percentile(timings, 50)
+
+
+def run(client, endpoint, text, batch_size, iterations, output_dir):
+    """Latencies of repeated calls to one endpoint"""
+    timings = []
+    for i in range(iterations):
+        item = {"text": text, "output_path": os.path.join(output_dir, f"overhead_{i}.wav")}
+        items = [dict(item, output_path=os.path.join(output_dir, f"overhead_{i}_{j}.wav")) for j in range(batch_size)]
+
+        start = time.perf_counter()
+        if endpoint == 'health':
+            response = client.get('/health')
+        elif endpoint == 'generate':
+            response = client.post('/generate', json=item)
+        elif endpoint == 'batch':
+            response = client.post('/batch', json={"items": items})
+        else:
+            response = client.post('/batch-stream', json={"items": items})
+            # Consume the whole stream so every event is produced
+            b''.join(response.response)
+        timings.append(time.perf_counter() - start)
+
+        if response.status_code != 200:
+            raise RuntimeError(f"{endpoint} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+        # Keep the temp dir small so file writes cost the same throughout
+        for path in Path(output_dir).glob('overhead_*.wav'):
+            path.unlink()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure tts_server per-request overhead with the stub backend')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=5)
+    parser.add_argument('--endpoints', default='health,generate,batch,batch-stream')
+    parser.add_argument('--texts', default='short,medium,long', help='Text sizes to test')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    # Instant stub so everything measured is server overhead
+    tts_server.backend_name = 'stub'
+    tts_server.device = 'cpu'
+    tts_server.model = StubModel(rtf=0, latency=0)
+    tts_server.register_engines()
+    client = tts_server.app.test_client()
+
+    report = {"iterations": args.iterations, "batch_size": args.batch_size, "results": {}}
+    with tempfile.TemporaryDirectory(prefix='tts-overhead-') as output_dir:
+        for size in args.texts.split(','):
+            text = TEXTS[size]
+            model_time = time_model(tts_server.model, text, max(10, args.iterations // 10))
+            report["results"][size] = {"chars": len(text), "model_p50_us": model_time * 1e6}
+
+            for endpoint in args.endpoints.split(','):
+                # Warm up the route before measuring
+                run(client, endpoint, text, args.batch_size, 3, output_dir)
+                timings = run(client, endpoint, text, args.batch_size, args.iterations, output_dir)
+
+                calls = 0 if endpoint == 'health' else (1 if endpoint == 'generate' else args.batch_size)
+                overhead = [max(0.0, t - calls * model_time) for t in timings]
+                result = {
+                    "latency": summarize(timings),
+                    "overhead": summarize(overhead),
+                    "overhead_per_item_us": summarize(overhead)["p50_us"] / max(1, calls)
+                }
+                report["results"][size][endpoint] = result
+                print(f"  {size:6} {endpoint:12} p50 {result['latency']['p50_us']:9.0f}µs "
+                      f"overhead p50 {result['overhead']['p50_us']:9.0f}µs", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Load test and latency benchmark for tts_server
+Drives /generate, /batch or /batch-stream with texts sampled from
+data/viral-scripts.json, using closed-loop (N concurrent clients) or open-loop
+(Poisson arrivals) traffic, and writes throughput, latency percentiles,
+real-time factor and error rate as JSON for regression comparisons.
+
+Run: python3 scripts/testing/benchmark_tts_server.py --endpoint generate --concurrency 2 --requests 20
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+DEFAULT_SCRIPTS = 'data/viral-scripts.json'
+
+# Used when the scripts file is missing so the tool still runs anywhere
+FALLBACK_TEXTS = [
+    "Did you know your brain makes decisions seconds before you are aware of them?",
+    "Scientists found that people who talk to themselves are often more focused.",
+    "The house had been empty for years, but every night at three the lights came on.",
+    "Follow for more facts that will change the way you see the world.",
+]
+
+
+def load_texts(path, unit):
+    """Build the text pool (sentences, ~10 s segments or whole scripts) from the scripts file"""
+    if not os.path.exists(path):
+        print(f"⚠️ {path} not found, using built-in sample texts", file=sys.stderr)
+        return list(FALLBACK_TEXTS)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    scripts = []
+    for channel in data.values():
+        if isinstance(channel, list):
+            scripts.extend(channel)
+
+    texts = []
+    for script in scripts:
+        parts = [script.get('hook', ''), script.get('script', ''), script.get('cta', '')]
+        full = ' '.join(p for p in parts if p).strip()
+        if not full:
+            continue
+        if unit == 'script':
+            texts.append(full)
+        elif unit == 'sentence':
+            texts.extend(s for s in re.split(r'(?<=[.!?¿¡])\s+', full) if s.strip())
+        else:
+            # Same split the viral clients use: one segment roughly every 10 seconds
+            words = full.split()
+            count = min(5, max(3, int(script.get('duration', 30)) // 10))
+            size = max(1, len(words) // count)
+            for i in range(count):
+                chunk = words[i * size:] if i == count - 1 else words[i * size:(i + 1) * size]
+                if chunk:
+                    texts.append(' '.join(chunk))
+    return texts or list(FALLBACK_TEXTS)
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values):
+    """Latency summary in seconds"""
+    if not values:
+        return None
+    return {
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values)
+    }
+
+
+def wav_duration(path):
+    """Duration of a local WAV file, or None if it can't be read here"""
+    try:
+        with wave.open(path, 'rb') as f:
+            return f.getnframes() / f.getframerate()
+    except (OSError, wave.Error, EOFError):
+        return None
+
+
+class Benchmark:
+    """Sends requests and collects per-request measurements"""
+
+    def __init__(self, args, texts):
+        self.args = args
+        self.texts = texts
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, args.concurrency))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.samples = []
+        self.samples_lock = threading.Lock()
+        self.counter = 0
+
+    def pick_items(self):
+        """Texts (and output paths) for one request"""
+        count = 1 if self.args.endpoint == 'generate' else self.args.batch_size
+        items = []
+        with self.rng_lock:
+            for _ in range(count):
+                self.counter += 1
+                item = {
+                    "text": self.rng.choice(self.texts),
+                    "output_path": os.path.join(self.args.output_dir, f"bench_{self.counter}.wav")
+                }
+                if self.args.tts_seed is not None:
+                    item["seed"] = self.args.tts_seed
+                items.append(item)
+        return items
+
+    def item_duration(self, result):
+        """Audio seconds produced for one item, from the response or the file"""
+        duration = result.get('duration')
+        if duration is None and result.get('output'):
+            duration = wav_duration(result['output'])
+        if not self.args.keep_audio and result.get('output') and os.path.exists(result['output']):
+            os.remove(result['output'])
+        return duration
+
+    def send(self, items):
+        """Issue one request and return its measurements"""
+        url = self.args.url.rstrip('/')
+        sample = {"items": len(items), "chars": sum(len(i['text']) for i in items), "ok": 0, "errors": [], "audio": 0.0}
+
+        if self.args.endpoint == 'generate':
+            response = self.session.post(f'{url}/generate', json=items[0], timeout=self.args.timeout)
+            data = response.json()
+            if response.status_code == 200 and data.get('success'):
+                results = [data]
+            else:
+                results = [{"error": data.get('error', f'HTTP {response.status_code}')}]
+
+        elif self.args.endpoint == 'batch':
+            response = self.session.post(f'{url}/batch', json={"items": items}, timeout=self.args.timeout)
+            data = response.json()
+            results = data.get('results') or [{"error": data.get('error', f'HTTP {response.status_code}')}]
+
+        else:
+            start = time.perf_counter()
+            response = self.session.post(f'{url}/batch-stream', json={"items": items}, stream=True, timeout=self.args.timeout)
+            results = []
+            for line in response.iter_lines():
+                if not line or not line.startswith(b'data: '):
+                    continue
+                event = json.loads(line[6:])
+                if event['type'] == 'item_complete' and 'first_item' not in sample:
+                    sample['first_item'] = time.perf_counter() - start
+                elif event['type'] == 'complete':
+                    results = event['results']
+                    break
+            if not results:
+                results = [{"error": "stream ended without a complete event"}]
+
+        for result in results:
+            if result.get('error'):
+                sample['errors'].append(result['error'])
+            else:
+                sample['ok'] += 1
+                sample['audio'] += self.item_duration(result) or 0.0
+        return sample
+
+    def run_one(self, scheduled=None):
+        """Send a request, timing from its scheduled arrival in open-loop mode"""
+        items = self.pick_items()
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            sample = self.send(items)
+        except Exception as e:
+            sample = {"items": len(items), "chars": 0, "ok": 0, "errors": [str(e)], "audio": 0.0}
+        sample['latency'] = time.perf_counter() - start
+        sample['finished'] = time.perf_counter()
+        with self.samples_lock:
+            self.samples.append(sample)
+
+    def closed_loop(self, total):
+        """N clients, each sending its next request as soon as the previous one returns"""
+        remaining = [total]
+        lock = threading.Lock()
+
+        def client():
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                self.run_one()
+
+        threads = [threading.Thread(target=client) for _ in range(self.args.concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def open_loop(self, total):
+        """Poisson arrivals at --rate requests/s regardless of how fast the server answers"""
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as executor:
+            next_arrival = time.perf_counter()
+            for _ in range(total):
+                with self.rng_lock:
+                    next_arrival += self.rng.expovariate(self.args.rate)
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self.run_one, next_arrival)
+
+
+def build_report(args, samples, wall_time, server_info):
+    """Aggregate samples into the JSON report"""
+    items = sum(s['items'] for s in samples)
+    ok_items = sum(s['ok'] for s in samples)
+    error_items = sum(len(s['errors']) for s in samples)
+    audio = sum(s['audio'] for s in samples)
+    latencies = [s['latency'] for s in samples if s['ok']]
+    per_request_rtf = [s['latency'] / s['audio'] for s in samples if s['ok'] and s['audio'] > 0]
+    errors = [e for s in samples for e in s['errors']]
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "host": platform.node(),
+        "config": {
+            "url": args.url,
+            "endpoint": args.endpoint,
+            "mode": args.mode,
+            "concurrency": args.concurrency,
+            "rate": args.rate if args.mode == 'open' else None,
+            "requests": len(samples),
+            "batch_size": args.batch_size if args.endpoint != 'generate' else 1,
+            "text_unit": args.text_unit,
+            "seed": args.seed,
+            "tts_seed": args.tts_seed
+        },
+        "server": server_info,
+        "wall_time": wall_time,
+        "throughput": {
+            "requests_per_s": len(samples) / wall_time if wall_time else None,
+            "items_per_s": ok_items / wall_time if wall_time else None,
+            "audio_seconds_per_s": audio / wall_time if wall_time else None
+        },
+        "latency": summarize(latencies),
+        "rtf": {
+            # Processing seconds per second of audio, per request and over the whole run
+            "per_request": summarize(per_request_rtf),
+            "aggregate": (sum(s['latency'] for s in samples if s['ok']) / audio) if audio else None,
+            "wall": (wall_time / audio) if audio else None
+        },
+        "items": items,
+        "audio_seconds": audio,
+        "error_rate": error_items / items if items else 0.0,
+        "errors_sample": errors[:10]
+    }
+    first_items = [s['first_item'] for s in samples if 'first_item' in s]
+    if first_items:
+        report["time_to_first_item"] = summarize(first_items)
+    return report
+
+
+def compare(report, baseline_path):
+    """Print relative change of the key metrics against a previous report"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    metrics = [
+        ('throughput.items_per_s', True),
+        ('latency.p50', False),
+        ('latency.p95', False),
+        ('latency.p99', False),
+        ('rtf.aggregate', False),
+        ('error_rate', False),
+    ]
+    print("\n📊 Comparison with baseline:", file=sys.stderr)
+    for path, higher_is_better in metrics:
+        old, new = baseline, report
+        for key in path.split('.'):
+            old = (old or {}).get(key)
+            new = (new or {}).get(key)
+        if old is None or new is None:
+            continue
+        change = ((new - old) / old * 100) if old else 0.0
+        better = (change >= 0) == higher_is_better or change == 0
+        marker = '✅' if better else '⚠️'
+        print(f"   {marker} {path}: {old:.4g} -> {new:.4g} ({change:+.1f}%)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tts_server throughput and latency')
+    parser.add_argument('--url', default=os.environ.get('TTS_SERVER_URL', 'http://localhost:5555'))
+    parser.add_argument('--endpoint', choices=['generate', 'batch', 'batch-stream'], default='generate')
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed',
+                        help='closed: N clients back-to-back; open: Poisson arrivals at --rate')
+    parser.add_argument('--concurrency', type=int, default=1, help='Clients (closed) or max in-flight requests (open)')
+    parser.add_argument('--rate', type=float, default=0.5, help='Arrivals per second in open-loop mode')
+    parser.add_argument('--requests', type=int, default=20, help='Number of measured requests')
+    parser.add_argument('--warmup', type=int, default=1, help='Unmeasured requests sent first')
+    parser.add_argument('--batch-size', type=int, default=5, help='Items per /batch or /batch-stream request')
+    parser.add_argument('--scripts', default=DEFAULT_SCRIPTS, help='Scripts file used for text lengths')
+    parser.add_argument('--text-unit', choices=['sentence', 'segment', 'script'], default='segment')
+    parser.add_argument('--seed', type=int, default=1234, help='Seed for text sampling and arrivals')
+    parser.add_argument('--tts-seed', type=int, default=None,
+                        help='Synthesis seed sent with every item, so runs produce identical audio (default: server default)')
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--output-dir', default=None, help='Where the server writes audio (default: temp dir)')
+    parser.add_argument('--keep-audio', action='store_true', help='Keep generated audio files')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Previous JSON report to compare against')
+    args = parser.parse_args()
+
+    temp_dir = None
+    if args.output_dir is None:
+        temp_dir = args.output_dir = tempfile.mkdtemp(prefix='tts-bench-')
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    try:
+        server_info = requests.get(f"{args.url.rstrip('/')}/health", timeout=5).json()
+    except Exception as e:
+        print(json.dumps({"error": f"TTS server not reachable at {args.url}: {e}"}))
+        sys.exit(1)
+
+    texts = load_texts(args.scripts, args.text_unit)
+    bench = Benchmark(args, texts)
+    print(f"🏁 {args.endpoint} | {args.mode}-loop | concurrency {args.concurrency} | "
+          f"{args.requests} requests | {len(texts)} texts", file=sys.stderr)
+
+    try:
+        for _ in range(args.warmup):
+            bench.run_one()
+        bench.samples = []
+
+        start = time.perf_counter()
+        if args.mode == 'closed':
+            bench.closed_loop(args.requests)
+        else:
+            bench.open_loop(args.requests)
+        wall_time = time.perf_counter() - start
+    finally:
+        if temp_dir and not args.keep_audio:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    report = build_report(args, bench.samples, wall_time, server_info)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"💾 Report saved to {args.output}", file=sys.stderr)
+    print(output)
+
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
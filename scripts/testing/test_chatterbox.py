@@ -6,7 +6,12 @@ Run: python3 test_chatterbox.py
 
 import torch
 import torchaudio as ta
-from chatterbox.tts import ChatterboxTTS
+import sys
+from pathlib import Path
+
+# Shared loader lives in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts_snapshot import load_chatterbox
 
 print("🎤 Chatterbox TTS Test")
 print("=" * 50)
@@ -18,7 +23,7 @@ print(f"📱 Using device: {device}")
 # Load model (first time downloads ~2GB)
 print("📦 Loading Chatterbox model...")
 print("   (First time may take 1-2 minutes)")
-model = ChatterboxTTS.from_pretrained(device=device)
+model = load_chatterbox(device)
 print("✅ Model loaded")
 
 # Test text
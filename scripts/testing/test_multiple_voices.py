@@ -6,7 +6,12 @@ Run: python3 test_multiple_voices.py
 
 import torch
 import torchaudio as ta
-from chatterbox.tts import ChatterboxTTS
+import sys
+from pathlib import Path
+
+# Shared loader lives in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts_snapshot import load_chatterbox
 
 print("🎭 Multiple Voices and Emotions Test")
 print("=" * 50)
@@ -16,7 +21,7 @@ device = "cuda" if torch.cuda.is_available() else "cpu"
 print(f"📱 Device: {device}\n")
 
 print("📦 Loading Chatterbox model...")
-model = ChatterboxTTS.from_pretrained(device=device)
+model = load_chatterbox(device)
 print("✅ Model loaded\n")
 
 # Different texts with different emotions
@@ -6,7 +6,12 @@ Run: python3 test_youtube_script.py
 
 import torch
 import torchaudio as ta
-from chatterbox.tts import ChatterboxTTS
+import sys
+from pathlib import Path
+
+# Shared loader lives in scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts_snapshot import load_chatterbox
 import os
 
 print("🎬 Audio Generator for YouTube Shorts")
@@ -17,7 +22,7 @@ device = "cuda" if torch.cuda.is_available() else "cpu"
 print(f"📱 Device: {device}\n")
 
 print("📦 Loading Chatterbox TTS...")
-model = ChatterboxTTS.from_pretrained(device=device)
+model = load_chatterbox(device)
 print("✅ Model loaded\n")
 
 # Complete YouTube Short script
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Word timestamps for synthesized audio without a transcription pass
+We already know the words, so instead of running Whisper we find the pauses in
+the audio's energy and fit the expected word boundaries (from a syllable-count
+timing model) onto them. Sentence breaks usually land on the longest pauses and
+anchor the rest; words between anchors are spread by their expected length.
+Each word gets a confidence, so callers can fall back to Whisper when it's low.
+"""
+import os
+
+import numpy as np
+
+from placeholder_tts import word_timings
+
+# Return word timestamps with every tts_server result (requests can opt out)
+WORD_TIMESTAMPS = os.environ.get('TTS_WORD_TIMESTAMPS', 'true').lower() in ('1', 'true', 'yes')
+
+FRAME_SECONDS = 0.01
+
+# Shortest dip in energy treated as a gap between words
+MIN_PAUSE_SECONDS = 0.03
+
+# Confidence of a boundary that had to be interpolated instead of found
+INTERPOLATED_CONFIDENCE = 0.3
+
+# Speech-to-silence range (dB) below which the audio has no usable pauses (noise, music)
+MIN_RANGE_DB = 20.0
+
+# Pause length and depth (dB below the speech threshold) that count as a clear break
+CLEAR_PAUSE_SECONDS = 0.08
+CLEAR_PAUSE_DB = 20.0
+
+SENTENCE_END = ('.', '!', '?')
+
+
+def frame_energy_db(samples, sr):
+    """RMS energy per 10ms frame in dB, lightly smoothed"""
+    frame = max(1, int(sr * FRAME_SECONDS))
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0)
+    frames = samples[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    db = 20 * np.log10(np.maximum(rms, 1e-6))
+    # Edge-padded so the ends aren't averaged with zeros (which read as loud in dB)
+    return np.convolve(np.pad(db, 1, mode='edge'), np.ones(3) / 3, mode='valid')
+
+
+def find_pauses(db):
+    """Speech onset/offset frames and the inner pauses as (start, end, strength) arrays"""
+    floor, peak = np.percentile(db, 10), np.percentile(db, 95)
+    span = max(peak - floor, 1e-6)
+    threshold = floor + 0.3 * span
+    silent = db < threshold
+
+    voiced = np.flatnonzero(~silent)
+    if voiced.size == 0:
+        return None
+    onset, offset = voiced[0], voiced[-1] + 1
+    if peak - floor < MIN_RANGE_DB:
+        return onset, offset, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    # Runs of silent frames strictly inside the speech
+    edges = np.diff(np.concatenate(([0], silent[onset:offset].astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1) + onset
+    ends = np.flatnonzero(edges == -1) + onset
+    keep = (ends - starts) * FRAME_SECONDS >= MIN_PAUSE_SECONDS
+    starts, ends = starts[keep], ends[keep]
+
+    # Strength: how long and how deep the pause is, 0..1
+    below = np.concatenate(([0.0], np.cumsum(threshold - db)))
+    depth = (below[ends] - below[starts]) / np.maximum(ends - starts, 1)
+    length = (ends - starts) * FRAME_SECONDS
+    strength = 0.5 * np.minimum(1.0, length / CLEAR_PAUSE_SECONDS) + 0.5 * np.minimum(1.0, depth / CLEAR_PAUSE_DB)
+    return onset, offset, starts, ends, strength
+
+
+def align_words(samples, sr, text):
+    """Return word timestamps with per-word confidence, and an overall confidence"""
+    samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+    expected, _ = word_timings(text)
+    if not expected or samples.size == 0:
+        return {"words": [], "confidence": 0.0}
+
+    db = frame_energy_db(samples, sr)
+    found = find_pauses(db) if db.size else None
+    if found is None:
+        return {"words": [], "confidence": 0.0}
+    onset, offset, pause_starts, pause_ends, strength = found
+    onset_s, offset_s = onset * FRAME_SECONDS, offset * FRAME_SECONDS
+
+    # Expected boundary positions, mapped from the timing model onto the detected speech span
+    model_start, model_end = expected[0]['start'], expected[-1]['end']
+    scale = (offset_s - onset_s) / max(model_end - model_start, 1e-6)
+    starts = np.array([w['start'] for w in expected])
+    ends = np.array([w['end'] for w in expected])
+    boundaries = onset_s + ((ends[:-1] + starts[1:]) / 2 - model_start) * scale
+    durations = (ends - starts) * scale
+
+    n = boundaries.size
+    snapped = np.full(n, -1)
+    confidence = np.full(n, INTERPOLATED_CONFIDENCE)
+
+    if n and pause_starts.size:
+        centers = (pause_starts + pause_ends) / 2 * FRAME_SECONDS
+
+        # Search window per boundary: half the shorter neighbouring word, wider after a sentence
+        window = np.maximum(0.15, 0.5 * np.minimum(durations[:-1], durations[1:]))
+        window = np.where([w['word'].endswith(SENTENCE_END) for w in expected[:-1]], 2 * window, window)
+
+        distance = np.abs(centers[None, :] - boundaries[:, None])
+        score = strength[None, :] * (1 - distance / window[:, None])
+        score[distance > window[:, None]] = -np.inf
+
+        # Accept the strongest matches first, keeping boundaries in order and pauses unshared
+        best = score.argmax(axis=1)
+        best_score = score[np.arange(n), best]
+        for k in np.argsort(-best_score):
+            if not np.isfinite(best_score[k]):
+                break
+            j = best[k]
+            earlier = snapped[:k][snapped[:k] >= 0]
+            later = snapped[k + 1:][snapped[k + 1:] >= 0]
+            if (earlier.size and earlier.max() >= j) or (later.size and later.min() <= j):
+                continue
+            snapped[k] = j
+            confidence[k] = 0.5 + 0.5 * best_score[k]
+
+    # Boundaries without a pause are placed between the found ones by expected length
+    anchors_model = [onset_s]
+    anchors_real = [onset_s]
+    for k in np.flatnonzero(snapped >= 0):
+        anchors_model.append(boundaries[k])
+        anchors_real.append((pause_starts[snapped[k]] + pause_ends[snapped[k]]) / 2 * FRAME_SECONDS)
+    anchors_model.append(offset_s)
+    anchors_real.append(offset_s)
+    positions = np.interp(boundaries, anchors_model, anchors_real)
+
+    word_starts = np.concatenate(([onset_s], positions))
+    word_ends = np.concatenate((positions, [offset_s]))
+    has_pause = snapped >= 0
+    if has_pause.any():
+        word_ends[:-1][has_pause] = pause_starts[snapped[has_pause]] * FRAME_SECONDS
+        word_starts[1:][has_pause] = pause_ends[snapped[has_pause]] * FRAME_SECONDS
+
+    # A word is as reliable as its less reliable edge (speech onset/offset count as found)
+    edge_confidence = np.concatenate(([1.0], confidence, [1.0]))
+    word_confidence = np.minimum(edge_confidence[:-1], edge_confidence[1:])
+
+    words = [
+        {
+            "word": w['word'],
+            "start": round(float(start), 3),
+            "end": round(float(end), 3),
+            "confidence": round(float(conf), 3)
+        }
+        for w, start, end, conf in zip(expected, word_starts, word_ends, word_confidence)
+    ]
+    return {"words": words, "confidence": round(float(word_confidence.mean()), 3)}
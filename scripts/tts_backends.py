@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Model backends for the TTS server
+"chatterbox" loads the real model; "stub" is a deterministic stand-in that
+returns synthetic audio whose length is proportional to the text, taking a
+configurable amount of time, so the server can be measured without weights.
+"""
+import os
+import random
+import time
+import zlib
+
+# Backend used by tts_server unless --backend is given
+DEFAULT_BACKEND = os.environ.get('TTS_BACKEND', 'chatterbox')
+
+# Stub behaviour: audio length per character and simulated compute time
+STUB_CHARS_PER_SECOND = float(os.environ.get('TTS_STUB_CHARS_PER_SECOND', 15))
+STUB_RTF = float(os.environ.get('TTS_STUB_RTF', 0))
+STUB_LATENCY = float(os.environ.get('TTS_STUB_LATENCY', 0))
+
+# Fraction of calls failing with a (transient) RuntimeError, for exercising retries
+STUB_FAILURE_RATE = float(os.environ.get('TTS_STUB_FAILURE_RATE', 0))
+
+
+class StubModel:
+    """Deterministic model replacement producing a tone per text"""
+
+    sr = 24000
+
+    def __init__(self, chars_per_second=None, rtf=None, latency=None, failure_rate=None):
+        self.chars_per_second = STUB_CHARS_PER_SECOND if chars_per_second is None else chars_per_second
+        self.rtf = STUB_RTF if rtf is None else rtf
+        self.latency = STUB_LATENCY if latency is None else latency
+        self.failure_rate = STUB_FAILURE_RATE if failure_rate is None else failure_rate
+        self.calls = 0
+        self.failures = 0
+        self.busy_time = 0.0
+
+    def duration_for(self, text):
+        """Seconds of audio produced for a text"""
+        return max(0.2, len(text) / self.chars_per_second)
+
+    def generate(self, text, **kwargs):
+        import torch
+
+        start = time.perf_counter()
+        duration = self.duration_for(text)
+
+        # Simulated inference time: fixed latency plus a real-time factor
+        delay = self.latency + self.rtf * duration
+        if delay > 0:
+            time.sleep(delay)
+
+        # Drawn from the seeded generator, so a retry with another seed gets a fresh draw
+        if self.failure_rate and random.random() < self.failure_rate:
+            self.failures += 1
+            raise RuntimeError("Stub generation failed (TTS_STUB_FAILURE_RATE)")
+
+        # Same text always gives the same pitch and the same samples
+        frequency = 120 + zlib.crc32(text.encode('utf-8')) % 180
+        t = torch.arange(int(duration * self.sr), dtype=torch.float32) / self.sr
+        wav = 0.2 * torch.sin(2 * torch.pi * frequency * t)
+
+        self.calls += 1
+        self.busy_time += time.perf_counter() - start
+        return wav.unsqueeze(0)
+
+
+def load_backend(name, device):
+    """Create the model object for a backend name"""
+    if name == 'chatterbox':
+        from tts_snapshot import load_chatterbox
+        return load_chatterbox(device)
+    if name == 'stub':
+        return StubModel()
+    raise ValueError(f"Unknown TTS backend: {name} (expected chatterbox or stub)")
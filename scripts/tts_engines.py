@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+TTS engines and latency-aware engine selection
+tts_server registers every engine it can run: the main model (Chatterbox or the
+stub backend), pyttsx3 as a fast offline voice, a plain sine tone and
+placeholder_tts.py (word bursts with exact timestamps) for tests. Each engine learns how long it takes per character, and
+a request with a latency budget gets the best-quality engine expected to finish
+in time given the work already queued on it.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from tts_profiler import phase
+
+logger = logging.getLogger(__name__)
+
+# Engines tts_server tries to register, in order (the main model is always first)
+ENGINES = [name.strip() for name in os.environ.get('TTS_ENGINES', 'chatterbox,pyttsx3,sine,placeholder').split(',') if name.strip()]
+
+# Quality floor applied when a request doesn't send one (keeps the sine placeholder opt-in)
+DEFAULT_QUALITY_FLOOR = float(os.environ.get('TTS_DEFAULT_QUALITY_FLOOR', 0.1))
+
+# Latency budget in seconds applied when a request doesn't send one (unset = no deadline)
+DEFAULT_LATENCY_BUDGET = os.environ.get('TTS_DEFAULT_LATENCY_BUDGET')
+
+# Recent generations used to fit each engine's cost model
+COST_WINDOW = int(os.environ.get('TTS_ENGINE_COST_WINDOW', 50))
+
+# Starting cost estimates (overhead seconds, seconds per character) before any measurement
+MODEL_PRIORS = {'cuda': (0.5, 0.015), 'mps': (1.0, 0.03), 'cpu': (2.0, 0.07)}
+
+engines = {}
+
+
+class CostModel:
+    """Generation time as overhead + per_char * characters, refitted from recent runs"""
+
+    def __init__(self, overhead, per_char, window=COST_WINDOW):
+        self.overhead = overhead
+        self.per_char = per_char
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def predict(self, chars):
+        return self.overhead + self.per_char * chars
+
+    def observe(self, chars, seconds):
+        with self.lock:
+            self.samples.append((chars, seconds))
+            self._fit()
+
+    def _fit(self):
+        n = len(self.samples)
+        mean_x = sum(x for x, _ in self.samples) / n
+        mean_y = sum(y for _, y in self.samples) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in self.samples)
+
+        if n < 3 or var_x < 1e-9:
+            # Not enough spread in text length for a line: keep the overhead, rescale the slope
+            if mean_x > 0:
+                self.per_char = max(0.0, (mean_y - self.overhead) / mean_x)
+            else:
+                self.overhead = mean_y
+            return
+
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in self.samples) / var_x
+        self.per_char = max(0.0, slope)
+        self.overhead = max(0.0, mean_y - self.per_char * mean_x)
+
+    def to_dict(self):
+        return {"overhead": self.overhead, "per_char": self.per_char, "samples": len(self.samples)}
+
+
+class Engine:
+    """A way of turning text into audio, with its quality and a learned cost"""
+
+    name = None
+    quality = 0.0
+
+    def __init__(self, cost, lock=None):
+        self.cost = cost
+        # One generation at a time per engine; the model engine shares tts_server's lock
+        self.lock = lock or threading.Lock()
+        self.backlog = 0.0
+        self.backlog_lock = threading.Lock()
+        self.error = None
+
+    def available(self):
+        return self.error is None
+
+    def expected_latency(self, text):
+        """Seconds until a new request for this text would finish"""
+        return self.backlog + self.cost.predict(len(text))
+
+    @contextmanager
+    def reserve(self, text):
+        """Count the predicted time of a request as queued work until it finishes"""
+        predicted = self.cost.predict(len(text))
+        with self.backlog_lock:
+            self.backlog += predicted
+        try:
+            yield predicted
+        finally:
+            with self.backlog_lock:
+                self.backlog = max(0.0, self.backlog - predicted)
+
+    def run(self, text, seed):
+        """Generate audio for a text, returning (wav, sample_rate, extra response fields)"""
+        with self.reserve(text):
+            with phase('queue_wait'):
+                self.lock.acquire()
+            try:
+                start = time.perf_counter()
+                with phase('generate'):
+                    wav, sr, info = self.generate(text, seed)
+                self.cost.observe(len(text), time.perf_counter() - start)
+                return wav, sr, info
+            finally:
+                self.lock.release()
+
+    def generate(self, text, seed):
+        raise NotImplementedError
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "quality": self.quality,
+            "available": self.available(),
+            "error": self.error,
+            "busy": self.lock.locked(),
+            "backlog": self.backlog,
+            "cost": self.cost.to_dict()
+        }
+
+
+class ModelEngine(Engine):
+    """The model loaded by tts_server (Chatterbox, or the stub backend)"""
+
+    quality = 1.0
+
+    def __init__(self, name, model, run_model, lock, device):
+        overhead, per_char = MODEL_PRIORS.get(device, MODEL_PRIORS['cpu'])
+        if hasattr(model, 'duration_for'):
+            # Stub backend: its simulated cost is known exactly
+            overhead, per_char = model.latency, model.rtf / model.chars_per_second
+        super().__init__(CostModel(overhead, per_char), lock)
+        self.name = name
+        self.model = model
+        self.run_model = run_model
+
+    def generate(self, text, seed):
+        return self.run_model(text, seed), self.model.sr, {}
+
+
+class Pyttsx3Engine(Engine):
+    """Offline system voice (espeak / SAPI / NSSpeech), fast but robotic"""
+
+    name = 'pyttsx3'
+    quality = 0.5
+
+    def __init__(self):
+        super().__init__(CostModel(0.3, 0.002))
+        try:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+        except Exception as e:
+            self.error = f"pyttsx3 unavailable: {e}"
+
+    def generate(self, text, seed):
+        import torchaudio as ta
+
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+            wav, sr = ta.load(path)
+            return wav, sr, {}
+        finally:
+            os.unlink(path)
+
+
+class SineEngine(Engine):
+    """Plain 440 Hz tone, for tests and pipeline dry runs that don't need word timing (see PlaceholderEngine)"""
+
+    name = 'sine'
+    quality = 0.0
+    sr = 44100
+
+    def __init__(self):
+        super().__init__(CostModel(0.001, 0.0))
+
+    def generate(self, text, seed):
+        import torch
+
+        # 0.4 s per word, between half a second and ten seconds
+        duration = max(0.5, min(10, len(text.split()) * 0.4))
+        t = torch.arange(int(self.sr * duration), dtype=torch.float32) / self.sr
+        return (0.5 * torch.sin(2 * torch.pi * 440 * t)).unsqueeze(0), self.sr, {}
+
+
+class PlaceholderEngine(Engine):
+    """Word-timed tone bursts from placeholder_tts.py, with exact word timestamps"""
+
+    name = 'placeholder'
+    quality = 0.05
+
+    def __init__(self):
+        super().__init__(CostModel(0.0005, 0.00001))
+
+    def generate(self, text, seed):
+        import torch
+        from placeholder_tts import SAMPLE_RATE, synthesize
+
+        samples, words = synthesize(text, SAMPLE_RATE, seed=seed)
+        return torch.from_numpy(samples).unsqueeze(0), SAMPLE_RATE, {"words": words}
+
+
+def setup_engines(model_name, model, run_model, lock, device, names=ENGINES):
+    """Register the main model plus the configured fallback engines"""
+    engines.clear()
+    engines[model_name] = ModelEngine(model_name, model, run_model, lock, device)
+
+    fallbacks = {'pyttsx3': Pyttsx3Engine, 'sine': SineEngine, 'placeholder': PlaceholderEngine}
+    for name in names:
+        if name in engines or name in ('chatterbox', 'stub'):
+            continue
+        if name not in fallbacks:
+            logger.warning(f"Unknown TTS engine {name!r} ignored")
+            continue
+        engine = fallbacks[name]()
+        if not engine.available():
+            logger.warning(engine.error)
+        engines[name] = engine
+
+    logger.info(f"TTS engines: {', '.join(f'{n} (quality {e.quality})' for n, e in engines.items() if e.available())}")
+    return engines
+
+
+def request_options(item, defaults=None):
+    """Engine name, latency budget and quality floor of a request or batch item"""
+    defaults = defaults or {}
+
+    def option(key, convert, default=None, empty=None):
+        value = item.get(key, defaults.get(key, default))
+        if value is None or value == '':
+            return empty
+        try:
+            return convert(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a {convert.__name__}, got {value!r}")
+
+    return (
+        option('engine', str),
+        option('latency_budget', float, DEFAULT_LATENCY_BUDGET),
+        # A null budget means no budget, but a null floor means the default floor
+        option('quality_floor', float, DEFAULT_QUALITY_FLOOR, empty=DEFAULT_QUALITY_FLOOR)
+    )
+
+
+def choose_engine(text, latency_budget=None, quality_floor=0.0, name=None):
+    """Pick an engine: the best quality expected to meet the budget, else the fastest allowed"""
+    if name is not None:
+        engine = engines.get(name)
+        if engine is None or not engine.available():
+            raise ValueError(f"Engine {name!r} is not available (have: {', '.join(engines)})")
+        return engine
+
+    allowed = [e for e in engines.values() if e.available() and e.quality >= quality_floor]
+    if not allowed:
+        raise ValueError(f"No available engine has quality >= {quality_floor}")
+
+    predicted = {e.name: e.expected_latency(text) for e in allowed}
+    if latency_budget is None:
+        return max(allowed, key=lambda e: (e.quality, -predicted[e.name]))
+
+    in_time = [e for e in allowed if predicted[e.name] <= latency_budget]
+    if in_time:
+        return max(in_time, key=lambda e: (e.quality, -predicted[e.name]))
+
+    # Nothing makes the deadline: get as close as possible
+    return min(allowed, key=lambda e: predicted[e.name])
+
+
+def describe():
+    """Engine states for /health and /debug/engines"""
+    return [engine.to_dict() for engine in engines.values()]
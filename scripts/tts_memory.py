@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Memory introspection for the TTS server
+Reports tracemalloc allocators, live torch tensors, allocator stats and open
+file descriptors, and logs them periodically so leaks show up as trends.
+"""
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background samples (0 disables the sampler)
+MEMORY_SAMPLE_INTERVAL = float(os.environ.get('TTS_MEMORY_SAMPLE_INTERVAL', 300))
+
+# Stack depth recorded by tracemalloc; off by default since tracing slows every allocation
+TRACEMALLOC_FRAMES = int(os.environ.get('TTS_TRACEMALLOC_FRAMES', 0))
+
+# Allocations from these files are noise from the introspection itself
+IGNORED_FILES = (tracemalloc.__file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>', '<unknown>')
+
+# Previous snapshot per consumer ('sampler', 'debug'), so each diffs against its own last call
+_last_snapshots = {}
+_snapshot_lock = threading.Lock()
+_sampler = None
+
+
+def start_tracing():
+    """Start tracemalloc if it is enabled and not already running"""
+    if TRACEMALLOC_FRAMES > 0 and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        logger.info(f"tracemalloc started ({TRACEMALLOC_FRAMES} frame(s))")
+
+
+def _format_stat(stat):
+    """Convert a tracemalloc statistic into JSON-friendly data"""
+    frame = stat.traceback[0]
+    entry = {
+        "location": f"{frame.filename}:{frame.lineno}",
+        "size": stat.size,
+        "count": stat.count
+    }
+    if hasattr(stat, 'size_diff'):
+        entry["size_diff"] = stat.size_diff
+        entry["count_diff"] = stat.count_diff
+    return entry
+
+
+def python_allocations(top=10, baseline='debug'):
+    """Top allocators and the growth since the previous snapshot taken for `baseline`"""
+    if not tracemalloc.is_tracing():
+        return {"enabled": False}
+
+    filters = [tracemalloc.Filter(False, name) for name in IGNORED_FILES]
+    snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+    current, peak = tracemalloc.get_traced_memory()
+
+    with _snapshot_lock:
+        previous = _last_snapshots.get(baseline)
+        _last_snapshots[baseline] = snapshot
+
+    result = {
+        "enabled": True,
+        "traced_current": current,
+        "traced_peak": peak,
+        "top": [_format_stat(s) for s in snapshot.statistics('lineno')[:top]]
+    }
+    if previous is not None:
+        diff = snapshot.compare_to(previous, 'lineno')
+        result["diff"] = [_format_stat(s) for s in diff[:top] if s.size_diff]
+    return result
+
+
+def live_tensors():
+    """Count live torch tensors and the bytes behind them, per device"""
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return {"available": False}
+
+    devices = {}
+    seen_storages = set()
+    count = 0
+
+    for obj in gc.get_objects():
+        try:
+            if not torch.is_tensor(obj):
+                continue
+            count += 1
+            key = str(obj.device)
+            stats = devices.setdefault(key, {"count": 0, "bytes": 0})
+            stats["count"] += 1
+
+            # Views share storage, so only count each storage once
+            storage = obj.untyped_storage()
+            pointer = (key, storage.data_ptr())
+            if pointer not in seen_storages:
+                seen_storages.add(pointer)
+                stats["bytes"] += storage.nbytes()
+        except Exception:
+            continue
+
+    return {"available": True, "count": count, "devices": devices}
+
+
+def allocator_stats():
+    """Process RSS plus the CUDA/MPS caching allocator counters"""
+    stats = {"rss": None, "rss_peak": None}
+
+    # Linux exposes current and peak RSS in /proc
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    stats["rss"] = int(line.split()[1]) * 1024
+                elif line.startswith('VmHWM:'):
+                    stats["rss_peak"] = int(line.split()[1]) * 1024
+    except OSError:
+        import resource
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stats["rss_peak"] = maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return stats
+
+    if torch.cuda.is_available():
+        raw = torch.cuda.memory_stats()
+        stats["cuda"] = {
+            "allocated": torch.cuda.memory_allocated(),
+            "reserved": torch.cuda.memory_reserved(),
+            "max_allocated": torch.cuda.max_memory_allocated(),
+            "num_alloc_retries": raw.get('num_alloc_retries', 0),
+            "num_ooms": raw.get('num_ooms', 0),
+            "inactive_split_bytes": raw.get('inactive_split_bytes.all.current', 0)
+        }
+    elif hasattr(torch, 'mps') and hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
+        try:
+            stats["mps"] = {
+                "allocated": torch.mps.current_allocated_memory(),
+                "driver_allocated": torch.mps.driver_allocated_memory()
+            }
+        except Exception:
+            pass
+
+    return stats
+
+
+def process_memory(pid='self'):
+    """Unique (USS), proportional (PSS) and resident (RSS) memory of a process in bytes"""
+    fields = {'Rss': 0, 'Pss': 0, 'Private_Clean': 0, 'Private_Dirty': 0, 'Shared_Clean': 0, 'Shared_Dirty': 0}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in fields:
+                    fields[key] = int(rest.split()[0]) * 1024
+    except OSError:
+        return None
+    return {
+        "uss": fields['Private_Clean'] + fields['Private_Dirty'],
+        "pss": fields['Pss'],
+        "rss": fields['Rss'],
+        "shared": fields['Shared_Clean'] + fields['Shared_Dirty']
+    }
+
+
+def open_files(limit=20):
+    """Open file descriptors and a sample of what they point to"""
+    fd_dir = '/proc/self/fd' if os.path.isdir('/proc/self/fd') else '/dev/fd'
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        return {"count": None}
+
+    targets = []
+    for fd in fds:
+        try:
+            targets.append(os.readlink(os.path.join(fd_dir, fd)))
+        except OSError:
+            continue
+
+    # Leaked temp wav files are the usual suspect
+    wav_files = [t for t in targets if t.endswith('.wav')]
+    return {
+        "count": len(fds),
+        "wav_files": len(wav_files),
+        "sample": sorted(targets)[:limit]
+    }
+
+
+def memory_report(top=10, include_tensors=True, baseline='debug'):
+    """Full memory report used by /debug/memory and the sampler"""
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": python_allocations(top, baseline),
+        "allocator": allocator_stats(),
+        "process": process_memory(),
+        "files": open_files()
+    }
+    if include_tensors:
+        report["tensors"] = live_tensors()
+    return report
+
+
+def _log_sample():
+    """Log a one-line memory summary"""
+    report = memory_report(top=3, baseline='sampler')
+    allocator = report["allocator"]
+    tensors = report["tensors"]
+    parts = [f"rss={(allocator['rss'] or 0) / 1e6:.0f}MB"]
+    if 'cuda' in allocator:
+        parts.append(f"cuda_allocated={allocator['cuda']['allocated'] / 1e6:.0f}MB")
+        parts.append(f"cuda_reserved={allocator['cuda']['reserved'] / 1e6:.0f}MB")
+    if tensors.get("available"):
+        tensor_bytes = sum(d["bytes"] for d in tensors["devices"].values())
+        parts.append(f"tensors={tensors['count']} ({tensor_bytes / 1e6:.0f}MB)")
+    parts.append(f"fds={report['files']['count']}")
+    growth = report["python"].get("diff") or []
+    if growth:
+        parts.append(f"top_growth={growth[0]['location']} {growth[0]['size_diff'] / 1e3:+.0f}KB")
+    logger.info("Memory sample: " + " ".join(parts))
+
+
+def start_sampler(interval=None):
+    """Start the background thread that logs memory samples"""
+    global _sampler
+    interval = MEMORY_SAMPLE_INTERVAL if interval is None else interval
+
+    start_tracing()
+    if interval <= 0 or (_sampler is not None and _sampler.is_alive()):
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                _log_sample()
+            except Exception as e:
+                logger.warning(f"Memory sample failed: {e}")
+
+    _sampler = threading.Thread(target=run, name='memory-sampler', daemon=True)
+    _sampler.start()
+    logger.info(f"Memory sampler logging every {interval:.0f}s")
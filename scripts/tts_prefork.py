@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Pre-fork serving for the TTS server
+The parent loads the model once, moves its weights into shared memory and forks
+worker processes that all accept on the same listening socket. Workers map the
+weights read-only, so each extra worker only costs its activations.
+"""
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+
+from tts_memory import process_memory
+
+logger = logging.getLogger(__name__)
+
+
+def share_model_memory(model):
+    """Move every tensor of the model into shared memory and freeze it for inference"""
+    import torch
+
+    shared = 0
+    modules = [model] if isinstance(model, torch.nn.Module) else [
+        value for value in vars(model).values() if isinstance(value, torch.nn.Module)
+    ]
+    for module in modules:
+        module.eval()
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            tensor.requires_grad_(False)
+            shared += tensor.numel() * tensor.element_size()
+        module.share_memory()
+
+    # Grad mode is per thread, so request threads turn autograd off themselves (inference_mode in _run_model)
+
+    # Keep the collector from touching (and copying) every object inherited from the parent
+    gc.collect()
+    gc.freeze()
+    return shared
+
+
+def format_memory(memory):
+    """Short description of a process_memory() result for the logs"""
+    if memory is None:
+        return "memory stats unavailable"
+    return (f"unique {memory['uss'] / 1e6:.0f}MB, shared {memory['shared'] / 1e6:.0f}MB, "
+            f"pss {memory['pss'] / 1e6:.0f}MB")
+
+
+def serve_prefork(app, workers, port, host='0.0.0.0', on_worker_start=None):
+    """Fork `workers` processes serving `app` from one shared listening socket;
+    on_worker_start(index) runs in each worker before it serves (thread setup, warm-up)"""
+    from werkzeug.serving import make_server
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(128)
+    listener.set_inheritable(True)
+
+    logger.info(f"Parent {os.getpid()} after model load: {format_memory(process_memory())}")
+
+    children = {}
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Worker: default signal handling, then serve until killed
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if on_worker_start:
+                on_worker_start(index)
+            # Measured after on_worker_start, so a warm-up run's activations are already counted
+            logger.info(f"Worker {index} (pid {os.getpid()}) ready: {format_memory(process_memory())}")
+            server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children[pid] = index
+
+    logger.info(f"Started {workers} TTS workers on port {port}: {', '.join(str(p) for p in children)}")
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Wait for the workers, reporting any that die
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = children.pop(pid, None)
+        if index is not None and status != 0:
+            logger.error(f"Worker {index} (pid {pid}) exited with status {status}")
+
+    listener.close()
+    sys.exit(0)
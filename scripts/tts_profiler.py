@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Request profiling for the TTS server
+Captures per-phase timings plus a torch profiler (or cProfile) trace for
+requests that ask for it with profile=true or are picked by the sampling rate.
+Traces are kept under a bounded directory so slow outliers can be inspected later.
+"""
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import random
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Where traces are stored and how many are kept (oldest are evicted first)
+PROFILE_DIR = Path(os.environ.get('TTS_PROFILE_DIR', 'output/tts-profiles'))
+PROFILE_MAX_TRACES = int(os.environ.get('TTS_PROFILE_MAX_TRACES', 50))
+
+# Fraction of requests profiled even without profile=true (0 disables sampling)
+PROFILE_SAMPLE_RATE = float(os.environ.get('TTS_PROFILE_SAMPLE_RATE', 0))
+
+# "torch" uses torch.profiler when available, "cprofile" forces cProfile
+PROFILE_BACKEND = os.environ.get('TTS_PROFILE_BACKEND', 'torch')
+
+# Profile attached to the thread that is currently generating
+_active = threading.local()
+
+# torch.profiler is process-wide, so only one request can hold it at a time
+_torch_profiler_lock = threading.Lock()
+_prune_lock = threading.Lock()
+
+# Model methods timed as phases: (attribute path, phase name)
+MODEL_PHASES = [
+    ('prepare_conditionals', 'conditioning'),
+    ('tokenizer.text_to_tokens', 'tokenize'),
+    ('t3.inference', 'autoregressive'),
+    ('s3gen.inference', 'vocoder'),
+    ('watermarker.apply_watermark', 'watermark'),
+]
+
+
+def should_profile(requested=False):
+    """Decide whether a request gets profiled"""
+    if requested:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def current_profile():
+    """Return the profile of the request running on this thread, if any"""
+    return getattr(_active, 'profile', None)
+
+
+class RequestProfile:
+    """Timings and trace for a single profiled request"""
+
+    def __init__(self, endpoint, sampled=False, **meta):
+        self.id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.endpoint = endpoint
+        self.sampled = sampled
+        self.meta = meta
+        self.timings = {}
+        self.counts = {}
+        self.kind = None
+        self._profiler = None
+        self._started = None
+        self.wall_time = None
+
+    def add_timing(self, name, seconds):
+        """Accumulate time spent in a phase"""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def start(self):
+        """Start collecting the trace for this request"""
+        self._started = time.perf_counter()
+
+        if PROFILE_BACKEND == 'torch' and _torch_profiler_lock.acquire(blocking=False):
+            try:
+                import torch
+                activities = [torch.profiler.ProfilerActivity.CPU]
+                if torch.cuda.is_available():
+                    activities.append(torch.profiler.ProfilerActivity.CUDA)
+                self._profiler = torch.profiler.profile(activities=activities)
+                self._profiler.__enter__()
+                self.kind = 'torch'
+                return
+            except Exception as e:
+                logger.warning(f"torch profiler unavailable, using cProfile: {e}")
+                self._profiler = None
+                _torch_profiler_lock.release()
+
+        # cProfile only sees the current thread, so concurrent requests don't collide
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        self.kind = 'cprofile'
+
+    def stop(self):
+        """Stop collecting and write the trace to disk"""
+        self.wall_time = time.perf_counter() - self._started
+        trace_dir = PROFILE_DIR / self.id
+
+        try:
+            trace_dir.mkdir(parents=True, exist_ok=True)
+
+            if self.kind == 'torch':
+                try:
+                    self._profiler.__exit__(None, None, None)
+                    self._profiler.export_chrome_trace(str(trace_dir / 'trace.json'))
+                    summary = self._profiler.key_averages().table(sort_by='cpu_time_total', row_limit=40)
+                finally:
+                    _torch_profiler_lock.release()
+            else:
+                self._profiler.disable()
+                self._profiler.dump_stats(str(trace_dir / 'profile.prof'))
+                stream = StringIO()
+                pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(40)
+                summary = stream.getvalue()
+
+            (trace_dir / 'summary.txt').write_text(summary)
+            (trace_dir / 'meta.json').write_text(json.dumps(self.to_dict(), indent=2))
+        except Exception as e:
+            logger.error(f"Could not write profile {self.id}: {e}")
+
+        prune_profiles()
+
+    def to_dict(self):
+        """Summary returned in responses and stored next to the trace"""
+        return {
+            "profile_id": self.id,
+            "endpoint": self.endpoint,
+            "sampled": self.sampled,
+            "trace_type": self.kind,
+            "wall_time": self.wall_time,
+            "timings": self.timings,
+            "counts": self.counts,
+            "created_at": datetime.now().isoformat(),
+            **self.meta
+        }
+
+
+@contextmanager
+def profiled(endpoint, requested=False, **meta):
+    """Profile the enclosed block when requested or sampled, yielding the profile or None"""
+    sampled = not requested and should_profile(False)
+    if not (requested or sampled):
+        yield None
+        return
+
+    profile = RequestProfile(endpoint, sampled=sampled, **meta)
+    previous = current_profile()
+    _active.profile = profile
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _active.profile = previous
+        logger.info(f"Profiled {endpoint} in {profile.wall_time:.2f}s -> {profile.id}")
+
+
+@contextmanager
+def phase(name):
+    """Time a phase of the current request (no-op when it is not profiled)"""
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        if profile.kind == 'torch':
+            import torch
+            with torch.profiler.record_function(name):
+                yield
+        else:
+            yield
+    finally:
+        profile.add_timing(name, time.perf_counter() - start)
+
+
+def instrument_model(model):
+    """Wrap the model's internal stages so they show up as phases"""
+    for path, name in MODEL_PHASES:
+        *parents, attr = path.split('.')
+        owner = model
+        for parent in parents:
+            owner = getattr(owner, parent, None)
+            if owner is None:
+                break
+        method = getattr(owner, attr, None) if owner is not None else None
+        if method is None or getattr(method, '_tts_phase', None):
+            continue
+
+        def wrapper(*args, _method=method, _name=name, **kwargs):
+            with phase(_name):
+                return _method(*args, **kwargs)
+
+        functools.update_wrapper(wrapper, method)
+        wrapper._tts_phase = name
+        try:
+            setattr(owner, attr, wrapper)
+        except Exception as e:
+            logger.debug(f"Could not instrument {path}: {e}")
+
+
+def prune_profiles():
+    """Keep at most PROFILE_MAX_TRACES traces, dropping the oldest"""
+    with _prune_lock:
+        if not PROFILE_DIR.exists():
+            return
+        traces = sorted(
+            (p for p in PROFILE_DIR.iterdir() if p.is_dir()),
+            key=lambda p: p.stat().st_mtime
+        )
+        for old in traces[:max(0, len(traces) - PROFILE_MAX_TRACES)]:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def list_profiles():
+    """Return stored profile summaries, newest first"""
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = []
+    for meta_path in PROFILE_DIR.glob('*/meta.json'):
+        try:
+            profiles.append(json.loads(meta_path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return sorted(profiles, key=lambda p: p.get('created_at', ''), reverse=True)
+
+
+def load_profile(profile_id):
+    """Return the stored summary and text report of a profile, or None"""
+    trace_dir = PROFILE_DIR / Path(profile_id).name
+    meta_path = trace_dir / 'meta.json'
+    if not meta_path.exists():
+        return None
+    data = json.loads(meta_path.read_text())
+    summary_path = trace_dir / 'summary.txt'
+    if summary_path.exists():
+        data['summary'] = summary_path.read_text()
+    data['files'] = sorted(p.name for p in trace_dir.iterdir())
+    return data
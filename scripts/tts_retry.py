@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Per-item retries for TTS batches
+A failed item is generated again with exponential backoff and a different seed
+(a bad sample or a transient CUDA error rarely repeats), while the rest of the
+batch keeps going. Errors that another attempt can't fix - bad parameters, an
+unwritable output path - fail at once and are reported as permanent.
+"""
+import os
+import random
+import time
+
+from tts_seed import MAX_SEED
+
+# Tries per item, including the first
+MAX_ATTEMPTS = int(os.environ.get('TTS_RETRY_ATTEMPTS', 3))
+
+# Backoff before retry n: BACKOFF * 2**(n-1) seconds, capped, with +/-20% jitter
+BACKOFF = float(os.environ.get('TTS_RETRY_BACKOFF', 0.5))
+MAX_BACKOFF = float(os.environ.get('TTS_RETRY_MAX_BACKOFF', 5.0))
+
+# Added to the seed on each retry, so a retried item doesn't reproduce the same failure
+SEED_STEP = 7919
+
+
+class PermanentError(Exception):
+    """An item error that retrying won't fix"""
+
+
+# Bad parameters and filesystem problems; anything else (CUDA errors, NaNs, timeouts) is retried
+PERMANENT_ERRORS = (
+    PermanentError, ValueError, TypeError,
+    FileNotFoundError, PermissionError, IsADirectoryError, NotADirectoryError
+)
+
+
+def is_permanent(error):
+    """Whether an error is caused by the request itself rather than the generation"""
+    return isinstance(error, PERMANENT_ERRORS)
+
+
+def check_output_path(output_path):
+    """Fail before generating when the output file can't be written"""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    if not os.path.isdir(directory):
+        raise PermanentError(f"Output directory does not exist: {directory}")
+    if not os.access(directory, os.W_OK):
+        raise PermanentError(f"Output directory is not writable: {directory}")
+    if os.path.isdir(output_path):
+        raise PermanentError(f"Output path is a directory: {output_path}")
+
+
+def max_attempts_of(item, defaults=None):
+    """Attempts for an item: its own max_attempts, the batch's, or TTS_RETRY_ATTEMPTS"""
+    value = item.get('max_attempts', (defaults or {}).get('max_attempts', MAX_ATTEMPTS))
+    try:
+        attempts = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"max_attempts must be an integer, got {value!r}")
+    if attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
+    return attempts
+
+
+def backoff_delay(retry):
+    """Seconds to wait before the given retry (1 = first retry)"""
+    delay = min(MAX_BACKOFF, BACKOFF * 2 ** (retry - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def rotate_seed(seed, attempt):
+    """Seed for an attempt; the first attempt keeps the requested seed"""
+    return (seed + SEED_STEP * (attempt - 1)) % (MAX_SEED + 1)
+
+
+class Attempt:
+    """One try at an item: its number, seed, and whether another may follow"""
+
+    def __init__(self, number, seed, max_attempts):
+        self.number = number
+        self.seed = seed
+        self.max_attempts = max_attempts
+        self.delay = 0.0
+
+    def should_retry(self, error):
+        """Decide after a failure; sets the backoff to wait before the next attempt"""
+        if is_permanent(error) or self.number >= self.max_attempts:
+            return False
+        self.delay = backoff_delay(self.number)
+        return True
+
+
+def attempts(seed, max_attempts=MAX_ATTEMPTS):
+    """Yield an Attempt per try, sleeping the backoff before each retry
+
+    The caller breaks out of the loop on success and re-raises when
+    should_retry() says no, so the loop never runs past the last attempt.
+    """
+    attempt = None
+    for number in range(1, max_attempts + 1):
+        if attempt is not None and attempt.delay > 0:
+            time.sleep(attempt.delay)
+        attempt = Attempt(number, rotate_seed(seed, number), max_attempts)
+        yield attempt
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+TTS Router - Load balancer in front of several tts_server instances
+Health-checks every backend via /health, sends each text to its consistent-hash
+owner (for cache affinity) unless that backend is much busier than the least
+loaded one, and fails over to the next backend on errors.
+
+Backends write output_path on their own filesystem, so paths passed through the
+router should live on storage shared by all TTS nodes.
+
+Usage:
+    python3 scripts/tts_router.py --backends http://node1:5555,http://node2:5555
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from flask import Flask, request, jsonify, Response
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+
+# Seconds between health checks and how long each check may take
+HEALTH_INTERVAL = float(os.environ.get('TTS_ROUTER_HEALTH_INTERVAL', 2))
+HEALTH_TIMEOUT = float(os.environ.get('TTS_ROUTER_HEALTH_TIMEOUT', 1))
+
+# Extra queued items tolerated on the hash owner before routing elsewhere
+AFFINITY_SLACK = int(os.environ.get('TTS_ROUTER_AFFINITY_SLACK', 2))
+
+# Consecutive failures before a backend is taken out of rotation
+MAX_FAILURES = int(os.environ.get('TTS_ROUTER_MAX_FAILURES', 2))
+
+# Virtual nodes per backend on the hash ring
+RING_REPLICAS = 100
+
+# Request timeouts forwarded to backends (seconds)
+GENERATE_TIMEOUT = 120
+BATCH_TIMEOUT = 600
+
+
+class Backend:
+    """A tts_server instance and what the router knows about it"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.healthy = False
+        self.model_loaded = False
+        self.queue_depth = 0
+        self.inflight = 0
+        self.failures = 0
+        self.last_check = None
+        self.last_error = None
+        self.lock = threading.Lock()
+
+    @property
+    def load(self):
+        """Queued items reported by the backend plus requests sent since"""
+        return self.queue_depth + self.inflight
+
+    def check(self):
+        """Refresh health and queue depth from /health"""
+        try:
+            response = requests.get(f'{self.url}/health', timeout=HEALTH_TIMEOUT)
+            data = response.json()
+            with self.lock:
+                self.healthy = response.status_code == 200 and data.get('status') == 'healthy'
+                self.model_loaded = bool(data.get('model_loaded'))
+                self.queue_depth = int(data.get('queue_depth', 0))
+                self.failures = 0 if self.healthy else self.failures
+                self.last_error = None
+        except Exception as e:
+            with self.lock:
+                self.healthy = False
+                self.last_error = str(e)
+        self.last_check = time.time()
+
+    def mark_failure(self, error):
+        """Record a failed request, dropping the backend after repeated errors"""
+        with self.lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.failures >= MAX_FAILURES:
+                self.healthy = False
+        logger.warning(f"Backend {self.url} failed ({self.failures}x): {error}")
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "model_loaded": self.model_loaded,
+            "queue_depth": self.queue_depth,
+            "inflight": self.inflight,
+            "failures": self.failures,
+            "last_error": self.last_error
+        }
+
+
+class HashRing:
+    """Consistent hash ring mapping texts to a preference order of backends"""
+
+    def __init__(self, backends, replicas=RING_REPLICAS):
+        self.ring = []
+        for backend in backends:
+            for replica in range(replicas):
+                self.ring.append((self._hash(f'{backend.url}#{replica}'), backend))
+        self.ring.sort(key=lambda entry: entry[0])
+        self.keys = [entry[0] for entry in self.ring]
+        self.size = len(backends)
+
+    @staticmethod
+    def _hash(value):
+        return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+    def preference(self, text):
+        """Backends ordered clockwise from the text's position on the ring"""
+        start = bisect.bisect(self.keys, self._hash(text))
+        ordered = []
+        for offset in range(len(self.ring)):
+            backend = self.ring[(start + offset) % len(self.ring)][1]
+            if backend not in ordered:
+                ordered.append(backend)
+                if len(ordered) == self.size:
+                    break
+        return ordered
+
+
+backends = []
+ring = None
+
+
+def configure(urls):
+    """Set the backend list and rebuild the hash ring"""
+    global backends, ring
+    backends = [Backend(url) for url in urls]
+    ring = HashRing(backends)
+    for backend in backends:
+        backend.check()
+
+
+def health_loop():
+    """Poll every backend's /health in the background"""
+    while True:
+        for backend in backends:
+            backend.check()
+        time.sleep(HEALTH_INTERVAL)
+
+
+def candidates(text):
+    """Backends to try for a text: affinity owner first when not overloaded, then by load"""
+    preferred = [b for b in ring.preference(text or '') if b.healthy]
+    if not preferred:
+        # Everything looks down; try them all rather than failing outright
+        return ring.preference(text or '')
+
+    least = min(b.load for b in preferred)
+    chosen = next(b for b in preferred if b.load <= least + AFFINITY_SLACK)
+    rest = sorted((b for b in preferred if b is not chosen), key=lambda b: b.load)
+    return [chosen] + rest
+
+
+def forward(path, payload, text, timeout, weight=1):
+    """POST to the first backend that answers, failing over on errors"""
+    last_error = None
+    for backend in candidates(text):
+        with backend.lock:
+            backend.inflight += weight
+        try:
+            response = requests.post(f'{backend.url}{path}', json=payload, timeout=timeout)
+            if response.status_code >= 500:
+                raise RuntimeError(response.json().get('error', f'HTTP {response.status_code}'))
+            return backend, response
+        except Exception as e:
+            last_error = e
+            backend.mark_failure(e)
+        finally:
+            with backend.lock:
+                backend.inflight -= weight
+    raise RuntimeError(f"All TTS backends failed: {last_error}")
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Aggregate health, compatible with the tts_server /health response"""
+    healthy = [b for b in backends if b.healthy]
+    return jsonify({
+        "status": "healthy" if healthy else "unhealthy",
+        "model_loaded": any(b.model_loaded for b in healthy),
+        "device": "router",
+        "queue_depth": sum(b.load for b in healthy),
+        "backends": [b.to_dict() for b in backends]
+    }), 200 if healthy else 503
+
+
+@app.route('/generate', methods=['POST'])
+def generate():
+    """Route a single generation to the best backend"""
+    data = request.json or {}
+    if not data.get('text'):
+        return jsonify({"error": "No text provided"}), 400
+
+    try:
+        backend, response = forward('/generate', data, data['text'], GENERATE_TIMEOUT)
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 502
+
+    result = response.json()
+    result["backend"] = backend.url
+    return jsonify(result), response.status_code
+
+
+# Batch-level settings copied into items, since items are forwarded to backends one by one
+BATCH_DEFAULTS = ('seed', 'max_attempts', 'word_timestamps', 'engine', 'latency_budget', 'quality_floor', 'profile')
+
+
+def batch_settings(data):
+    """The batch-level settings a request sets"""
+    return {key: data[key] for key in BATCH_DEFAULTS if data.get(key) is not None}
+
+
+def with_batch_defaults(data):
+    """Batch items, with batch-level settings copied into items that don't set their own"""
+    items = data.get('items', [])
+    defaults = batch_settings(data)
+    if not defaults:
+        return items
+    return [dict(defaults, **item) for item in items]
+
+
+def split_batch(items):
+    """Group batch items by the backend each one should go to"""
+    groups = {}
+    for index, item in enumerate(items):
+        backend = candidates(item.get('text', ''))[0]
+        groups.setdefault(backend.url, []).append(index)
+    return groups
+
+
+def run_group(indexes, items, settings=None):
+    """Send one backend's share of a batch, failing over as a unit"""
+    # Batch-level settings go along too: a backend reads profile only from the batch, not from items
+    payload = {**(settings or {}), "items": [items[i] for i in indexes]}
+    first_text = items[indexes[0]].get('text', '')
+    backend, response = forward('/batch', payload, first_text, BATCH_TIMEOUT, weight=len(indexes))
+    body = response.json()
+    results = body.get('results', [])
+    if len(results) < len(indexes):
+        # A rejected batch (4xx) has no per-item results: give every missing item the batch's error
+        error = {"error": body.get('error', f'HTTP {response.status_code}'), "permanent": True}
+        results = results + [dict(error) for _ in indexes[len(results):]]
+    return backend, results
+
+
+@app.route('/batch', methods=['POST'])
+def batch_generate():
+    """Split a batch across backends and merge the results in order"""
+    data = request.json or {}
+    items = with_batch_defaults(data)
+    if not items:
+        return jsonify({"error": "No items provided"}), 400
+
+    total_items = len(items)
+    results = [None] * total_items
+    groups = split_batch(items)
+
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        futures = {executor.submit(run_group, indexes, items, batch_settings(data)): indexes for indexes in groups.values()}
+        for future in as_completed(futures):
+            indexes = futures[future]
+            try:
+                backend, group_results = future.result()
+            except Exception as e:
+                backend, group_results = None, [{"error": str(e)} for _ in indexes]
+            for index, result in zip(indexes, group_results):
+                result.update({
+                    "progress": (index + 1) / total_items,
+                    "index": index + 1,
+                    "total": total_items,
+                    "backend": backend.url if backend else None
+                })
+                results[index] = result
+
+    return jsonify({
+        "success": True,
+        "results": results,
+        "device": "router",
+        "total_processed": len(results)
+    })
+
+
+@app.route('/batch-stream', methods=['POST'])
+def batch_generate_stream():
+    """Generate a batch across backends with SSE progress updates"""
+    data = request.json or {}
+    items = with_batch_defaults(data)
+    if not items:
+        return jsonify({"error": "No items provided"}), 400
+
+    def run_item(item):
+        backend, response = forward('/generate', item, item.get('text', ''), GENERATE_TIMEOUT)
+        result = response.json()
+        result["backend"] = backend.url
+        if response.status_code != 200:
+            # The backend already retried; keep its verdict on whether the error is permanent
+            result.setdefault("error", f'HTTP {response.status_code}')
+        return result
+
+    def generate():
+        """Generator function for SSE"""
+        total_items = len(items)
+        results = [None] * total_items
+        completed = 0
+
+        yield f"data: {json.dumps({'type': 'start', 'total': total_items, 'device': 'router'})}\n\n"
+
+        # One request per item keeps every backend busy instead of one at a time
+        workers = max(1, min(total_items, 4 * max(1, len([b for b in backends if b.healthy]))))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for index, item in enumerate(items):
+                if not item.get('text'):
+                    yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': 'No text provided'})}\n\n"
+                    continue
+                futures[executor.submit(run_item, item)] = index
+                yield f"data: {json.dumps({'type': 'progress', 'index': index + 1, 'total': total_items, 'segment': item.get('type', 'segment'), 'text': item['text'][:50] + '...', 'progress': (completed / total_items) * 100})}\n\n"
+
+            for future in as_completed(futures):
+                index = futures[future]
+                completed += 1
+                try:
+                    result = future.result()
+                    result["index"] = index + 1
+                    results[index] = result
+                    if 'error' in result:
+                        yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': result['error'], 'permanent': result.get('permanent', False)})}\n\n"
+                        continue
+                    yield f"data: {json.dumps({'type': 'item_complete', 'index': index + 1, 'total': total_items, 'output': result.get('output'), 'duration': result.get('duration'), 'stretch_ratio': result.get('stretch_ratio'), 'word_confidence': result.get('word_confidence'), 'seed': result.get('seed'), 'attempts': result.get('attempts'), 'backend': result['backend'], 'progress': (completed / total_items) * 100})}\n\n"
+                except Exception as e:
+                    results[index] = {"error": str(e), "permanent": False}
+                    yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': str(e), 'permanent': False})}\n\n"
+
+        final = [r for r in results if r is not None]
+        yield f"data: {json.dumps({'type': 'complete', 'results': final, 'total': len(final)})}\n\n"
+
+    return Response(generate(), mimetype='text/event-stream')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-balancing router for tts_server instances')
+    parser.add_argument('--backends', default=os.environ.get('TTS_BACKENDS', ''),
+                        help='Comma-separated tts_server URLs (or TTS_BACKENDS)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('TTS_ROUTER_PORT', 5560)))
+    args = parser.parse_args()
+
+    urls = [url.strip() for url in args.backends.split(',') if url.strip()]
+    if not urls:
+        parser.error('no backends configured (use --backends or TTS_BACKENDS)')
+
+    configure(urls)
+    threading.Thread(target=health_loop, name='health-check', daemon=True).start()
+
+    logger.info(f"Routing to {len(urls)} backend(s): {', '.join(urls)}")
+    logger.info(f"Starting TTS router on port {args.port}")
+    app.run(host='0.0.0.0', port=args.port, debug=False, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Seeding for reproducible TTS generation
+Chatterbox samples tokens randomly, so the same text gives different audio (and
+different durations) on every run. Seeding every RNG right before each call
+makes the output bit-identical for the same text, seed, device and precision.
+"""
+import os
+import random
+
+# Seed used when a request doesn't carry one; -1 draws a fresh seed per request
+DEFAULT_SEED = int(os.environ.get('TTS_DEFAULT_SEED', 42))
+
+# Also force deterministic kernels (slower on CUDA, needed for bit-identical GPU output)
+DETERMINISTIC = os.environ.get('TTS_DETERMINISTIC', 'false').lower() in ('1', 'true', 'yes')
+
+MAX_SEED = 2 ** 32 - 1
+
+
+def resolve_seed(value=None):
+    """Turn a requested seed (None, -1, number or numeric string) into the seed to use"""
+    if value is None or value == '':
+        value = DEFAULT_SEED
+    try:
+        seed = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"seed must be an integer, got {value!r}")
+    if seed < 0:
+        # Random but still reported, so the result can be reproduced later
+        return random.SystemRandom().randint(0, MAX_SEED)
+    if seed > MAX_SEED:
+        raise ValueError(f"seed must be at most {MAX_SEED}")
+    return seed
+
+
+def seed_everything(seed):
+    """Seed the Python, NumPy and torch (CPU, CUDA, MPS) generators"""
+    import torch
+
+    if DETERMINISTIC:
+        enable_determinism()
+    random.seed(seed)
+    try:
+        import numpy as np
+        np.random.seed(seed)
+    except ImportError:
+        pass
+    # Also seeds every CUDA device and the MPS generator
+    torch.manual_seed(seed)
+    return seed
+
+
+def enable_determinism():
+    """Make torch pick deterministic kernels where it has a choice"""
+    import torch
+
+    # cuBLAS needs a fixed workspace to be reproducible; must be set before the first matmul
+    os.environ.setdefault('CUBLAS_WORKSPACE_CONFIG', ':4096:8')
+    torch.backends.cudnn.deterministic = True
+    torch.backends.cudnn.benchmark = False
+    # warn_only: ops without a deterministic variant log a warning instead of failing
+    torch.use_deterministic_algorithms(True, warn_only=True)
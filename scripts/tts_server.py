@@ -18,6 +18,18 @@ import time
 from queue import Queue
 import threading
 
+import tts_profiler
+from tts_profiler import profiled, phase, instrument_model, list_profiles, load_profile
+from tts_memory import memory_report, start_sampler, start_tracing
+from tts_backends import DEFAULT_BACKEND, load_backend
+from tts_seed import DEFAULT_SEED, resolve_seed, seed_everything
+import tts_engines
+from tts_engines import choose_engine, request_options, setup_engines
+from tts_stretch import fit_duration
+from tts_alignment import WORD_TIMESTAMPS, align_words
+from tts_retry import attempts, check_output_path, is_permanent, max_attempts_of
+from audio_premix import premix
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,6 +44,22 @@ app = Flask(__name__)
 model = None
 device = None
 
+# Which model backend to load ("chatterbox" or "stub", see tts_backends.py)
+backend_name = DEFAULT_BACKEND
+
+# The model runs one generation at a time; requests wait on this lock
+generation_lock = threading.Lock()
+
+# Items accepted but not yet finished, reported as queue depth in /health
+pending_items = 0
+pending_lock = threading.Lock()
+
+# Pre-forked workers count them in shared memory instead, so /health reports the total (see share_queue_depth)
+shared_pending = None
+
+# Text generated by each pre-forked worker before it serves
+WARMUP_TEXT = "Warming up the voice model."
+
 def get_optimal_device():
     """Get the best available device for computation"""
     if torch.cuda.is_available():
@@ -49,7 +77,7 @@ def initialize_model():
     if model is not None:
         return  # Already initialized
     
-    logger.info("Initializing Chatterbox TTS model...")
+    logger.info(f"Initializing TTS model ({backend_name} backend)...")
     
     # Suppress output during model loading
     from io import StringIO
@@ -59,13 +87,11 @@ def initialize_model():
     sys.stderr = StringIO()
     
     try:
-        from chatterbox.tts import ChatterboxTTS
-        
-        device = get_optimal_device()
+        device = get_optimal_device() if backend_name != 'stub' else "cpu"
         logger.info(f"Using device: {device}")
         
-        # Load model on the optimal device
-        model = ChatterboxTTS.from_pretrained(device=device)
+        # Load model on the optimal device (from the local snapshot when available)
+        model = load_backend(backend_name, device)
         
         # For MPS, optimize the model
         if device == "mps":
@@ -80,12 +106,188 @@ def initialize_model():
             if hasattr(model, 'eval'):
                 model.eval()
         
+        # Time tokenization / autoregressive / vocoder stages when profiling
+        instrument_model(model)
+        
         logger.info("Model loaded successfully!")
         
     finally:
         # Restore stdout/stderr
         sys.stdout = old_stdout
         sys.stderr = old_stderr
+    
+    register_engines()
+
+def register_engines():
+    """Register the loaded model and the fallback engines used for latency budgets"""
+    setup_engines(backend_name, model, _run_model, generation_lock, device)
+
+def share_queue_depth():
+    """Count queued items in shared memory; call before forking workers"""
+    global shared_pending
+    import multiprocessing
+    shared_pending = multiprocessing.Value('i', 0)
+
+def track_pending(count):
+    """Adjust the number of queued items reported by /health"""
+    global pending_items
+    if shared_pending is not None:
+        with shared_pending.get_lock():
+            shared_pending.value = max(0, shared_pending.value + count)
+        return
+    with pending_lock:
+        pending_items = max(0, pending_items + count)
+
+def queue_depth():
+    """Queued items across all workers"""
+    return shared_pending.value if shared_pending is not None else pending_items
+
+def queued(items):
+    """Iterate batch items, counting each in the queue depth until it is processed"""
+    track_pending(len(items))
+    released = 0
+    try:
+        for index, item in enumerate(items):
+            yield index, item
+            track_pending(-1)
+            released += 1
+    finally:
+        track_pending(released - len(items))
+
+def pick_engine(text, item, defaults=None):
+    """Choose the engine for a request or batch item from its latency budget and quality floor"""
+    name, latency_budget, quality_floor = request_options(item, defaults)
+    engine = choose_engine(text, latency_budget, quality_floor, name)
+    return engine, latency_budget
+
+def synthesize(text, seed, engine):
+    """Generate audio with the chosen engine, returning (wav, sample_rate, extra fields)"""
+    return engine.run(text, seed)
+
+def _run_model(text, seed):
+    """Call the model once, using autocast on MPS when possible (caller holds generation_lock)"""
+    # Seeded under the lock so concurrent requests can't consume each other's randomness
+    seed_everything(seed)
+    # Grad mode is thread-local, so it is disabled here in the request thread rather than once at startup
+    with torch.inference_mode():
+        if device == "mps":
+            # Try with automatic mixed precision for faster inference
+            try:
+                with torch.autocast(device_type="mps", dtype=torch.float16):
+                    return model.generate(text)
+            except:
+                # Fallback to standard generation if autocast fails
+                seed_everything(seed)
+                return model.generate(text)
+        # Standard generation for CPU or CUDA
+        return model.generate(text)
+
+def save_audio(output_path, wav, sr):
+    """Write generated audio to disk"""
+    with phase('save'):
+        ta.save(output_path, wav, sr)
+
+def audio_duration(wav, sr):
+    """Length of generated audio in seconds"""
+    return wav.shape[-1] / sr
+
+def target_duration_of(item):
+    """Requested output duration in seconds, or None"""
+    value = item.get('target_duration')
+    if value is None:
+        return None
+    try:
+        target = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"target_duration must be a number, got {value!r}")
+    if target <= 0:
+        raise ValueError("target_duration must be positive")
+    return target
+
+def stretch_to_target(wav, sr, target_duration, info):
+    """Time-stretch audio toward a requested duration, returning (wav, response fields)"""
+    if target_duration is None:
+        return wav, info
+    original = audio_duration(wav, sr)
+    with phase('stretch'):
+        wav, ratio = fit_duration(wav, sr, target_duration)
+    if 'words' in info and ratio != 1.0:
+        # Word timestamps move with the audio
+        info = dict(info, words=[
+            dict(w, start=round(w['start'] * ratio, 4), end=round(w['end'] * ratio, 4)) for w in info['words']
+        ])
+    return wav, {**info, "original_duration": original, "target_duration": target_duration, "stretch_ratio": ratio}
+
+def wants_word_timestamps(item, defaults=None):
+    """Word timestamps are on unless the item (or batch) sets word_timestamps: false"""
+    value = item.get('word_timestamps', (defaults or {}).get('word_timestamps', WORD_TIMESTAMPS))
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+def add_word_timestamps(wav, sr, text, info, enabled=True):
+    """Attach word timestamps and a confidence, so callers can skip the Whisper pass"""
+    if not enabled:
+        return {k: v for k, v in info.items() if k != 'words'}
+    if 'words' in info:
+        # The engine knows exactly where it put each word
+        words = [dict(w, confidence=1.0) for w in info['words']]
+        return {**info, "words": words, "word_confidence": 1.0}
+    with phase('align'):
+        aligned = align_words(wav.detach().float().cpu().numpy(), sr, text)
+    return {**info, "words": aligned['words'], "word_confidence": aligned['confidence']}
+
+def render(text, seed, engine, target_duration, output_path, timestamps):
+    """Synthesize, fit, align and save one item, returning (sample_rate, duration, extra fields)"""
+    wav, sr, info = synthesize(text, seed, engine)
+    wav, extra = stretch_to_target(wav, sr, target_duration, info)
+    extra = add_word_timestamps(wav, sr, text, extra, timestamps)
+    save_audio(output_path, wav, sr)
+    return sr, audio_duration(wav, sr), extra
+
+def before_retry(attempt, error, text):
+    """Log a failed attempt and free what a retry may need"""
+    logger.warning(f"Attempt {attempt.number}/{attempt.max_attempts} failed for '{text[:30]}...': {error}; "
+                   f"retrying in {attempt.delay:.1f}s with a new seed")
+    if device == "cuda":
+        torch.cuda.empty_cache()
+
+def render_with_retries(text, seed, engine, target_duration, output_path, timestamps, max_attempts):
+    """render() with per-item retries, returning (sample_rate, duration, extra, attempt)"""
+    check_output_path(output_path)
+    for attempt in attempts(seed, max_attempts):
+        try:
+            return (*render(text, attempt.seed, engine, target_duration, output_path, timestamps), attempt)
+        except Exception as e:
+            if not attempt.should_retry(e):
+                raise
+            before_retry(attempt, e, text)
+
+def error_result(error, **fields):
+    """Result entry for a failed item, marking whether retrying could help"""
+    return {"error": str(error), "permanent": is_permanent(error), **fields}
+
+def engine_info(engine, latency_budget, elapsed):
+    """Engine used and, when a budget was given, whether the item finished within it"""
+    info = {"engine": engine.name}
+    if latency_budget is not None:
+        info["latency_budget"] = latency_budget
+        info["slo_met"] = elapsed <= latency_budget
+    return info
+
+def is_profile_requested(data):
+    """Read the opt-in profile flag from a request body or query string"""
+    value = data.get('profile', request.args.get('profile', False))
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+def add_profile_info(payload, profile):
+    """Attach the profile id and phase timings to a response payload"""
+    if profile is not None:
+        payload["profile_id"] = profile.id
+        payload["timings"] = profile.timings
+    return payload
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -93,7 +295,13 @@ def health():
     return jsonify({
         "status": "healthy",
         "model_loaded": model is not None,
-        "device": device
+        "device": device,
+        "backend": backend_name,
+        "default_seed": DEFAULT_SEED,
+        "queue_depth": queue_depth(),
+        # With pre-forked workers, whether the worker that answered is generating
+        "busy": generation_lock.locked(),
+        "engines": tts_engines.describe()
     })
 
 @app.route('/generate', methods=['POST'])
@@ -105,6 +313,7 @@ def generate():
     if model is None:
         initialize_model()
     
+    received = time.perf_counter()
     data = request.json
     text = data.get('text', '')
     output_path = data.get('output_path')
@@ -112,39 +321,44 @@ def generate():
     if not text:
         return jsonify({"error": "No text provided"}), 400
     
+    try:
+        seed = resolve_seed(data.get('seed'))
+        engine, latency_budget = pick_engine(text, data)
+        target_duration = target_duration_of(data)
+        max_attempts = max_attempts_of(data)
+    except ValueError as e:
+        return jsonify(error_result(e)), 400
+    
     if not output_path:
         # Generate temporary file if no path provided
         temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
         output_path = temp_file.name
     
+    track_pending(1)
     try:
-        # Generate audio
-        if device == "mps":
-            # Try with automatic mixed precision for faster inference
-            try:
-                with torch.autocast(device_type="mps", dtype=torch.float16):
-                    wav = model.generate(text)
-            except:
-                # Fallback to standard generation if autocast fails
-                wav = model.generate(text)
-        else:
-            # Standard generation for CPU or CUDA
-            wav = model.generate(text)
-        
-        # Save the audio file
-        ta.save(output_path, wav, model.sr)
+        with profiled('/generate', is_profile_requested(data), text_length=len(text)) as profile:
+            sr, duration, extra, attempt = render_with_retries(
+                text, seed, engine, target_duration, output_path, wants_word_timestamps(data), max_attempts
+            )
         
-        return jsonify({
+        return jsonify(add_profile_info({
             "success": True,
             "output": output_path,
-            "sample_rate": model.sr,
+            "sample_rate": sr,
+            "duration": duration,
+            **extra,
+            "seed": attempt.seed,
+            "attempts": attempt.number,
+            **engine_info(engine, latency_budget, time.perf_counter() - received),
             "device": device,
             "gpu_accelerated": device in ["cuda", "mps"]
-        })
+        }, profile))
         
     except Exception as e:
         logger.error(f"Error generating audio: {e}")
-        return jsonify({"error": str(e)}), 500
+        return jsonify(error_result(e)), 400 if is_permanent(e) else 500
+    finally:
+        track_pending(-1)
 
 @app.route('/batch', methods=['POST'])
 def batch_generate():
@@ -161,58 +375,67 @@ def batch_generate():
     if not items:
         return jsonify({"error": "No items provided"}), 400
     
+    # Items without their own seed use the batch seed (or the server default)
+    try:
+        batch_seed = resolve_seed(data.get('seed'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
     results = []
     total_items = len(items)
     
-    for index, item in enumerate(items):
-        text = item.get('text', '')
-        output_path = item.get('output_path')
-        
-        if not text:
-            results.append({"error": "No text provided", "progress": (index + 1) / total_items})
-            continue
-        
-        if not output_path:
-            # Generate temporary file if no path provided
-            temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            output_path = temp_file.name
-        
-        try:
-            logger.info(f"Generating audio {index + 1}/{total_items}: {text[:30]}...")
-            
-            # Generate audio
-            if device == "mps":
-                try:
-                    with torch.autocast(device_type="mps", dtype=torch.float16):
-                        wav = model.generate(text)
-                except:
-                    wav = model.generate(text)
-            else:
-                wav = model.generate(text)
+    with profiled('/batch', is_profile_requested(data), items=total_items) as profile:
+        for index, item in queued(items):
+            text = item.get('text', '')
+            output_path = item.get('output_path')
             
-            # Save the audio file
-            ta.save(output_path, wav, model.sr)
+            if not text:
+                results.append({"error": "No text provided", "permanent": True, "progress": (index + 1) / total_items})
+                continue
             
-            results.append({
-                "success": True,
-                "output": output_path,
-                "sample_rate": model.sr,
-                "progress": (index + 1) / total_items,
-                "index": index + 1,
-                "total": total_items
-            })
+            if not output_path:
+                # Generate temporary file if no path provided
+                temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+                output_path = temp_file.name
             
-        except Exception as e:
-            logger.error(f"Error generating audio for '{text[:50]}...': {e}")
-            results.append({"error": str(e), "progress": (index + 1) / total_items})
+            try:
+                started = time.perf_counter()
+                seed = resolve_seed(item.get('seed', batch_seed))
+                engine, latency_budget = pick_engine(text, item, data)
+                target_duration = target_duration_of(item)
+                max_attempts = max_attempts_of(item, data)
+                logger.info(f"Generating audio {index + 1}/{total_items} with {engine.name}: {text[:30]}...")
+                
+                sr, duration, extra, attempt = render_with_retries(
+                    text, seed, engine, target_duration, output_path, wants_word_timestamps(item, data), max_attempts
+                )
+                
+                results.append({
+                    "success": True,
+                    "output": output_path,
+                    "sample_rate": sr,
+                    "duration": duration,
+                    **extra,
+                    "seed": attempt.seed,
+                    "attempts": attempt.number,
+                    **engine_info(engine, latency_budget, time.perf_counter() - started),
+                    "progress": (index + 1) / total_items,
+                    "index": index + 1,
+                    "total": total_items
+                })
+                
+            except Exception as e:
+                logger.error(f"Error generating audio for '{text[:50]}...': {e}")
+                results.append(error_result(e, progress=(index + 1) / total_items))
     
-    return jsonify({
+    return jsonify(add_profile_info({
         "success": True,
         "results": results,
         "device": device,
         "gpu_accelerated": device in ["cuda", "mps"],
+        "seed": batch_seed,
         "total_processed": len(results)
-    })
+    }, profile))
 
 @app.route('/batch-stream', methods=['POST'])
 def batch_generate_stream():
@@ -229,65 +452,170 @@ def batch_generate_stream():
     if not items:
         return jsonify({"error": "No items provided"}), 400
     
+    # Read the flag while the request context is still available
+    profile_requested = is_profile_requested(data)
+    
+    try:
+        batch_seed = resolve_seed(data.get('seed'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
     def generate():
         """Generator function for SSE"""
         results = []
         total_items = len(items)
         
         # Send initial message
-        yield f"data: {json.dumps({'type': 'start', 'total': total_items, 'device': device})}\n\n"
+        yield f"data: {json.dumps({'type': 'start', 'total': total_items, 'device': device, 'seed': batch_seed})}\n\n"
         
-        for index, item in enumerate(items):
-            text = item.get('text', '')
-            output_path = item.get('output_path')
-            segment_type = item.get('type', 'segment')
-            
-            if not text:
-                yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': 'No text provided'})}\n\n"
-                continue
-            
-            if not output_path:
-                temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                output_path = temp_file.name
-            
-            try:
-                # Send progress update
-                yield f"data: {json.dumps({'type': 'progress', 'index': index + 1, 'total': total_items, 'segment': segment_type, 'text': text[:50] + '...', 'progress': (index / total_items) * 100})}\n\n"
+        with profiled('/batch-stream', profile_requested, items=total_items) as profile:
+            for index, item in queued(items):
+                text = item.get('text', '')
+                output_path = item.get('output_path')
+                segment_type = item.get('type', 'segment')
                 
-                # Generate audio
-                if device == "mps":
-                    try:
-                        with torch.autocast(device_type="mps", dtype=torch.float16):
-                            wav = model.generate(text)
-                    except:
-                        wav = model.generate(text)
-                else:
-                    wav = model.generate(text)
-                
-                # Save the audio file
-                ta.save(output_path, wav, model.sr)
-                
-                result = {
-                    "success": True,
-                    "output": output_path,
-                    "sample_rate": model.sr,
-                    "index": index + 1
-                }
-                results.append(result)
+                if not text:
+                    yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': 'No text provided', 'permanent': True})}\n\n"
+                    continue
                 
-                # Send completion for this item
-                yield f"data: {json.dumps({'type': 'item_complete', 'index': index + 1, 'total': total_items, 'output': output_path, 'progress': ((index + 1) / total_items) * 100})}\n\n"
+                if not output_path:
+                    temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+                    output_path = temp_file.name
                 
-            except Exception as e:
-                logger.error(f"Error generating audio: {e}")
-                yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': str(e)})}\n\n"
-                results.append({"error": str(e)})
+                try:
+                    started = time.perf_counter()
+                    seed = resolve_seed(item.get('seed', batch_seed))
+                    engine, latency_budget = pick_engine(text, item, data)
+                    target_duration = target_duration_of(item)
+                    max_attempts = max_attempts_of(item, data)
+                    timestamps = wants_word_timestamps(item, data)
+                    check_output_path(output_path)
+                    
+                    # Send progress update
+                    yield f"data: {json.dumps({'type': 'progress', 'index': index + 1, 'total': total_items, 'segment': segment_type, 'text': text[:50] + '...', 'engine': engine.name, 'progress': (index / total_items) * 100})}\n\n"
+                    
+                    # Inline retry loop so each retry can be reported as it happens
+                    for attempt in attempts(seed, max_attempts):
+                        try:
+                            sr, duration, extra = render(text, attempt.seed, engine, target_duration, output_path, timestamps)
+                            break
+                        except Exception as e:
+                            if not attempt.should_retry(e):
+                                raise
+                            before_retry(attempt, e, text)
+                            yield f"data: {json.dumps({'type': 'retry', 'index': index + 1, 'total': total_items, 'attempt': attempt.number, 'max_attempts': max_attempts, 'delay': attempt.delay, 'message': str(e)})}\n\n"
+                    
+                    result = {
+                        "success": True,
+                        "output": output_path,
+                        "sample_rate": sr,
+                        "duration": duration,
+                        **extra,
+                        "seed": attempt.seed,
+                        "attempts": attempt.number,
+                        **engine_info(engine, latency_budget, time.perf_counter() - started),
+                        "index": index + 1
+                    }
+                    results.append(result)
+                    
+                    # Send completion for this item
+                    yield f"data: {json.dumps({'type': 'item_complete', 'index': index + 1, 'total': total_items, 'output': output_path, 'duration': duration, 'stretch_ratio': extra.get('stretch_ratio'), 'word_confidence': extra.get('word_confidence'), 'seed': attempt.seed, 'attempts': attempt.number, 'engine': engine.name, 'progress': ((index + 1) / total_items) * 100})}\n\n"
+                    
+                except Exception as e:
+                    logger.error(f"Error generating audio: {e}")
+                    failed = error_result(e, index=index + 1)
+                    yield f"data: {json.dumps({'type': 'error', 'index': index, 'message': str(e), 'permanent': failed['permanent']})}\n\n"
+                    results.append(failed)
         
         # Send final message with all results
-        yield f"data: {json.dumps({'type': 'complete', 'results': results, 'total': len(results)})}\n\n"
+        complete = add_profile_info({'type': 'complete', 'results': results, 'total': len(results), 'seed': batch_seed}, profile)
+        yield f"data: {json.dumps(complete)}\n\n"
     
     return Response(generate(), mimetype='text/event-stream')
 
+@app.route('/premix', methods=['POST'])
+def premix_audio():
+    """Mix narration with ducked background music into a single track"""
+    data = request.json or {}
+    narration = data.get('narration')
+    music = data.get('music')
+    
+    if not narration or not music:
+        return jsonify({"error": "narration and music paths are required"}), 400
+    for path in (narration, music):
+        if not os.path.exists(path):
+            return jsonify({"error": f"File not found: {path}"}), 400
+    
+    output_path = data.get('output_path')
+    if not output_path:
+        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        output_path = temp_file.name
+    
+    try:
+        options = {key: float(data[key]) for key in ('music_volume', 'duck_db') if data.get(key) is not None}
+    except (TypeError, ValueError):
+        return jsonify({"error": "music_volume and duck_db must be numbers"}), 400
+    
+    try:
+        with profiled('/premix', is_profile_requested(data)) as profile:
+            with phase('premix'):
+                result = premix(narration, music, output_path, **options)
+        return jsonify(add_profile_info({"success": True, **result}, profile))
+    except Exception as e:
+        logger.error(f"Error premixing audio: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/debug/engines', methods=['GET'])
+def debug_engines():
+    """Show each engine's quality, queued work and fitted cost, plus the choice for a sample text"""
+    text = request.args.get('text', 'x' * request.args.get('chars', 200, type=int))
+    try:
+        name, latency_budget, quality_floor = request_options(request.args)
+        choice = choose_engine(text, latency_budget, quality_floor, name).name
+    except ValueError as e:
+        choice = None
+        logger.warning(f"Engine choice failed: {e}")
+    return jsonify({
+        "engines": tts_engines.describe(),
+        "predicted": {e.name: e.expected_latency(text) for e in tts_engines.engines.values() if e.available()},
+        "choice": choice
+    })
+
+@app.route('/debug/profiles', methods=['GET'])
+def profiles():
+    """List stored request profiles, newest first"""
+    return jsonify({"profiles": list_profiles()})
+
+@app.route('/debug/profiles/sampling', methods=['GET', 'POST'])
+def profile_sampling():
+    """Read or change the fraction of requests profiled automatically"""
+    if request.method == 'POST':
+        rate = (request.json or {}).get('rate')
+        try:
+            rate = float(rate)
+        except (TypeError, ValueError):
+            return jsonify({"error": "rate must be a number between 0 and 1"}), 400
+        if not 0 <= rate <= 1:
+            return jsonify({"error": "rate must be a number between 0 and 1"}), 400
+        tts_profiler.PROFILE_SAMPLE_RATE = rate
+        logger.info(f"Profile sampling rate set to {rate}")
+    return jsonify({"rate": tts_profiler.PROFILE_SAMPLE_RATE})
+
+@app.route('/debug/profiles/<profile_id>', methods=['GET'])
+def profile_detail(profile_id):
+    """Return the phase timings and trace summary of a stored profile"""
+    profile = load_profile(profile_id)
+    if profile is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return jsonify(profile)
+
+@app.route('/debug/memory', methods=['GET'])
+def debug_memory():
+    """Report Python allocations, live tensors, allocator stats and open files"""
+    top = request.args.get('top', 10, type=int)
+    include_tensors = request.args.get('tensors', 'true').lower() != 'false'
+    return jsonify(memory_report(top=top, include_tensors=include_tensors))
+
 def cleanup():
     """Cleanup function to free resources"""
     global model
@@ -304,10 +632,58 @@ signal.signal(signal.SIGTERM, lambda s, f: cleanup())
 signal.signal(signal.SIGINT, lambda s, f: cleanup())
 
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Persistent Chatterbox TTS server')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('TTS_PORT', 5555)))
+    parser.add_argument('--backend', choices=['chatterbox', 'stub'], default=DEFAULT_BACKEND,
+                        help='Model backend; "stub" returns synthetic audio without weights')
+    parser.add_argument('--workers', type=int, default=os.environ.get('TTS_WORKERS'),
+                        help='Pre-forked worker processes sharing one copy of the weights '
+                             '(default: the tune profile\'s recommendation, else 1)')
+    args = parser.parse_args()
+    backend_name = args.backend
+    
+    workers = args.workers
+    if workers is None:
+        from tts_tune import load_tune_profile
+        tune_profile = load_tune_profile() if backend_name != 'stub' else None
+        workers = tune_profile['recommended_workers'] if tune_profile else 1
+    
+    # Trace allocations from startup when TTS_TRACEMALLOC_FRAMES is set
+    start_tracing()
+    
     # Initialize model on startup
     initialize_model()
     
-    # Run server
-    port = int(os.environ.get('TTS_PORT', 5555))
-    logger.info(f"Starting TTS server on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    if workers > 1 and device != "cpu":
+        # CUDA/MPS contexts can't be shared across fork()
+        logger.warning(f"Pre-fork workers need the CPU device (got {device}); running a single worker")
+        workers = 1
+    
+    if workers > 1:
+        from tts_prefork import serve_prefork, share_model_memory
+        from tts_tune import apply_tune_profile, cpu_cores
+        
+        shared_bytes = share_model_memory(model)
+        logger.info(f"Model weights in shared memory: {shared_bytes / 1e6:.0f}MB")
+        share_queue_depth()
+        
+        def start_worker(index):
+            # Split the cores between workers per the tune profile
+            threads = apply_tune_profile(workers, index)
+            if threads:
+                logger.info(f"Worker {index}: {threads['intra_op']} threads, cores {cpu_cores()}")
+            # Threads don't survive fork, so each worker starts its own sampler
+            start_sampler()
+            # One generation first, so the memory logged next includes the worker's activations
+            with generation_lock:
+                _run_model(WARMUP_TEXT, DEFAULT_SEED)
+        
+        serve_prefork(app, workers, args.port, on_worker_start=start_worker)
+    else:
+        # Log memory trends in the background
+        start_sampler()
+        
+        # Run server
+        logger.info(f"Starting TTS server on port {args.port}")
+        app.run(host='0.0.0.0', port=args.port, debug=False)
\ No newline at end of file
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Fast Chatterbox loading from a local weight snapshot
+`python3 scripts/tts_snapshot.py snapshot` loads the pretrained model once and
+writes it as a memory-mappable local snapshot. load_chatterbox() prefers the
+snapshot when it matches the installed chatterbox/torch versions and the
+revision of the downloaded weights, so cold start is mostly page-in time, and
+falls back to from_pretrained otherwise.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = Path(os.environ.get(
+    'TTS_SNAPSHOT_DIR',
+    Path(__file__).resolve().parent.parent / 'models' / 'chatterbox-snapshot'
+))
+SNAPSHOT_FORMAT = 1
+
+# Hugging Face repo from_pretrained downloads the weights from
+WEIGHTS_REPO = 'ResembleAI/chatterbox'
+
+# Model components stored in the snapshot, with strict state_dict loading or not
+COMPONENTS = [('ve', True), ('t3', True), ('s3gen', False)]
+
+
+def report(message):
+    """Print loader progress on the real stderr (entry points capture stdout/stderr)"""
+    print(message, file=sys.__stderr__, flush=True)
+
+
+def weights_revision(repo_id=WEIGHTS_REPO):
+    """Commit of the pretrained weights in the Hugging Face cache (what from_pretrained loads), or 'unknown'"""
+    try:
+        from huggingface_hub.constants import HF_HUB_CACHE
+    except ImportError:
+        return 'unknown'
+    ref = Path(HF_HUB_CACHE) / f"models--{repo_id.replace('/', '--')}" / 'refs' / 'main'
+    try:
+        return ref.read_text().strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def source_version():
+    """Versions the snapshot must match to be used"""
+    import torch
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            chatterbox_version = version('chatterbox-tts')
+        except PackageNotFoundError:
+            chatterbox_version = 'unknown'
+    except ImportError:
+        chatterbox_version = 'unknown'
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "chatterbox": chatterbox_version,
+        "torch": torch.__version__.split('+')[0],
+        "weights": weights_revision()
+    }
+
+
+def snapshot_status(snapshot_dir=SNAPSHOT_DIR):
+    """Return None if the snapshot is usable, otherwise the reason it isn't"""
+    manifest_path = Path(snapshot_dir) / 'manifest.json'
+    if not manifest_path.exists():
+        return "no snapshot"
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except ValueError:
+        return "unreadable manifest"
+
+    expected = source_version()
+    if expected['weights'] == 'unknown':
+        # Pretrained cache cleared: nothing newer to compare against, and the snapshot saves a download
+        del expected['weights']
+    for key, value in expected.items():
+        if manifest.get('version', {}).get(key) != value:
+            return f"{key} version changed ({manifest.get('version', {}).get(key)} -> {value})"
+    if not (Path(snapshot_dir) / 'weights.pt').exists():
+        return "weights missing"
+    return None
+
+
+def create_snapshot(device='cpu', snapshot_dir=SNAPSHOT_DIR):
+    """Load the pretrained model and write it as a local snapshot"""
+    import torch
+    from chatterbox.tts import ChatterboxTTS
+
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    report(f"Loading pretrained Chatterbox on {device}...")
+    model = ChatterboxTTS.from_pretrained(device=device)
+    load_time = time.perf_counter() - start
+
+    # One zip-format file so torch.load(mmap=True) can map every tensor in place
+    weights = {}
+    total_bytes = 0
+    for name, _ in COMPONENTS:
+        state = {k: v.detach().cpu().contiguous() for k, v in getattr(model, name).state_dict().items()}
+        total_bytes += sum(t.numel() * t.element_size() for t in state.values())
+        weights[name] = state
+
+    tmp_path = snapshot_dir / 'weights.pt.tmp'
+    torch.save(weights, tmp_path)
+    os.replace(tmp_path, snapshot_dir / 'weights.pt')
+
+    model.tokenizer.tokenizer.save(str(snapshot_dir / 'tokenizer.json'))
+    if getattr(model, 'conds', None) is not None:
+        model.conds.save(snapshot_dir / 'conds.pt')
+
+    manifest = {
+        "version": source_version(),
+        "created_at": datetime.now().isoformat(),
+        "sample_rate": model.sr,
+        "bytes": total_bytes,
+        "tensors": {name: len(state) for name, state in weights.items()}
+    }
+    (snapshot_dir / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+
+    report(f"Snapshot written to {snapshot_dir} ({total_bytes / 1e9:.2f}GB, pretrained load took {load_time:.1f}s)")
+    return manifest
+
+
+def _has_meta_tensors(module):
+    return any(t.is_meta for t in list(module.parameters()) + list(module.buffers()))
+
+
+def _load_snapshot(device, snapshot_dir, timings):
+    """Build the model from a snapshot, mapping weights instead of reading them"""
+    import torch
+    from chatterbox import tts as chatterbox_tts
+
+    start = time.perf_counter()
+    weights = torch.load(Path(snapshot_dir) / 'weights.pt', map_location='cpu', mmap=True, weights_only=True)
+    timings['map_weights'] = time.perf_counter() - start
+
+    classes = {'ve': chatterbox_tts.VoiceEncoder, 't3': chatterbox_tts.T3, 's3gen': chatterbox_tts.S3Gen}
+    components = {}
+    for name, strict in COMPONENTS:
+        start = time.perf_counter()
+
+        # Build on the meta device so no time is spent on random init, then adopt the mapped tensors
+        with torch.device('meta'):
+            module = classes[name]()
+        module.load_state_dict(weights[name], strict=strict, assign=True)
+
+        if _has_meta_tensors(module):
+            # Some buffers are computed in __init__ rather than stored; build this one normally
+            module = classes[name]()
+            module.load_state_dict(weights[name], strict=strict)
+
+        components[name] = module.to(device).eval()
+        timings[f'build_{name}'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tokenizer = chatterbox_tts.EnTokenizer(str(Path(snapshot_dir) / 'tokenizer.json'))
+    conds = None
+    conds_path = Path(snapshot_dir) / 'conds.pt'
+    if conds_path.exists():
+        map_location = torch.device('cpu') if device in ('cpu', 'mps') else None
+        conds = chatterbox_tts.Conditionals.load(conds_path, map_location=map_location).to(device)
+    timings['tokenizer_conds'] = time.perf_counter() - start
+
+    return chatterbox_tts.ChatterboxTTS(
+        components['t3'], components['s3gen'], components['ve'], tokenizer, device, conds=conds
+    )
+
+
+def load_chatterbox(device, snapshot_dir=SNAPSHOT_DIR, verbose=True, tune=True):
+    """Load Chatterbox, preferring a matching local snapshot over from_pretrained"""
+    timings = {}
+    overall = time.perf_counter()
+
+    threads = None
+    if tune and device == 'cpu':
+        # Thread counts from `tts_tune.py tune`, set before any parallel work runs
+        from tts_tune import apply_tune_profile
+        threads = apply_tune_profile()
+
+    start = time.perf_counter()
+    from chatterbox.tts import ChatterboxTTS
+    timings['import'] = time.perf_counter() - start
+
+    model = None
+    source = 'from_pretrained'
+    reason = snapshot_status(snapshot_dir)
+    if reason is None:
+        try:
+            model = _load_snapshot(device, snapshot_dir, timings)
+            source = 'snapshot'
+        except Exception as e:
+            reason = f"snapshot load failed: {e}"
+            logger.warning(reason)
+
+    if model is None:
+        start = time.perf_counter()
+        model = ChatterboxTTS.from_pretrained(device=device)
+        timings['from_pretrained'] = time.perf_counter() - start
+
+    timings['total'] = time.perf_counter() - overall
+    if verbose:
+        breakdown = ', '.join(f"{k}={v:.2f}s" for k, v in timings.items())
+        note = f" ({reason})" if source != 'snapshot' else ''
+        if threads:
+            note += f" [tuned: {threads['intra_op']} intra-op / {threads['inter_op']} inter-op threads]"
+        report(f"Chatterbox loaded from {source}{note} on {device}: {breakdown}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the local Chatterbox weight snapshot')
+    parser.add_argument('command', choices=['snapshot', 'status'])
+    parser.add_argument('--device', default='cpu', help='Device used to load the pretrained model')
+    parser.add_argument('--dir', default=str(SNAPSHOT_DIR), help='Snapshot directory')
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        manifest = create_snapshot(args.device, args.dir)
+        print(json.dumps({"status": "success", "dir": args.dir, **manifest}))
+    else:
+        reason = snapshot_status(args.dir)
+        print(json.dumps({"usable": reason is None, "reason": reason, "dir": args.dir}))
+        sys.exit(0 if reason is None else 1)
+
+
+if __name__ == '__main__':
+    main()
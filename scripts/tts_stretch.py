@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Pitch-preserving time-stretch for fitting TTS audio to a planned duration
+A phase vocoder on the STFT changes speed without changing pitch; it runs in
+milliseconds, so audio slightly too long or short for its slot is stretched
+instead of synthesized again. The ratio is bounded because speech starts to
+sound processed beyond about ±25%.
+"""
+import math
+import os
+
+# Largest stretch applied either way (1.25 = up to 25% longer or 20% shorter)
+MAX_STRETCH = float(os.environ.get('TTS_MAX_STRETCH', 1.25))
+
+# Differences smaller than this fraction are left alone
+STRETCH_TOLERANCE = float(os.environ.get('TTS_STRETCH_TOLERANCE', 0.01))
+
+
+def stretch_ratio(current, target, max_stretch=MAX_STRETCH):
+    """Output/input duration ratio to apply, clamped to the allowed range"""
+    if current <= 0 or target <= 0:
+        return 1.0
+    ratio = target / current
+    if abs(ratio - 1) < STRETCH_TOLERANCE:
+        return 1.0
+    return min(max(ratio, 1 / max_stretch), max_stretch)
+
+
+def time_stretch(wav, sr, ratio):
+    """Stretch audio of shape (channels, samples) by `ratio` without changing pitch"""
+    import torch
+    import torchaudio.functional as F
+
+    if ratio == 1.0:
+        return wav
+
+    # ~40ms frames at 24kHz, 75% overlap
+    n_fft = 1024 if sr <= 24000 else 2048
+    hop = n_fft // 4
+    window = torch.hann_window(n_fft, device=wav.device)
+    length = round(wav.shape[-1] * ratio)
+
+    spec = torch.stft(wav, n_fft, hop, window=window, return_complex=True)
+    phase_advance = torch.linspace(0, math.pi * hop, spec.shape[-2], device=wav.device)[..., None]
+    # phase_vocoder's rate is a speed-up factor: >1 shortens
+    stretched = F.phase_vocoder(spec, 1 / ratio, phase_advance)
+    out = torch.istft(stretched, n_fft, hop, window=window, length=length)
+
+    # Keep the original peak level (overlap-add can lift it slightly)
+    peak_in, peak_out = wav.abs().max(), out.abs().max()
+    if peak_out > 0 and peak_out > peak_in:
+        out = out * (peak_in / peak_out)
+    return out
+
+
+def fit_duration(wav, sr, target_duration, max_stretch=MAX_STRETCH):
+    """Stretch audio toward target_duration seconds, returning (wav, applied_ratio)"""
+    ratio = stretch_ratio(wav.shape[-1] / sr, target_duration, max_stretch)
+    return time_stretch(wav, sr, ratio), ratio
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+CPU thread and worker auto-tuning for TTS
+`python3 scripts/tts_tune.py tune` times generation on this machine with different
+intra-op / inter-op thread counts and worker counts and writes a profile.
+load_chatterbox() and the tts_server workers apply it at startup, so several
+workers (and ffmpeg) stop fighting over the same cores.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PATH = Path(os.environ.get(
+    'TTS_TUNE_PROFILE',
+    Path(__file__).resolve().parent.parent / 'models' / 'tts-tune.json'
+))
+
+# Cores left free for ffmpeg/Remotion when tuning (default: 1 on machines with more than 4)
+DEFAULT_RESERVED_CORES = os.environ.get('TTS_RESERVED_CORES')
+
+# Text timed by the model workload, about one video segment
+TUNE_TEXT = "Scientists discovered that octopuses can taste with their arms, and each arm can act on its own."
+
+
+def report(message):
+    """Print tuning progress on the real stderr"""
+    print(message, file=sys.__stderr__, flush=True)
+
+
+def cpu_cores():
+    """Cores this process is allowed to run on, in order"""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def processor_name():
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def fingerprint():
+    """What a profile must match to apply on this machine"""
+    return {"cpus": os.cpu_count(), "machine": platform.machine(), "processor": processor_name()}
+
+
+def default_reserved(cores):
+    if DEFAULT_RESERVED_CORES is not None:
+        return int(DEFAULT_RESERVED_CORES)
+    return 1 if cores > 4 else 0
+
+
+def load_tune_profile(path=PROFILE_PATH):
+    """Return the saved profile if it was made on this machine"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        profile = json.loads(path.read_text())
+    except ValueError:
+        logger.warning(f"Unreadable tune profile {path}")
+        return None
+    if profile.get('fingerprint') != fingerprint():
+        logger.warning(f"Ignoring tune profile {path}: made on a different machine")
+        return None
+    return profile
+
+
+def settings_for(profile, workers):
+    """Thread counts for one process when `workers` processes run side by side"""
+    config = profile['configs'].get(str(workers))
+    if config is not None:
+        return config
+    # Untested worker count: split the usable cores evenly
+    return {"intra_op": max(1, profile['usable_cores'] // workers), "inter_op": 1}
+
+
+def worker_cores(index, workers, intra_op, reserved=0):
+    """Cores for worker `index`, or None when the workers can't get disjoint sets"""
+    cores = cpu_cores()
+    usable = cores[:len(cores) - reserved] if reserved < len(cores) else cores
+    if workers * intra_op > len(usable):
+        return None
+    return set(usable[index * intra_op:(index + 1) * intra_op])
+
+
+def apply_tune_profile(workers=1, worker_index=None, path=PROFILE_PATH):
+    """Set torch thread counts, and CPU affinity for a pre-forked worker, from the profile"""
+    import torch
+
+    profile = load_tune_profile(path)
+    if profile is None:
+        return None
+
+    settings = settings_for(profile, workers)
+    if worker_index is not None and hasattr(os, 'sched_setaffinity'):
+        cores = worker_cores(worker_index, workers, settings['intra_op'], profile.get('reserved_cores', 0))
+        if cores:
+            os.sched_setaffinity(0, cores)
+
+    torch.set_num_threads(settings['intra_op'])
+    try:
+        torch.set_num_interop_threads(settings['inter_op'])
+    except RuntimeError:
+        # Fixed for the life of the process once parallel work has run (e.g. in a forked worker)
+        pass
+    return settings
+
+
+def build_workload(name):
+    """Return a function running one unit of work"""
+    import torch
+
+    if name == 'model':
+        from tts_snapshot import load_chatterbox
+        from tts_seed import seed_everything
+
+        model = load_chatterbox('cpu', verbose=False, tune=False)
+
+        def work():
+            seed_everything(0)
+            model.generate(TUNE_TEXT)
+        return work
+
+    # Synthetic stand-in with the same kinds of ops, for quick runs without weights
+    weights = torch.randn(1024, 1024)
+    signal = torch.randn(1, 80, 4000)
+    kernel = torch.randn(256, 80, 5)
+
+    def work():
+        x = torch.randn(64, 1024)
+        for _ in range(16):
+            x = torch.tanh(x @ weights)
+        torch.nn.functional.conv1d(signal, kernel, padding=2)
+    return work
+
+
+def _worker(work, repeats, cores, intra_op, queue):
+    import torch
+
+    if cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(intra_op)
+    for _ in range(repeats):
+        work()
+    queue.put(os.getpid())
+
+
+def trial(workload, intra_op, inter_op, workers, repeats, reserved):
+    """Time one configuration in this process (called in a fresh subprocess)"""
+    import multiprocessing
+    import torch
+
+    torch.set_num_interop_threads(inter_op)
+    torch.set_num_threads(intra_op)
+    work = build_workload(workload)
+    work()  # Warm up
+
+    if workers == 1:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            work()
+            timings.append(time.perf_counter() - start)
+        seconds = sorted(timings)[len(timings) // 2]
+        return {"seconds": seconds, "throughput": 1 / seconds}
+
+    # Forked workers share the loaded weights, like tts_server --workers
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    start = time.perf_counter()
+    processes = [
+        context.Process(target=_worker, args=(work, repeats, worker_cores(i, workers, intra_op, reserved), intra_op, queue))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        queue.get()
+    wall = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return {"seconds": wall / repeats, "throughput": workers * repeats / wall}
+
+
+def run_trial(workload, intra_op, inter_op, workers, repeats, reserved):
+    """Run a trial in a subprocess, since inter-op threads can only be set once per process"""
+    command = [
+        sys.executable, str(Path(__file__).resolve()), 'trial',
+        '--workload', workload, '--intra', str(intra_op), '--inter', str(inter_op),
+        '--workers', str(workers), '--repeats', str(repeats), '--reserve', str(reserved)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'trial failed')
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured.update({"intra_op": intra_op, "inter_op": inter_op, "workers": workers})
+    report(f"  workers={workers} intra={intra_op} inter={inter_op}: "
+           f"{measured['seconds']:.2f}s per item, {measured['throughput']:.2f} items/s")
+    return measured
+
+
+def thread_counts(usable):
+    counts = []
+    n = 1
+    while n < usable:
+        counts.append(n)
+        n *= 2
+    return counts + [usable]
+
+
+def tune(workload='model', repeats=3, reserved=None, max_workers=None, path=PROFILE_PATH):
+    """Benchmark thread and worker counts and write the profile"""
+    cores = len(cpu_cores())
+    reserved = default_reserved(cores) if reserved is None else reserved
+    usable = max(1, cores - reserved)
+    report(f"Tuning TTS on {cores} cores ({reserved} reserved, {usable} usable), workload: {workload}")
+
+    trials = []
+
+    # Single process: best latency over intra/inter-op thread counts
+    report("Single process thread counts:")
+    for intra_op in thread_counts(usable):
+        for inter_op in (1, 2):
+            trials.append(run_trial(workload, intra_op, inter_op, 1, repeats, reserved))
+    best_single = min((t for t in trials if t['workers'] == 1), key=lambda t: t['seconds'])
+    configs = {"1": {"intra_op": best_single['intra_op'], "inter_op": best_single['inter_op'],
+                     "seconds": best_single['seconds'], "throughput": best_single['throughput']}}
+
+    # Several workers: cores split evenly, one inter-op thread each
+    report("Worker counts:")
+    workers = 2
+    while workers <= min(usable, max_workers or usable):
+        measured = run_trial(workload, usable // workers, 1, workers, repeats, reserved)
+        trials.append(measured)
+        configs[str(workers)] = {"intra_op": usable // workers, "inter_op": 1,
+                                 "seconds": measured['seconds'], "throughput": measured['throughput']}
+        workers *= 2
+
+    # Fewest workers within 5% of the best throughput (more workers cost memory)
+    best_throughput = max(c['throughput'] for c in configs.values())
+    recommended = min(int(w) for w, c in configs.items() if c['throughput'] >= 0.95 * best_throughput)
+
+    profile = {
+        "fingerprint": fingerprint(),
+        "created_at": datetime.now().isoformat(),
+        "workload": workload,
+        "reserved_cores": reserved,
+        "usable_cores": usable,
+        "recommended_workers": recommended,
+        "configs": configs,
+        "trials": trials
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(profile, indent=2))
+    report(f"Profile written to {path}: {best_single['intra_op']} intra-op / {best_single['inter_op']} inter-op threads, "
+           f"{recommended} worker(s) recommended")
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tune torch threading and TTS worker counts for this machine')
+    parser.add_argument('command', choices=['tune', 'show', 'trial'])
+    parser.add_argument('--workload', choices=['model', 'synthetic'], default='model',
+                        help='"synthetic" times matmul/conv ops instead of the real model')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--reserve', type=int, default=None, help='Cores left free for ffmpeg/rendering')
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--profile', default=str(PROFILE_PATH))
+    # Used by the trial subprocesses
+    parser.add_argument('--intra', type=int, default=1)
+    parser.add_argument('--inter', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == 'trial':
+        print(json.dumps(trial(args.workload, args.intra, args.inter, args.workers, args.repeats, args.reserve or 0)))
+    elif args.command == 'tune':
+        profile = tune(args.workload, args.repeats, args.reserve, args.max_workers, args.profile)
+        print(json.dumps({key: profile[key] for key in ('recommended_workers', 'configs')}, indent=2))
+    else:
+        profile = load_tune_profile(args.profile)
+        print(json.dumps(profile, indent=2) if profile else json.dumps({"profile": None, "path": args.profile}))
+        sys.exit(0 if profile else 1)
+
+
+if __name__ == '__main__':
+    main()
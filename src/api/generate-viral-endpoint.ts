@@ -1,36 +1,26 @@
 import { Request, Response } from 'express';
-import fs from 'fs/promises';
-import path from 'path';
 import { logger } from '../utils/logger';
+import { startHeartbeat } from '../utils/sseHeartbeat';
 import { SyncedVideoGenerator } from '../video/SyncedVideoGenerator';
-import { EventEmitter } from 'events';
+import { openJobWorkspace, readManifest, JobWorkspace } from '../utils/jobWorkspace';
 
-// Esta clase extiende SyncedVideoGenerator pero usa contenido existente
+// Esta clase extiende SyncedVideoGenerator pero usa el contenido del manifiesto del job
 class ViralContentGenerator extends SyncedVideoGenerator {
   private viralContent: any;
   
-  constructor(content: any) {
+  constructor(content: any, workspace: JobWorkspace) {
     const duration = content.totalDuration || 30;
     const style = content.videoStyle || 1;
-    super(duration, style);
+    super(duration, style, workspace);
     this.viralContent = content;
   }
   
-  // Sobrescribir el método para usar contenido viral en lugar de generar aleatorio
   async generateSyncedVideo(): Promise<string> {
     try {
       logger.info('🔥 Starting VIRAL video generation with existing content...');
       logger.info(`📺 Title: ${this.viralContent.title}`);
       
-      // Guardar el contenido en synced-data.json para que Remotion lo use
-      const dataPath = path.join(process.cwd(), 'src', 'remotion', 'synced-data.json');
-      await fs.writeFile(dataPath, JSON.stringify(this.viralContent, null, 2));
-      
-      // Ahora llamar al método padre pero sin generar script nuevo
-      // Esto es un hack: vamos a simular que ya tenemos el script
-      
-      // Por ahora, usar el método original
-      // TODO: Refactorizar para separar generación de script del renderizado
+      // El contenido ya está en el manifiesto del job; SyncedVideoGenerator lo usa en lugar de generar uno
       return await super.generateSyncedVideo();
     } catch (error) {
       logger.error('Error in viral video generation:', error);
@@ -44,10 +34,14 @@ class ViralContentGenerator extends SyncedVideoGenerator {
  */
 export async function generateViralVideo(req: Request, res: Response) {
   try {
-    // Leer el contenido actual de synced-data.json
-    const syncedDataPath = path.join(process.cwd(), 'src', 'remotion', 'synced-data.json');
-    const syncedContent = await fs.readFile(syncedDataPath, 'utf-8');
-    const viralData = JSON.parse(syncedContent);
+    // Leer el contenido del manifiesto del job (output/jobs/<id>/manifest.json)
+    const manifestPath = (req.query.manifest || req.body?.manifest) as string | undefined;
+    if (!manifestPath) {
+      res.status(400).json({ error: 'manifest is required' });
+      return;
+    }
+    const workspace = await openJobWorkspace(manifestPath);
+    const viralData = await readManifest(workspace);
     
     logger.info(`🔥 Generating viral video: ${viralData.title}`);
     
@@ -62,6 +56,7 @@ export async function generateViralVideo(req: Request, res: Response) {
     // Disable timeout
     req.setTimeout(0);
     res.setTimeout(0);
+    startHeartbeat(res);
     
     // Send initial message
     res.write(`data: ${JSON.stringify({ 
@@ -70,7 +65,7 @@ export async function generateViralVideo(req: Request, res: Response) {
     })}\n\n`);
     
     // Create generator with viral content
-    const generator = new ViralContentGenerator(viralData);
+    const generator = new ViralContentGenerator(viralData, workspace);
     
     // Listen for progress updates
     generator.on('progress', (data) => {
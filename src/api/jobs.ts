@@ -0,0 +1,39 @@
+import { Request, Response, Router } from 'express';
+import { findJob, streamJob } from '../utils/jobRegistry';
+
+const router = Router();
+
+/**
+ * GET /api/jobs/:key
+ * Estado de un job enviado con Idempotency-Key (running, complete o error)
+ */
+router.get('/:key', async (req: Request, res: Response) => {
+  const job = await findJob(req.params.key);
+  if (!job) {
+    return res.status(404).json({ error: 'Job not found' });
+  }
+  
+  res.json({
+    key: job.key,
+    status: job.status,
+    startedAt: job.startedAt,
+    finishedAt: job.finishedAt,
+    events: job.events.length,
+    lastEvent: job.events[job.events.length - 1]?.data
+  });
+});
+
+/**
+ * GET /api/jobs/:key/events
+ * Reconectarse al stream SSE de un job: repite los eventos posteriores a Last-Event-ID y sigue hasta que termine
+ */
+router.get('/:key/events', async (req: Request, res: Response) => {
+  const job = await findJob(req.params.key);
+  if (!job) {
+    return res.status(404).json({ error: 'Job not found' });
+  }
+  
+  streamJob(job, req, res);
+});
+
+export default router;
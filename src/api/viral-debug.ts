@@ -1,79 +1,99 @@
 import { Request, Response, Router } from 'express';
 import { ViralVideoProcessorDebug } from '../video/ViralVideoProcessorDebug';
 import { logger } from '../utils/logger';
+import { openJobWorkspace, JobWorkspace } from '../utils/jobWorkspace';
+import { serveJob } from '../utils/jobRegistry';
 import fs from 'fs/promises';
 import path from 'path';
 
 const router = Router();
 
+/**
+ * POST /api/viral-debug/broll
+ * Busca el B-roll de un script y lo copia al directorio del job (etapa broll de pipeline.py)
+ */
+router.post('/broll', async (req: Request, res: Response) => {
+  const { viralScript, manifest } = req.body;
+  
+  if (!viralScript || !manifest) {
+    return res.status(400).json({ error: 'viralScript and manifest are required' });
+  }
+  
+  let workspace: JobWorkspace;
+  try {
+    workspace = await openJobWorkspace(manifest);
+  } catch (error) {
+    return res.status(400).json({ error: (error as Error).message });
+  }
+  
+  try {
+    const brollVideos = await new ViralVideoProcessorDebug().collectBroll(viralScript, workspace);
+    logger.info(`📹 [DEBUG] ${brollVideos.length} B-roll videos copied to job ${workspace.id}`);
+    res.json({ success: true, brollVideos });
+  } catch (error) {
+    logger.error('[DEBUG] Error finding B-roll:', error);
+    res.status(500).json({ error: (error as Error).message });
+  }
+});
+
 /**
  * POST /api/viral-debug/generate
  * Genera un video viral usando audios existentes (para debug rápido)
+ * Con `manifest` usa el audio, la transcripción y el B-roll de ese job
  */
 router.post('/generate', async (req: Request, res: Response) => {
   try {
-    const { viralScript } = req.body;
+    const { viralScript, manifest } = req.body;
     
     if (!viralScript) {
       return res.status(400).json({ error: 'viralScript is required' });
     }
     
-    logger.info(`🔧 [DEBUG] Starting viral video generation for: ${viralScript.title}`);
-    
-    // Set up SSE
-    res.writeHead(200, {
-      'Content-Type': 'text/event-stream',
-      'Cache-Control': 'no-cache',
-      'Connection': 'keep-alive',
-      'Access-Control-Allow-Origin': '*'
-    });
-    
-    req.setTimeout(0);
-    res.setTimeout(0);
-    
-    // Send initial message
-    res.write(`data: ${JSON.stringify({
-      type: 'start',
-      message: `🔧 [DEBUG MODE] Generating viral video with existing audio: ${viralScript.title}`,
-      script: viralScript
-    })}\n\n`);
+    let workspace: JobWorkspace | undefined;
+    if (manifest) {
+      try {
+        workspace = await openJobWorkspace(manifest);
+      } catch (error) {
+        return res.status(400).json({ error: (error as Error).message });
+      }
+    }
     
-    // Create debug processor
-    const processor = new ViralVideoProcessorDebug();
+    logger.info(`🔧 [DEBUG] Starting viral video generation for: ${viralScript.title}`);
     
-    // Listen for progress
-    processor.on('progress', (data) => {
-      res.write(`data: ${JSON.stringify({
-        type: 'progress',
-        ...data
-      })}\n\n`);
+    // Con Idempotency-Key, repetir la petición se reengancha al job en curso o terminado
+    await serveJob(req, res, async (emit) => {
+      emit({
+        type: 'start',
+        message: `🔧 [DEBUG MODE] Generating viral video with existing audio: ${viralScript.title}`,
+        script: viralScript
+      });
+      
+      // Create debug processor
+      const processor = new ViralVideoProcessorDebug();
+      
+      // Listen for progress
+      processor.on('progress', (data) => emit({ type: 'progress', ...data }));
+      
+      // Process video with existing audio
+      const videoPath = await processor.processViralScriptWithExistingAudio(viralScript, workspace);
+      
+      return {
+        videoPath,
+        message: '✅ [DEBUG] Viral video generated successfully!',
+        metadata: {
+          scriptId: viralScript.id,
+          title: viralScript.title,
+          duration: viralScript.duration,
+          debugMode: true
+        }
+      };
     });
     
-    // Process video with existing audio
-    const videoPath = await processor.processViralScriptWithExistingAudio(viralScript);
-    
-    // Send completion
-    res.write(`data: ${JSON.stringify({
-      type: 'complete',
-      videoPath,
-      message: '✅ [DEBUG] Viral video generated successfully!',
-      metadata: {
-        scriptId: viralScript.id,
-        title: viralScript.title,
-        duration: viralScript.duration,
-        debugMode: true
-      }
-    })}\n\n`);
-    
-    res.end();
-    
   } catch (error) {
     logger.error('[DEBUG] Error in viral video generation:', error);
-    res.write(`data: ${JSON.stringify({
-      type: 'error',
-      error: (error as Error).message
-    })}\n\n`);
-    res.end();
+    if (!res.headersSent) {
+      res.status(500).json({ error: (error as Error).message });
+    }
   }
 });
 
@@ -1,6 +1,7 @@
 import { Request, Response, Router } from 'express';
 import { ViralVideoProcessorQuick } from '../video/ViralVideoProcessorQuick';
 import { logger } from '../utils/logger';
+import { startHeartbeat } from '../utils/sseHeartbeat';
 
 const router = Router();
 
@@ -30,6 +31,7 @@ router.post('/generate', async (req: Request, res: Response) => {
     
     req.setTimeout(0);
     res.setTimeout(0);
+    startHeartbeat(res);
     
     // Send initial message
     res.write(`data: ${JSON.stringify({
@@ -1,6 +1,8 @@
 import { Request, Response, Router } from 'express';
 import { ViralVideoProcessorFixed } from '../video/ViralVideoProcessorFixed';
 import { logger } from '../utils/logger';
+import { startHeartbeat } from '../utils/sseHeartbeat';
+import { serveJob } from '../utils/jobRegistry';
 import fs from 'fs/promises';
 import path from 'path';
 
@@ -93,6 +95,7 @@ router.post('/generate', async (req: Request, res: Response) => {
     // Disable timeout
     req.setTimeout(0);
     res.setTimeout(0);
+    startHeartbeat(res);
     
     // Create processor
     const processor = new ViralVideoProcessorFixed();
@@ -154,73 +157,47 @@ router.get('/generate/:id', async (req: Request, res: Response) => {
     const scriptsPath = path.join(process.cwd(), 'data', 'viral-scripts.json');
     const scriptsData = JSON.parse(await fs.readFile(scriptsPath, 'utf-8'));
     
-    let viralScript = null;
-    for (const s of [...scriptsData.channel1_psychology, ...scriptsData.channel2_horror]) {
-      if (s.id === id) {
-        viralScript = s;
-        break;
-      }
-    }
+    const viralScript = [...scriptsData.channel1_psychology, ...scriptsData.channel2_horror].find((s: any) => s.id === id);
     
     if (!viralScript) {
       res.status(404).json({ error: 'Script not found' });
       return;
     }
     
-    // Set up SSE
-    res.writeHead(200, {
-      'Content-Type': 'text/event-stream',
-      'Cache-Control': 'no-cache',
-      'Connection': 'keep-alive',
-      'Access-Control-Allow-Origin': '*'
-    });
-    
-    req.setTimeout(0);
-    res.setTimeout(0);
-    
-    // Send initial message
-    res.write(`data: ${JSON.stringify({
-      type: 'start',
-      message: `🔥 Generating viral video: ${viralScript.title}`,
-      script: viralScript
-    })}\n\n`);
-    
-    // Create processor
-    const processor = new ViralVideoProcessorFixed();
-    
-    // Listen for progress
-    processor.on('progress', (data) => {
-      res.write(`data: ${JSON.stringify({
-        type: 'progress',
-        ...data
-      })}\n\n`);
+    // Con Idempotency-Key, repetir la petición se reengancha al job en curso o terminado
+    await serveJob(req, res, async (emit) => {
+      emit({
+        type: 'start',
+        message: `🔥 Generating viral video: ${viralScript.title}`,
+        script: viralScript
+      });
+      
+      // Create processor
+      const processor = new ViralVideoProcessorFixed();
+      
+      // Listen for progress
+      processor.on('progress', (data) => emit({ type: 'progress', ...data }));
+      
+      // Process video
+      const videoPath = await processor.processViralScript(viralScript);
+      
+      return {
+        videoPath,
+        message: '✅ Viral video generated successfully!',
+        metadata: {
+          scriptId: viralScript.id,
+          title: viralScript.title,
+          duration: viralScript.duration,
+          expectedViews: viralScript.expectedViews
+        }
+      };
     });
     
-    // Process video
-    const videoPath = await processor.processViralScript(viralScript);
-    
-    // Send completion
-    res.write(`data: ${JSON.stringify({
-      type: 'complete',
-      videoPath,
-      message: '✅ Viral video generated successfully!',
-      metadata: {
-        scriptId: viralScript.id,
-        title: viralScript.title,
-        duration: viralScript.duration,
-        expectedViews: viralScript.expectedViews
-      }
-    })}\n\n`);
-    
-    res.end();
-    
   } catch (error) {
     logger.error('Error in viral video generation:', error);
-    res.write(`data: ${JSON.stringify({
-      type: 'error',
-      error: (error as Error).message
-    })}\n\n`);
-    res.end();
+    if (!res.headersSent) {
+      res.status(500).json({ error: (error as Error).message });
+    }
   }
 });
 
@@ -1,13 +1,17 @@
 import express from 'express';
+import os from 'os';
 import cors from 'cors';
 import helmet from 'helmet';
 import morgan from 'morgan';
 import { PrismaClient } from '@prisma/client';
 import { config } from './config';
 import { logger } from './utils/logger';
+import { startHeartbeat } from './utils/sseHeartbeat';
 import viralVideosRouter from './api/viral-videos';
 import viralDebugRouter from './api/viral-debug';
 import viralQuickRouter from './api/viral-quick';
+import jobsRouter from './api/jobs';
+import { activeJobCount, serveJob, serveJobJson } from './utils/jobRegistry';
 
 const app = express();
 const prisma = new PrismaClient();
@@ -25,6 +29,11 @@ app.get('/health', (req, res) => {
     status: 'healthy',
     timestamp: new Date().toISOString(),
     uptime: process.uptime(),
+    load: {
+      activeJobs: activeJobCount(),
+      loadAverage: os.loadavg()[0],
+      cpus: os.cpus().length,
+    },
   });
 });
 
@@ -46,6 +55,8 @@ app.get('/api/v1/status', (req, res) => {
 app.use('/api/viral', viralVideosRouter);
 app.use('/api/viral-debug', viralDebugRouter);
 app.use('/api/viral-quick', viralQuickRouter);
+// Estado y reconexión de jobs enviados con Idempotency-Key
+app.use('/api/jobs', jobsRouter);
 
 // Demo endpoints
 import { DemoGenerator } from './demo/demo-generator';
@@ -175,29 +186,32 @@ import { SimpleRemotionProducer } from './video/SimpleRemotionProducer';
 const simpleRemotionProducer = new SimpleRemotionProducer();
 
 app.post('/api/video/generate-viral', async (req, res) => {
-  try {
-    logger.info('🚀 Generando video viral con Remotion');
-    const idea = await demoGen.generateDemoIdea();
-    const script = await demoGen.generateDemoScript(idea);
-    
-    // Usar el productor simplificado que funciona mejor
-    const videoPath = await simpleRemotionProducer.generateVideo(script);
-    
-    res.json({ 
-      success: true, 
-      videoPath,
-      script: {
-        title: script.title,
-        hook: script.hook,
-        duration: script.duration,
-        callToAction: script.callToAction
-      },
-      message: '🎬 Video viral generado con Remotion!' 
-    });
-  } catch (error) {
-    logger.error('Error generando video viral:', error);
-    res.status(500).json({ error: 'Error generando video viral' });
-  }
+  // Con Idempotency-Key, una petición repetida espera al mismo job o devuelve su resultado
+  await serveJobJson(req, res, async () => {
+    try {
+      logger.info('🚀 Generando video viral con Remotion');
+      const idea = await demoGen.generateDemoIdea();
+      const script = await demoGen.generateDemoScript(idea);
+      
+      // Usar el productor simplificado que funciona mejor
+      const videoPath = await simpleRemotionProducer.generateVideo(script);
+      
+      return { 
+        success: true, 
+        videoPath,
+        script: {
+          title: script.title,
+          hook: script.hook,
+          duration: script.duration,
+          callToAction: script.callToAction
+        },
+        message: '🎬 Video viral generado con Remotion!' 
+      };
+    } catch (error) {
+      logger.error('Error generando video viral:', error);
+      throw new Error('Error generando video viral');
+    }
+  });
 });
 
 // Endpoint alternativo con audio integrado (experimental)
@@ -278,6 +292,7 @@ import { QuickTestVideo } from './video/QuickTestVideo';
 import { OptimizedVideoGenerator } from './video/OptimizedVideoGenerator';
 import { VideoWithProgress } from './video/VideoWithProgress';
 import { SyncedVideoGenerator } from './video/SyncedVideoGenerator';
+import { openJobWorkspace, JobWorkspace } from './utils/jobWorkspace';
 const quickVideo = new QuickVideoWithAudio();
 const quickTest = new QuickTestVideo();
 const optimizedGen = new OptimizedVideoGenerator();
@@ -354,55 +369,39 @@ app.get('/api/video/generate-synced', async (_req, res) => {
   // Get style from query parameter (default to 1, range 1-6)
   const style = Math.min(6, Math.max(1, parseInt(_req.query.style as string) || 1));
   
-  logger.info(`🎯 Starting SYNCHRONIZED video generation with progress (${duration} seconds, Style ${style})`);
-  
-  // Set up SSE
-  res.writeHead(200, {
-    'Content-Type': 'text/event-stream',
-    'Cache-Control': 'no-cache',
-    'Connection': 'keep-alive',
-    'Access-Control-Allow-Origin': '*'
-  });
-  
-  // Disable timeout
-  _req.setTimeout(0);
-  res.setTimeout(0);
-  
-  // Send initial message
-  res.write(`data: ${JSON.stringify({ 
-    type: 'start', 
-    message: `🎯 Starting ${duration}-second synchronized video generation (Style ${style})...` 
-  })}\n\n`);
+  // Optional job manifest (output/jobs/<id>/manifest.json) with the content to render
+  let workspace: JobWorkspace | undefined;
+  if (_req.query.manifest) {
+    try {
+      workspace = await openJobWorkspace(_req.query.manifest as string);
+    } catch (error) {
+      res.status(400).json({ error: (error as Error).message });
+      return;
+    }
+  }
   
-  // Create new instance with duration and style
-  const syncGen = new SyncedVideoGenerator(duration, style);
+  logger.info(`🎯 Starting SYNCHRONIZED video generation with progress (${duration} seconds, Style ${style}${workspace ? `, job ${workspace.id}` : ''})`);
   
-  // Listen for progress updates
-  syncGen.on('progress', (data) => {
-    res.write(`data: ${JSON.stringify({ 
-      type: 'progress', 
-      ...data 
-    })}\n\n`);
-  });
-  
-  try {
+  // Con Idempotency-Key, repetir la petición se reengancha al job en curso o terminado
+  await serveJob(_req, res, async (emit) => {
+    emit({ 
+      type: 'start', 
+      message: `🎯 Starting ${duration}-second synchronized video generation (Style ${style})...` 
+    });
+    
+    // Create new instance with duration and style
+    const syncGen = new SyncedVideoGenerator(duration, style, workspace);
+    
+    // Listen for progress updates
+    syncGen.on('progress', (data) => emit({ type: 'progress', ...data }));
+    
     const videoPath = await syncGen.generateSyncedVideo();
     
-    res.write(`data: ${JSON.stringify({ 
-      type: 'complete', 
+    return { 
       videoPath,
       message: `🎯 ${duration}-second synchronized video generated successfully!` 
-    })}\n\n`);
-    
-  } catch (error) {
-    logger.error('Error in synced video generation:', error);
-    res.write(`data: ${JSON.stringify({ 
-      type: 'error', 
-      error: (error as Error).message 
-    })}\n\n`);
-  } finally {
-    res.end();
-  }
+    };
+  });
 });
 
 // Alternative POST endpoint for simple sync generation
@@ -446,6 +445,7 @@ app.get('/api/video/generate-with-progress', async (_req, res) => {
   // Disable timeout
   _req.setTimeout(0);
   res.setTimeout(0);
+  startHeartbeat(res);
   
   // Send initial message
   res.write(`data: ${JSON.stringify({ type: 'start', message: 'Starting video generation...' })}\n\n`);
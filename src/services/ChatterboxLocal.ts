@@ -97,31 +97,19 @@ from pathlib import Path
 def generate_audio_fallback(text, output_path, voice_settings):
     """
     Función fallback cuando Chatterbox no está disponible
-    Genera un archivo de audio vacío para desarrollo
+    Genera ráfagas de tono por palabra con tiempos realistas (scripts/placeholder_tts.py)
     """
-    import wave
-    import numpy as np
+    sys.path.insert(0, str(Path.cwd() / "scripts"))
+    from placeholder_tts import generate
     
-    # Generar audio de silencio como placeholder
-    sample_rate = 22050
-    duration = min(len(text) * 0.06, 10)  # Aproximadamente 60ms por carácter
-    samples = int(sample_rate * duration)
-    
-    # Crear array de silencio
-    audio_data = np.zeros(samples, dtype=np.int16)
-    
-    # Guardar como WAV
-    with wave.open(output_path, 'w') as wav_file:
-        wav_file.setnchannels(1)  # Mono
-        wav_file.setsampwidth(2)  # 16-bit
-        wav_file.setframerate(sample_rate)
-        wav_file.writeframes(audio_data.tobytes())
+    result = generate(text, output_path, rate=voice_settings.get("speed", 1.0))
     
     print(json.dumps({
         "status": "success",
         "message": "Audio generado (modo fallback)",
         "output": output_path,
-        "duration": duration
+        "duration": result["duration"],
+        "words": result["words"]
     }))
 
 def generate_with_chatterbox(text, output_path, voice_settings):
@@ -310,9 +298,19 @@ if __name__ == "__main__":
   private async generateFallbackAudio(text: string, outputPath: string): Promise<void> {
     logger.warn('Usando audio fallback (Chatterbox no disponible)');
     
-    // Por ahora, crear un archivo de audio vacío
-    // En producción, podrías usar otra biblioteca TTS como fallback
-    await this.generateSilence(outputPath);
+    // Placeholder con la duración aproximada del habla real; silencio si Python tampoco funciona
+    const placeholderOk = await new Promise<boolean>((resolve) => {
+      const python = spawn(this.pythonPath, [
+        path.join(process.cwd(), 'scripts', 'placeholder_tts.py'),
+        '--text', text,
+        '--output', outputPath
+      ]);
+      python.on('close', (code) => resolve(code === 0));
+      python.on('error', () => resolve(false));
+    });
+    if (!placeholderOk) {
+      await this.generateSilence(outputPath);
+    }
     
     // Guardar el texto como metadata
     const metadataPath = outputPath.replace(/\.(wav|mp3)$/, '.txt');
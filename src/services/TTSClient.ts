@@ -1,23 +1,55 @@
 import axios from 'axios';
-import { exec } from 'child_process';
+import { exec, execFile } from 'child_process';
 import { promisify } from 'util';
 import { logger } from '../utils/logger';
 import path from 'path';
 import fs from 'fs/promises';
 
 const execAsync = promisify(exec);
+const execFileAsync = promisify(execFile);
 
-interface TTSResult {
+export interface WordTimestamp {
+  word: string;
+  start: number;
+  end: number;
+  confidence: number;
+}
+
+export interface TTSResult {
   success: boolean;
   output: string;
   sample_rate: number;
   device?: string;
   gpu_accelerated?: boolean;
+  duration?: number;
+  seed?: number;
+  engine?: string;
+  slo_met?: boolean;
+  // Set when a target_duration was requested: duration before stretching and output/input ratio
+  original_duration?: number;
+  stretch_ratio?: number;
+  // Word timestamps in seconds found in the audio itself; word_confidence is 0-1
+  words?: WordTimestamp[];
+  word_confidence?: number;
+  // Tries the server needed (it retries failed items with a new seed); failed items carry error instead
+  attempts?: number;
+  error?: string;
+  permanent?: boolean;
 }
 
 interface BatchItem {
   text: string;
   output_path: string;
+  seed?: number;
+  // Seconds allowed for this item; the server falls back to faster engines to meet it
+  latency_budget?: number;
+  quality_floor?: number;
+  engine?: string;
+  // Planned seconds for this item; the audio is time-stretched toward it (bounded by TTS_MAX_STRETCH)
+  target_duration?: number;
+  word_timestamps?: boolean;
+  // Tries before the item is reported as failed (server default: TTS_RETRY_ATTEMPTS)
+  max_attempts?: number;
 }
 
 export class TTSClient {
@@ -25,9 +57,12 @@ export class TTSClient {
   private serverProcess: any = null;
   private isServerRunning: boolean = false;
   private serverStartPromise: Promise<void> | null = null;
+  private isRemote: boolean;
 
-  constructor(port: number = 5555) {
-    this.serverUrl = `http://localhost:${port}`;
+  constructor(port: number = 5555, serverUrl: string | undefined = process.env.TTS_SERVER_URL) {
+    // TTS_SERVER_URL points at a remote server or tts_router.py instead of a local process
+    this.isRemote = !!serverUrl;
+    this.serverUrl = serverUrl ? serverUrl.replace(/\/$/, '') : `http://localhost:${port}`;
   }
 
   /**
@@ -57,6 +92,11 @@ export class TTSClient {
       return;
     }
 
+    // Remote servers are managed elsewhere; never spawn a local one for them
+    if (this.isRemote) {
+      throw new Error(`TTS server at ${this.serverUrl} is not available`);
+    }
+
     // Start the server
     this.serverStartPromise = this._startServerInternal();
     return this.serverStartPromise;
@@ -109,14 +149,16 @@ export class TTSClient {
   /**
    * Generate audio for a single text
    */
-  async generateAudio(text: string, outputPath: string): Promise<TTSResult> {
+  async generateAudio(text: string, outputPath: string, seed?: number): Promise<TTSResult> {
     // Ensure server is running
     await this.startServer();
 
     try {
       const response = await axios.post(`${this.serverUrl}/generate`, {
         text,
-        output_path: outputPath
+        output_path: outputPath,
+        // Omitted seeds use the server default, so repeated calls give the same audio
+        seed
       }, {
         timeout: 60000 // 1 minute timeout
       });
@@ -195,19 +237,23 @@ export class TTSClient {
                 try {
                   const data = JSON.parse(line.slice(6));
                   
-                  if (data.type === 'progress' || data.type === 'item_complete') {
+                  if (data.type === 'progress' || data.type === 'item_complete' || data.type === 'retry') {
                     if (onProgress) {
                       onProgress(data);
                     }
                   }
                   
+                  if (data.type === 'retry') {
+                    logger.warn(`TTS item ${data.index} failed (attempt ${data.attempt}/${data.max_attempts}), retrying: ${data.message}`);
+                  }
+                  
                   if (data.type === 'complete') {
                     resolve({ results: data.results });
                     return;
                   }
                   
                   if (data.type === 'error') {
-                    logger.error('TTS Error:', data.message);
+                    logger.error(`TTS Error${data.permanent ? ' (permanent)' : ''}:`, data.message);
                   }
                 } catch (e) {
                   // Ignore JSON parse errors
@@ -223,6 +269,51 @@ export class TTSClient {
     });
   }
 
+  /**
+   * Mix narration with ducked background music into one track (scripts/audio_premix.py)
+   * Runs the script directly, since mixing needs no TTS model; a remote server
+   * (TTS_SERVER_URL) does it through /premix, where the files live.
+   */
+  async premix(
+    narrationPath: string,
+    musicPath: string,
+    outputPath: string,
+    options: { music_volume?: number; duck_db?: number } = {}
+  ): Promise<{ success: boolean; output: string; duration: number; speed?: number }> {
+    if (this.isRemote) {
+      const response = await axios.post(`${this.serverUrl}/premix`, {
+        narration: narrationPath,
+        music: musicPath,
+        output_path: outputPath,
+        ...options
+      }, {
+        timeout: 60000
+      });
+      return response.data;
+    }
+
+    const args = [path.join(process.cwd(), 'scripts', 'audio_premix.py'), narrationPath, musicPath, outputPath];
+    if (options.music_volume !== undefined) {
+      args.push('--music-volume', String(options.music_volume));
+    }
+    if (options.duck_db !== undefined) {
+      args.push('--duck-db', String(options.duck_db));
+    }
+    try {
+      const { stdout } = await execFileAsync('python3', args, { timeout: 60000 });
+      return JSON.parse(stdout);
+    } catch (error: any) {
+      // The script prints {"error": ...} and exits 1 on failure; anything else (a crash) keeps the exec error
+      let message = error.message;
+      try {
+        message = JSON.parse(error.stdout).error || message;
+      } catch {
+        // stdout was not the script's JSON
+      }
+      throw new Error(`Premix failed: ${message}`);
+    }
+  }
+
   /**
    * Stop the TTS server
    */
@@ -0,0 +1,251 @@
+import { Request, Response } from 'express';
+import { EventEmitter } from 'events';
+import fs from 'fs/promises';
+import path from 'path';
+import crypto from 'crypto';
+import { logger } from './logger';
+import { startHeartbeat } from './sseHeartbeat';
+
+// Finished jobs submitted with a key are kept on disk so a duplicate submission after a restart still costs nothing
+const RESULTS_DIR = path.join(process.cwd(), 'output', 'idempotency');
+// ...for this long (IDEMPOTENCY_TTL_HOURS, default a week); output_gc.py also caps the directory's size
+const RESULT_TTL_MS = Number(process.env.IDEMPOTENCY_TTL_HOURS || 24 * 7) * 60 * 60 * 1000;
+// Failed jobs, and jobs started without a key, are only kept in memory this long, so submitting the same key again retries
+const MEMORY_TTL_MS = 60 * 1000;
+const KEY_PATTERN = /^[A-Za-z0-9_.:-]{1,200}$/;
+
+type JobStatus = 'running' | 'complete' | 'error';
+
+interface JobEvent {
+  id: number;
+  data: any;
+}
+
+export interface TrackedJob {
+  key: string;
+  status: JobStatus;
+  events: JobEvent[];
+  startedAt: string;
+  finishedAt?: string;
+  persist: boolean;
+  emitter: EventEmitter;
+}
+
+export type JobRunner = (emit: (data: any) => void) => Promise<any>;
+
+const jobs = new Map<string, TrackedJob>();
+
+/**
+ * Generation jobs running in this process (reported by /health so batch dispatchers can balance hosts)
+ */
+export function activeJobCount(): number {
+  let count = 0;
+  for (const job of jobs.values()) {
+    if (job.status === 'running') {
+      count++;
+    }
+  }
+  return count;
+}
+
+function resultPath(key: string): string {
+  return path.join(RESULTS_DIR, `${crypto.createHash('sha256').update(key).digest('hex').slice(0, 32)}.json`);
+}
+
+/**
+ * Idempotency key of a request: Idempotency-Key header, or idempotencyKey in the query or body
+ */
+export function idempotencyKeyOf(req: Request): string | undefined {
+  const key = req.get('Idempotency-Key') || (req.query.idempotencyKey as string) || req.body?.idempotencyKey;
+  if (key === undefined) {
+    return undefined;
+  }
+  if (!KEY_PATTERN.test(key)) {
+    throw new Error('Idempotency key must be 1-200 characters of [A-Za-z0-9_.:-]');
+  }
+  return key;
+}
+
+/**
+ * Running or finished job for a key, from memory or from the results directory
+ */
+export async function findJob(key: string): Promise<TrackedJob | undefined> {
+  const running = jobs.get(key);
+  if (running) {
+    return running;
+  }
+  let saved: TrackedJob;
+  try {
+    saved = JSON.parse(await fs.readFile(resultPath(key), 'utf-8'));
+  } catch {
+    return undefined;
+  }
+  if (!(await isStillValid(saved))) {
+    // Expired, or its video was deleted (output_gc.py, by hand): treat as never run so it renders again
+    await fs.unlink(resultPath(key)).catch(() => undefined);
+    return jobs.get(key);
+  }
+  return jobs.get(key) || { ...saved, emitter: new EventEmitter() };
+}
+
+async function isStillValid(saved: TrackedJob): Promise<boolean> {
+  if (!saved.finishedAt || Date.now() - Date.parse(saved.finishedAt) > RESULT_TTL_MS) {
+    return false;
+  }
+  const videoPath = saved.events[saved.events.length - 1]?.data?.videoPath;
+  if (typeof videoPath !== 'string') {
+    return true;
+  }
+  try {
+    await fs.access(path.resolve(videoPath));
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+function startJob(key: string, run: JobRunner, persist: boolean): TrackedJob {
+  const job: TrackedJob = {
+    key,
+    status: 'running',
+    events: [],
+    startedAt: new Date().toISOString(),
+    persist,
+    emitter: new EventEmitter()
+  };
+  job.emitter.setMaxListeners(0);
+  jobs.set(key, job);
+
+  const emit = (data: any) => {
+    const event = { id: job.events.length + 1, data };
+    job.events.push(event);
+    job.emitter.emit('event', event);
+  };
+
+  const finish = async (status: JobStatus, data: any) => {
+    job.status = status;
+    job.finishedAt = new Date().toISOString();
+    emit(data);
+    job.emitter.emit('end');
+    if (status === 'complete' && job.persist) {
+      try {
+        await fs.mkdir(RESULTS_DIR, { recursive: true });
+        const { emitter, ...saved } = job;
+        const tempPath = `${resultPath(key)}.tmp`;
+        await fs.writeFile(tempPath, JSON.stringify(saved));
+        await fs.rename(tempPath, resultPath(key));
+      } catch (error) {
+        logger.warn(`Could not persist result of job ${key}:`, error);
+      }
+      jobs.delete(key);
+    } else {
+      setTimeout(() => jobs.delete(key), MEMORY_TTL_MS).unref();
+    }
+  };
+
+  run(emit)
+    .then((result) => finish('complete', { type: 'complete', ...result }))
+    .catch((error) => {
+      logger.error(`Job ${key} failed:`, error);
+      finish('error', { type: 'error', error: (error as Error).message });
+    });
+
+  return job;
+}
+
+/**
+ * Stream a job's events as SSE: replay the ones after Last-Event-ID, then follow it until it ends
+ * (fromStart ignores Last-Event-ID, whose ids belong to another job when this one was just started)
+ */
+export function streamJob(job: TrackedJob, req: Request, res: Response, fromStart = false): void {
+  res.writeHead(200, {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'Access-Control-Allow-Origin': '*',
+    'Idempotency-Key': job.key
+  });
+  req.setTimeout(0);
+  res.setTimeout(0);
+  startHeartbeat(res);
+
+  const lastEventId = fromStart ? 0 : parseInt(req.get('Last-Event-ID') || '0', 10) || 0;
+  const send = (event: JobEvent) => res.write(`id: ${event.id}\ndata: ${JSON.stringify(event.data)}\n\n`);
+
+  for (const event of job.events) {
+    if (event.id > lastEventId) {
+      send(event);
+    }
+  }
+  if (job.status !== 'running') {
+    res.end();
+    return;
+  }
+
+  const onEnd = () => {
+    cleanup();
+    res.end();
+  };
+  const cleanup = () => {
+    job.emitter.off('event', send);
+    job.emitter.off('end', onEnd);
+  };
+  job.emitter.on('event', send);
+  job.emitter.on('end', onEnd);
+  // A client that disconnects only stops listening; the job keeps running for whoever reattaches
+  req.on('close', cleanup);
+}
+
+/**
+ * Run a generation as a tracked job and stream it; a request whose idempotency key
+ * matches a running or finished job reattaches to it instead of starting another one
+ */
+export async function serveJob(req: Request, res: Response, run: JobRunner): Promise<void> {
+  let key: string | undefined;
+  try {
+    key = idempotencyKeyOf(req);
+  } catch (error) {
+    res.status(400).json({ error: (error as Error).message });
+    return;
+  }
+
+  const existing = key ? await findJob(key) : undefined;
+  if (existing) {
+    logger.info(`🔁 Reattaching to job ${existing.key} (${existing.status})`);
+    streamJob(existing, req, res);
+    return;
+  }
+  // Without a key the job gets a random one (sent back as Idempotency-Key) so it can still be reattached while it runs,
+  // through /api/jobs/<key>/events; sending the request again starts a new job
+  const running = key ? jobs.get(key) : undefined;
+  if (running) {
+    streamJob(running, req, res);
+    return;
+  }
+  streamJob(startJob(key || crypto.randomUUID(), run, Boolean(key)), req, res, true);
+}
+
+/**
+ * Same as serveJob for endpoints that answer with one JSON body instead of a stream
+ */
+export async function serveJobJson(req: Request, res: Response, run: () => Promise<any>): Promise<void> {
+  let key: string | undefined;
+  try {
+    key = idempotencyKeyOf(req);
+  } catch (error) {
+    res.status(400).json({ error: (error as Error).message });
+    return;
+  }
+
+  const existing = key ? await findJob(key) : undefined;
+  const job = existing || (key && jobs.get(key)) || startJob(key || crypto.randomUUID(), () => run(), Boolean(key));
+  if (job.status === 'running') {
+    await new Promise((resolve) => job.emitter.once('end', resolve));
+  }
+  const { type, ...result } = job.events[job.events.length - 1].data;
+  if (type === 'complete') {
+    res.set('Idempotency-Key', job.key).json(result);
+  } else {
+    res.status(500).json(result);
+  }
+}
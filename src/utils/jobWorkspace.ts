@@ -0,0 +1,73 @@
+import fs from 'fs/promises';
+import path from 'path';
+import crypto from 'crypto';
+
+// Same layout as job_workspace.py: output/jobs/<id>/manifest.json plus the job's intermediate files
+export const JOBS_DIR = path.join(process.cwd(), 'output', 'jobs');
+const MANIFEST_NAME = 'manifest.json';
+
+export interface JobWorkspace {
+  id: string;
+  dir: string;
+  manifestPath: string;
+  audioDir: string;
+}
+
+function workspaceFor(dir: string): JobWorkspace {
+  return {
+    id: path.basename(dir),
+    dir,
+    manifestPath: path.join(dir, MANIFEST_NAME),
+    audioDir: path.join(dir, 'audio')
+  };
+}
+
+function newJobId(prefix: string): string {
+  const stamp = new Date().toISOString().replace(/[-:]/g, '').replace('T', '_').slice(0, 15);
+  return `${prefix}_${stamp}_${crypto.randomBytes(3).toString('hex')}`;
+}
+
+/**
+ * Create a fresh workspace directory for one generation
+ */
+export async function createJobWorkspace(prefix: string = 'job'): Promise<JobWorkspace> {
+  const workspace = workspaceFor(path.join(JOBS_DIR, newJobId(prefix)));
+  await fs.mkdir(workspace.audioDir, { recursive: true });
+  return workspace;
+}
+
+/**
+ * Workspace of a manifest passed by a client; only manifests inside JOBS_DIR are accepted
+ */
+export async function openJobWorkspace(manifestPath: string): Promise<JobWorkspace> {
+  const resolved = path.resolve(manifestPath);
+  const dir = path.dirname(resolved);
+  if (path.basename(resolved) !== MANIFEST_NAME || path.dirname(dir) !== JOBS_DIR) {
+    throw new Error(`Manifest must be ${path.join(JOBS_DIR, '<job>', MANIFEST_NAME)}, got ${manifestPath}`);
+  }
+  await fs.access(resolved);
+  const workspace = workspaceFor(dir);
+  await fs.mkdir(workspace.audioDir, { recursive: true });
+  return workspace;
+}
+
+export async function readManifest(workspace: JobWorkspace): Promise<any> {
+  try {
+    return JSON.parse(await fs.readFile(workspace.manifestPath, 'utf-8'));
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code === 'ENOENT') {
+      return {};
+    }
+    throw error;
+  }
+}
+
+/**
+ * Write the manifest atomically (temp file + rename), keeping the job id in it
+ */
+export async function writeManifest(workspace: JobWorkspace, data: any): Promise<string> {
+  const tempPath = `${workspace.manifestPath}.tmp`;
+  await fs.writeFile(tempPath, JSON.stringify({ ...data, jobId: workspace.id }, null, 2));
+  await fs.rename(tempPath, workspace.manifestPath);
+  return workspace.manifestPath;
+}
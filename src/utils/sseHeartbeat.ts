@@ -0,0 +1,20 @@
+import { Response } from 'express';
+
+// Render stages can go minutes without an event; clients drop a stream after SSE_IDLE_TIMEOUT (300s) of silence
+const HEARTBEAT_MS = Number(process.env.SSE_HEARTBEAT_SECONDS || 15) * 1000;
+
+/**
+ * Write an SSE comment line every HEARTBEAT_MS until the response ends,
+ * so a silent render stage doesn't look like a dead connection
+ */
+export function startHeartbeat(res: Response): () => void {
+  const timer = setInterval(() => {
+    if (!res.writableEnded) {
+      res.write(': heartbeat\n\n');
+    }
+  }, HEARTBEAT_MS);
+  const stop = () => clearInterval(timer);
+  res.on('finish', stop);
+  res.on('close', stop);
+  return stop;
+}
@@ -9,15 +9,20 @@ import { DemoGenerator } from '../demo/demo-generator';
 import { EventEmitter } from 'events';
 import { HardwareAcceleratedGenerator } from './HardwareAcceleratedGenerator';
 import { FileCleanup } from '../utils/cleanup';
-import { ttsClient } from '../services/TTSClient';
+import { ttsClient, TTSResult } from '../services/TTSClient';
 import { whisperTranscriber } from '../services/WhisperTranscriber';
 // import { createTikTokStyleCaptions } from '@remotion/captions';
 import { BrollDownloader } from '../services/BrollDownloader';
 import { ImprovedBrollFinder } from '../services/ImprovedBrollFinder';
 import { ViralBrollFinder } from '../services/ViralBrollFinder';
+import { createJobWorkspace, readManifest, writeManifest, JobWorkspace } from '../utils/jobWorkspace';
+import { Script } from '../types';
 
 const execAsync = promisify(exec);
 
+// TTS word timestamps at or above this confidence are used directly instead of running Whisper
+const WORD_TIMESTAMP_MIN_CONFIDENCE = parseFloat(process.env.WORD_TIMESTAMP_MIN_CONFIDENCE || '0.8');
+
 interface WordTiming {
   word: string;
   startTime: number;
@@ -59,8 +64,11 @@ export class SyncedVideoGenerator extends EventEmitter {
   private currentStep: number = 0;
   private targetDuration: number;
   private videoStyle: number;
+  // Workspace given by the caller (its manifest may carry the script); otherwise each run creates one
+  private jobWorkspace?: JobWorkspace;
+  private job!: JobWorkspace;
 
-  constructor(duration: number = 30, style: number = 1) {
+  constructor(duration: number = 30, style: number = 1, workspace?: JobWorkspace) {
     super();
     this.outputDir = path.join(process.cwd(), 'output', 'videos');
     this.audioDir = path.join(process.cwd(), 'output', 'audio');
@@ -68,6 +76,7 @@ export class SyncedVideoGenerator extends EventEmitter {
     this.hwAccel = new HardwareAcceleratedGenerator();
     this.targetDuration = duration; // Store target duration in seconds
     this.videoStyle = style; // Store selected style (1-6)
+    this.jobWorkspace = workspace;
     
     // Log hardware acceleration status
     const sysInfo = this.hwAccel.getSystemInfo();
@@ -127,6 +136,23 @@ export class SyncedVideoGenerator extends EventEmitter {
     });
   }
 
+  /**
+   * Captions from the word timestamps returned with the TTS audio, or null when they
+   * are missing or not confident enough and Whisper should run instead
+   */
+  private captionsFromTTS(result: Partial<TTSResult>): Caption[] | null {
+    if (!result.words?.length || (result.word_confidence ?? 0) < WORD_TIMESTAMP_MIN_CONFIDENCE) {
+      return null;
+    }
+    return result.words.map(w => ({
+      text: w.word,
+      startMs: Math.round(w.start * 1000),
+      endMs: Math.round(w.end * 1000),
+      timestampMs: Math.round(((w.start + w.end) / 2) * 1000),
+      confidence: w.confidence
+    }));
+  }
+
   private calculateWordTimings(text: string, segmentStartTime: number, segmentDuration: number): WordTiming[] {
     // Split text into words
     let words = text.split(/\s+/).filter(word => word.length > 0);
@@ -225,11 +251,21 @@ export class SyncedVideoGenerator extends EventEmitter {
       this.currentStep = 0;
       this.totalSteps = 5; // Total steps: script, audio, combine, video, merge
       
-      // 1. Generate script (step 1)
-      this.emitProgress(`Generating ${this.targetDuration}-second script content...`);
-      const idea = await this.demoGen.generateDemoIdea();
-      // Pass duration to script generator to adjust content length
-      const script = await this.demoGen.generateDemoScript(idea, this.targetDuration);
+      // Audio and render data go to the job's own directory, so parallel jobs don't overwrite each other
+      this.job = this.jobWorkspace || await createJobWorkspace('synced');
+      this.audioDir = this.job.audioDir;
+      const manifest = await readManifest(this.job);
+      
+      // 1. Generate script (step 1), unless the job's manifest already carries one
+      let script = this.scriptFromManifest(manifest);
+      if (script) {
+        this.emitProgress(`Using prepared script from job ${this.job.id}...`);
+      } else {
+        this.emitProgress(`Generating ${this.targetDuration}-second script content...`);
+        const idea = await this.demoGen.generateDemoIdea();
+        // Pass duration to script generator to adjust content length
+        script = await this.demoGen.generateDemoScript(idea, this.targetDuration);
+      }
 
       // currentStep is now 1 after script generation
       // const totalSegments = (script.hook ? 1 : 0) + script.content.length + (script.callToAction ? 1 : 0);
@@ -326,7 +362,7 @@ export class SyncedVideoGenerator extends EventEmitter {
         logger.warn('Batch TTS failed, falling back to individual generation:', error);
         this.emitProgress('Batch generation failed, using individual generation...');
         
-        const results = [];
+        const results: Pick<TTSResult, 'success' | 'output'>[] = [];
         for (let i = 0; i < batchItems.length; i++) {
           const item = batchItems[i];
           const textSegment = textSegments[i];
@@ -360,11 +396,12 @@ export class SyncedVideoGenerator extends EventEmitter {
       let currentTime = 0;
       
       for (let i = 0; i < batchResult.results.length; i++) {
-        const result = batchResult.results[i];
+        const result: Partial<TTSResult> & Pick<TTSResult, 'success' | 'output'> = batchResult.results[i];
         const textSegment = textSegments[i];
         
         if (!result.success) {
-          throw new Error(`Failed to generate audio for segment ${i}`);
+          // The server has already retried this item; what's left is a real failure
+          throw new Error(`Failed to generate audio for segment ${i}: ${result.error ?? 'unknown error'}${result.permanent ? ' (permanent)' : ''}`);
         }
         
         // Get duration of generated audio
@@ -375,12 +412,18 @@ export class SyncedVideoGenerator extends EventEmitter {
         let captions: Caption[] = [];
         
         try {
-          // Transcribe to get accurate timestamps with original text alignment
-          logger.info(`🎙️ Getting word timestamps for segment ${i+1} (using original text)...`);
-          const transcribedCaptions = await whisperTranscriber.transcribeWithOriginalText(
-            result.output,
-            textSegment.text
-          );
+          // The TTS server's own word timestamps are enough when it is confident in them
+          let transcribedCaptions = this.captionsFromTTS(result);
+          if (transcribedCaptions) {
+            logger.info(`⚡ Using TTS word timestamps for segment ${i+1} (confidence ${result.word_confidence}), skipping Whisper`);
+          } else {
+            // Transcribe to get accurate timestamps with original text alignment
+            logger.info(`🎙️ Getting word timestamps for segment ${i+1} (using original text)...`);
+            transcribedCaptions = await whisperTranscriber.transcribeWithOriginalText(
+              result.output,
+              textSegment.text
+            );
+          }
           
           // Convert captions to word timings (adjust to segment start time)
           // Check if captions have valid timestamps
@@ -405,7 +448,7 @@ export class SyncedVideoGenerator extends EventEmitter {
             throw new Error('Whisper returned captions without valid timestamps');
           }
           
-          logger.info(`✅ Got ${captions.length} word timestamps from Whisper`);
+          logger.info(`✅ Got ${captions.length} word timestamps`);
           
         } catch (whisperError) {
           // Fallback to estimation if Whisper fails
@@ -452,7 +495,7 @@ export class SyncedVideoGenerator extends EventEmitter {
         totalDuration: currentTime
       };
 
-      const timingFile = path.join(this.outputDir, `timing_${Date.now()}.json`);
+      const timingFile = path.join(this.job.dir, 'timing.json');
       await fs.writeFile(timingFile, JSON.stringify(syncedScript, null, 2));
       logger.info(`📝 Timing file created: ${timingFile}`);
 
@@ -530,6 +573,38 @@ export class SyncedVideoGenerator extends EventEmitter {
     }
   }
 
+  /**
+   * Script carried by the job's manifest (e.g. prepared by api-viral-generator.py), or null to generate one
+   */
+  private scriptFromManifest(manifest: any): Script | null {
+    const segments: any[] = Array.isArray(manifest.segments)
+      ? manifest.segments.filter((segment: any) => segment && segment.text)
+      : [];
+    if (segments.length === 0) {
+      return null;
+    }
+    
+    const now = new Date();
+    return {
+      id: this.job.id,
+      ideaId: manifest.metadata?.scriptId || this.job.id,
+      title: manifest.title || this.job.id,
+      hook: '',
+      content: segments.map(segment => ({
+        type: 'narration' as const,
+        content: segment.text,
+        startTime: segment.startTime || 0,
+        endTime: segment.endTime || 0
+      })),
+      callToAction: '',
+      duration: manifest.totalDuration || this.targetDuration,
+      wordCount: segments.map(segment => segment.text).join(' ').split(/\s+/).length,
+      language: 'en',
+      createdAt: now,
+      updatedAt: now
+    };
+  }
+
   private async generateAudioWithDuration(text: string, filename: string): Promise<{ file: string; duration: number }> {
     const outputPath = path.join(this.audioDir, filename);
     // Try GPU-accelerated script first, fallback to regular
@@ -774,9 +849,8 @@ export class SyncedVideoGenerator extends EventEmitter {
       brollVideos: brollRelativePaths
     };
     
-    // Save the synced script for Remotion to use
-    const dataPath = path.join(process.cwd(), 'src', 'remotion', 'synced-data.json');
-    await fs.writeFile(dataPath, JSON.stringify(syncedScriptWithStyle, null, 2));
+    // Record what is rendered in the job's manifest (Remotion itself gets it as inputProps)
+    await writeManifest(this.job, { ...(await readManifest(this.job)), ...syncedScriptWithStyle });
     
     const outputPath = path.join(this.outputDir, `synced_${Date.now()}.mp4`);
     
@@ -9,6 +9,7 @@ import { createLogger } from '../utils/logger';
 import { Script, Video } from '../types';
 import { ChatterboxTTS } from '../services/ChatterboxTTS';
 import { SubtitleGenerator } from './SubtitleGenerator';
+import { ttsClient } from '../services/TTSClient';
 import { videoConfig } from '../config';
 
 ffmpeg.setFfmpegPath(ffmpegInstaller.path);
@@ -87,6 +88,9 @@ export class VideoProducer {
   ): Promise<string> {
     this.logger.info('Rendering video with Remotion');
 
+    // Premix the music bed so Remotion only plays one audio stream
+    const premixedPath = await this.premixBackgroundMusic(script, audioPath, assets.backgroundMusic);
+
     const bundleLocation = await bundle({
       entryPoint: path.join(__dirname, 'remotion', 'index.ts'),
       webpackOverride: (config) => config,
@@ -118,8 +122,8 @@ export class VideoProducer {
           callToAction: script.callToAction,
         },
         template: this.selectTemplate(script),
-        audioUrl: audioPath,
-        backgroundMusic: 'energetic',
+        audioUrl: premixedPath || audioPath,
+        backgroundMusic: premixedPath ? null : 'energetic',
         subtitlesEnabled: true,
       },
       imageFormat: 'jpeg',
@@ -222,6 +226,29 @@ export class VideoProducer {
     });
   }
 
+  private async premixBackgroundMusic(
+    script: Script,
+    audioPath: string,
+    musicPath: string
+  ): Promise<string | null> {
+    try {
+      await fs.access(musicPath);
+    } catch {
+      return null;
+    }
+
+    const outputPath = path.join(path.dirname(audioPath), `${script.id}_premix.wav`);
+    try {
+      const result = await ttsClient.premix(audioPath, musicPath, outputPath);
+      this.logger.info(`Background music premixed (${result.speed?.toFixed(0)}x real time)`);
+      return result.output;
+    } catch (error) {
+      // Fall back to mixing in the renderer
+      this.logger.warn('Background music premix failed, mixing at render time:', error);
+      return null;
+    }
+  }
+
   private async combineAudioFiles(audioPaths: string[], outputPath: string): Promise<void> {
     await fs.mkdir(path.dirname(outputPath), { recursive: true });
 
@@ -2,6 +2,7 @@ import { EventEmitter } from 'events';
 import path from 'path';
 import fs from 'fs/promises';
 import { logger } from '../utils/logger';
+import { createJobWorkspace, readManifest, writeManifest, JobWorkspace } from '../utils/jobWorkspace';
 import { ViralBrollFinder } from '../services/ViralBrollFinder';
 import { exec } from 'child_process';
 import { promisify } from 'util';
@@ -32,10 +33,40 @@ export class ViralVideoProcessorDebug extends EventEmitter {
     this.outputDir = path.join(process.cwd(), 'output');
   }
 
+  /**
+   * Buscar B-roll para el script y copiarlo al directorio del job (broll/)
+   */
+  async collectBroll(viralScript: ViralScript, workspace: JobWorkspace): Promise<string[]> {
+    const viralFinder = new ViralBrollFinder();
+    const fullText = viralScript.hook + ' ' + viralScript.script + ' ' + (viralScript.cta || '');
+    
+    logger.info(`🎯 Buscando B-roll con ${viralScript.brollSearchTerms?.length || 0} términos personalizados`);
+    
+    const found = await viralFinder.findViralBroll(
+      fullText,
+      viralScript.duration,
+      viralScript.tags,
+      viralScript.brollSearchTerms
+    );
+    
+    const brollDir = path.join(workspace.dir, 'broll');
+    await fs.rm(brollDir, { recursive: true, force: true });
+    await fs.mkdir(brollDir, { recursive: true });
+    
+    const brollVideos = [];
+    for (const video of found) {
+      const destPath = path.join(brollDir, path.basename(video));
+      await fs.copyFile(video, destPath);
+      brollVideos.push(destPath);
+    }
+    return brollVideos;
+  }
+
   /**
    * Process viral script usando audios existentes (para debug)
+   * Con el workspace de un job de pipeline.py usa el audio, la transcripción y el B-roll de su manifiesto
    */
-  async processViralScriptWithExistingAudio(viralScript: ViralScript): Promise<string> {
+  async processViralScriptWithExistingAudio(viralScript: ViralScript, workspace?: JobWorkspace): Promise<string> {
     try {
       logger.info(`🔧 [DEBUG MODE] Processing viral video: ${viralScript.title}`);
       
@@ -44,73 +75,72 @@ export class ViralVideoProcessorDebug extends EventEmitter {
         message: '🔍 Verificando audios existentes...'
       });
       
-      // Verificar que exista el audio combinado
-      const audioDir = path.join(this.outputDir, 'audio');
-      const audioFiles = await fs.readdir(audioDir);
-      const combinedAudio = audioFiles.find(f => f.includes('combined') && f.endsWith('.wav'));
-      
-      if (!combinedAudio) {
-        throw new Error('No se encontró audio combinado en output/audio/');
+      const manifest = workspace ? await readManifest(workspace) : {};
+      const job = workspace || await createJobWorkspace('debug');
+      
+      let audioPath: string;
+      if (manifest.audioPath) {
+        // Audio combinado del propio job
+        audioPath = path.resolve(job.dir, manifest.audioPath);
+        await fs.access(audioPath);
+      } else {
+        // Verificar que exista el audio combinado
+        const audioDir = path.join(this.outputDir, 'audio');
+        const audioFiles = await fs.readdir(audioDir);
+        const combinedAudio = audioFiles.find(f => f.includes('combined') && f.endsWith('.wav'));
+        
+        if (!combinedAudio) {
+          throw new Error('No se encontró audio combinado en output/audio/');
+        }
+        audioPath = path.join(audioDir, combinedAudio);
       }
       
-      const audioPath = path.join(audioDir, combinedAudio);
-      logger.info(`✅ Usando audio existente: ${combinedAudio}`);
+      logger.info(`✅ Usando audio existente: ${audioPath}`);
       
       this.emit('progress', {
         progress: 20,
         message: '🎵 Audio encontrado, preparando B-roll...'
       });
       
-      // Paso 1: Buscar/generar B-roll
-      const viralFinder = new ViralBrollFinder();
-      const fullText = viralScript.hook + ' ' + viralScript.script + ' ' + (viralScript.cta || '');
-      
-      logger.info(`🎯 Buscando B-roll con ${viralScript.brollSearchTerms?.length || 0} términos personalizados`);
-      
-      const brollVideos = await viralFinder.findViralBroll(
-        fullText,
-        viralScript.duration,
-        viralScript.tags,
-        viralScript.brollSearchTerms
-      );
+      // Paso 1: Buscar/generar B-roll (o usar el que ya trae el job)
+      const brollVideos: string[] = Array.isArray(manifest.brollVideos)
+        ? manifest.brollVideos.map((video: string) => path.resolve(job.dir, video))
+        : await this.collectBroll(viralScript, job);
       
       this.emit('progress', {
         progress: 40,
         message: `📹 ${brollVideos.length} videos de B-roll encontrados`
       });
       
-      // Paso 2: Copiar B-roll a public para Remotion
-      const publicBrollDir = path.join(process.cwd(), 'public', 'broll');
+      // Paso 2: Copiar B-roll a public/broll/<job> para Remotion (sin tocar el de otros jobs)
+      const publicBrollDir = path.join(process.cwd(), 'public', 'broll', job.id);
       await fs.mkdir(publicBrollDir, { recursive: true });
       
-      // Limpiar archivos antiguos
-      const existingFiles = await fs.readdir(publicBrollDir);
-      for (const file of existingFiles) {
-        await fs.unlink(path.join(publicBrollDir, file)).catch(() => {});
-      }
-      
-      // Copiar nuevos archivos
       const brollPaths = [];
       for (const video of brollVideos) {
         const filename = path.basename(video);
-        const destPath = path.join(publicBrollDir, filename);
-        await fs.copyFile(video, destPath);
-        brollPaths.push(`/broll/${filename}`);
+        await fs.copyFile(video, path.join(publicBrollDir, filename));
+        brollPaths.push(`/broll/${job.id}/${filename}`);
       }
       
-      logger.info(`✅ B-roll copiado a public/broll: ${brollPaths.length} archivos`);
+      logger.info(`✅ B-roll copiado a ${publicBrollDir}: ${brollPaths.length} archivos`);
       
       this.emit('progress', {
         progress: 50,
         message: '📝 Preparando datos de sincronización...'
       });
       
-      // Paso 3: Crear datos de sincronización desde los JSONs existentes
-      const syncedData = await this.createSyncedDataFromExisting(viralScript, audioPath, brollPaths);
+      // Paso 3: Crear datos de sincronización (transcripción del job o JSONs existentes)
+      const syncedData = Array.isArray(manifest.words) && manifest.words.length > 0
+        ? { ...manifest, brollVideos: brollPaths }
+        : await this.createSyncedDataFromExisting(viralScript, audioPath, brollPaths);
       
-      // Guardar datos para Remotion
-      const syncDataPath = path.join(process.cwd(), 'src', 'remotion', 'synced-data.json');
-      await fs.writeFile(syncDataPath, JSON.stringify(syncedData, null, 2));
+      // Guardar datos para Remotion en el manifiesto de este job (Neon style para debug salvo que el job traiga otro)
+      const compositionProps = this.toCompositionProps({ style: 3, ...syncedData });
+      if (compositionProps.segments[0].wordTimings.length === 0) {
+        throw new Error('No hay palabras con tiempos para los subtítulos');
+      }
+      await writeManifest(job, compositionProps);
       
       logger.info('✅ Datos de sincronización guardados');
       
@@ -120,11 +150,9 @@ export class ViralVideoProcessorDebug extends EventEmitter {
       });
       
       // Paso 4: Renderizar con Remotion (SIN audio)
-      const tempVideoPath = path.join(this.outputDir, `temp_video_${Date.now()}.mp4`);
+      const tempVideoPath = path.join(job.dir, 'temp_video.mp4');
       
-      const command = `npx remotion render src/remotion/index.tsx WordByWordFinal "${tempVideoPath}" --props='${JSON.stringify({
-        style: 3 // Neon style para debug
-      })}'`;
+      const command = `npx remotion render src/remotion/index.tsx WordByWordFinal "${tempVideoPath}" --props="${job.manifestPath}"`;
       
       logger.info(`🎬 Ejecutando: ${command}`);
       
@@ -142,6 +170,8 @@ export class ViralVideoProcessorDebug extends EventEmitter {
       } catch (execError: any) {
         logger.error(`Remotion execution failed:`, execError);
         throw new Error(`Failed to render video: ${execError.message}`);
+      } finally {
+        await fs.rm(publicBrollDir, { recursive: true, force: true });
       }
       
       this.emit('progress', {
@@ -150,7 +180,9 @@ export class ViralVideoProcessorDebug extends EventEmitter {
       });
       
       // Paso 5: Merge audio con video usando ffmpeg
-      const finalVideoPath = path.join(this.outputDir, `viral_debug_${viralScript.id}_${Date.now()}.mp4`);
+      const finalVideoPath = workspace
+        ? path.join(job.dir, 'video.mp4')
+        : path.join(this.outputDir, `viral_debug_${viralScript.id}_${Date.now()}.mp4`);
       
       const mergeCommand = `ffmpeg -i "${tempVideoPath}" -i "${audioPath}" -c:v copy -c:a aac -b:a 192k -ar 44100 -ac 2 -map 0:v:0 -map 1:a:0 -shortest "${finalVideoPath}" -y`;
       
@@ -192,6 +224,44 @@ export class ViralVideoProcessorDebug extends EventEmitter {
     }
   }
   
+  /**
+   * Props de WordByWordFinal (segments con wordTimings, totalDuration, videoStyle) a partir de los
+   * datos de sincronización (words, duration, style), que se conservan para pipeline.py
+   */
+  private toCompositionProps(data: any): any {
+    const fps = 30;
+    const words: any[] = data.words || [];
+    const totalDuration = data.duration || (words.length > 0 ? words[words.length - 1].end : 0);
+    const wordTimings = words.map((word) => ({
+      word: word.word,
+      startTime: word.start,
+      endTime: word.end,
+      startFrame: Math.floor(word.start * fps),
+      endFrame: Math.floor(word.end * fps)
+    }));
+    
+    return {
+      ...data,
+      totalDuration,
+      videoStyle: Number(data.style) || 1,
+      segments: [{
+        text: data.text || words.map((word) => word.word).join(' '),
+        audioFile: data.audioPath,
+        duration: totalDuration,
+        startTime: 0,
+        endTime: totalDuration,
+        wordTimings,
+        captions: words.map((word) => ({
+          text: word.word,
+          startMs: Math.round(word.start * 1000),
+          endMs: Math.round(word.end * 1000),
+          timestampMs: Math.round(((word.start + word.end) / 2) * 1000),
+          confidence: word.confidence ?? null
+        }))
+      }]
+    };
+  }
+  
   /**
    * Crear datos de sincronización desde archivos existentes
    */
@@ -34,7 +34,8 @@ interface YouTubeShortProps {
   };
   template: 'trending' | 'facts' | 'storytime' | 'lifehacks';
   audioUrl: string | null;
-  backgroundMusic: 'energetic' | 'calm' | 'mysterious' | 'upbeat';
+  // null when the music is already premixed into audioUrl
+  backgroundMusic: 'energetic' | 'calm' | 'mysterious' | 'upbeat' | null;
   subtitlesEnabled?: boolean;
 }
 
@@ -104,7 +105,7 @@ export const YouTubeShort: React.FC<YouTubeShortProps> = ({
 
       {/* Audio Elements */}
       {audioUrl && <Audio src={audioUrl} />}
-      <BackgroundMusic type={backgroundMusic} volume={0.3} />
+      {backgroundMusic && <BackgroundMusic type={backgroundMusic} volume={0.3} />}
     </AbsoluteFill>
   );
 };
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Server-Sent Events client shared by the Python CLIs
+One pooled keep-alive session per process (requests for sync code, aiohttp for
+asyncio code), an incremental decoder that handles events split across chunks,
+an idle timeout instead of a flat request timeout, and reconnection with
+Last-Event-ID when the server names the job behind the stream (Idempotency-Key
+response header): a dropped stream resumes from /api/jobs/<key>/events rather
+than sending the original request again, which would start a second job.
+Streams without that header are not resumed. Endpoints that answer
+with a plain JSON document instead of a stream yield it as a single event.
+
+Generations can be submitted with an idempotency key (job_events): if the
+server already has a job with that key, running or finished, the client
+reattaches to it through /api/jobs/<key>/events instead of starting another.
+
+Usage:
+    from sse_client import sse
+    for data in sse.json_events('GET', 'http://localhost:3000/api/video/generate-synced'):
+        print(data['type'])
+
+    key = idempotency_key(script['id'], endpoint='generate-synced', duration=30, style=1)
+    for data in sse.job_events('GET', f'{API_URL}/api/video/generate-synced?duration=30&style=1', key):
+        ...
+"""
+import asyncio
+import codecs
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+
+# Seconds without any bytes (events or ":" heartbeat comments) before a stream counts as dead
+IDLE_TIMEOUT = float(os.environ.get('SSE_IDLE_TIMEOUT', 300))
+CONNECT_TIMEOUT = float(os.environ.get('SSE_CONNECT_TIMEOUT', 10))
+
+# Reconnects per stream, only attempted when the server named the job to resume
+MAX_RECONNECTS = int(os.environ.get('SSE_MAX_RECONNECTS', 3))
+RECONNECT_DELAY = 1.0
+
+# Pooled connections per host (several concurrent streams plus health checks)
+POOL_SIZE = 10
+
+# Only CR, LF and CRLF end lines (str.splitlines would also split JSON containing U+2028)
+LINE_END = re.compile(r'\r\n|\r|\n')
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+class SSEError(Exception):
+    """A stream that could not be opened or finished"""
+
+
+class SSEHTTPError(SSEError):
+    """The server answered with a non-2xx status instead of a stream"""
+
+    def __init__(self, status, body=''):
+        super().__init__(f"HTTP {status}: {body[:200]}")
+        self.status = status
+        self.body = body
+
+
+class SSEIdleTimeout(SSEError, TimeoutError):
+    """No data arrived within the idle timeout"""
+
+
+class Event:
+    """One dispatched event"""
+
+    def __init__(self, data, event='message', id=None):
+        self.data = data
+        self.event = event
+        self.id = id
+
+    def json(self):
+        return json.loads(self.data)
+
+    def __repr__(self):
+        return f"Event(event={self.event!r}, id={self.id!r}, data={self.data[:60]!r})"
+
+
+class SSEDecoder:
+    """Incremental text/event-stream parser: feed() bytes as they arrive, get complete events back"""
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._pending = ''
+        self._skip_lf = False
+        self._data = []
+        self._event = ''
+        self._id = None
+        self.last_event_id = None
+        self.retry = None
+
+    def feed(self, chunk):
+        text = self._text.decode(chunk)
+        if self._skip_lf and text.startswith('\n'):
+            # Second half of a CRLF split across chunks
+            text = text[1:]
+        self._skip_lf = text.endswith('\r')
+
+        lines = LINE_END.split(self._pending + text)
+        # The last piece has no line ending yet
+        self._pending = lines.pop()
+
+        events = []
+        for line in lines:
+            event = self._line(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _line(self, line):
+        if not line:
+            return self._dispatch()
+        if line.startswith(':'):
+            # Comment, typically a heartbeat
+            return None
+        field, _, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+        if field == 'data':
+            self._data.append(value)
+        elif field == 'event':
+            self._event = value
+        elif field == 'id' and '\0' not in value:
+            self._id = value
+        elif field == 'retry' and value.isdigit():
+            self.retry = int(value) / 1000
+        return None
+
+    def _dispatch(self):
+        if self._id is not None:
+            self.last_event_id = self._id
+        if not self._data:
+            self._event = ''
+            return None
+        event = Event('\n'.join(self._data), self._event or 'message', self.last_event_id)
+        self._data, self._event = [], ''
+        return event
+
+
+def _request_headers(last_event_id, headers=None):
+    merged = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache', **(headers or {})}
+    if last_event_id is not None:
+        merged['Last-Event-ID'] = last_event_id
+    return merged
+
+
+def _is_idle_timeout(error):
+    # requests wraps a read timeout during iter_content in ConnectionError
+    return isinstance(error, requests.ReadTimeout) or bool(error.args) and isinstance(error.args[0], ReadTimeoutError)
+
+
+def idempotency_key(script_id, regenerate=False, **params):
+    """Same script and parameters → same key, so a resubmission reattaches; regenerate=True forces a new job"""
+    if regenerate:
+        params['regenerated_at'] = datetime.now().isoformat()
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+    return f"{re.sub(r'[^A-Za-z0-9_.:-]', '_', str(script_id))[:100]}-{digest}"
+
+
+def _job_events_url(url, key):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/api/jobs/{key}/events"
+
+
+def _idempotent_headers(key, headers=None):
+    return {**(headers or {}), IDEMPOTENCY_HEADER: key}
+
+
+def _connection(method, url, json, params, job_url):
+    """Method, URL, body and query of the next connection: the original request, or the job's event stream"""
+    if job_url:
+        return 'GET', job_url, None, None
+    return method, url, json, params
+
+
+def _decode_json(events):
+    for event in events:
+        try:
+            yield event.json()
+        except ValueError:
+            pass
+
+
+class SSEClient:
+    """Blocking SSE client on a pooled requests session"""
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_reconnects=MAX_RECONNECTS):
+        self.idle_timeout = idle_timeout
+        self.max_reconnects = max_reconnects
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        """Plain request on the shared session (health checks, JSON endpoints)"""
+        kwargs.setdefault('timeout', (CONNECT_TIMEOUT, self.idle_timeout))
+        return self.session.request(method, url, **kwargs)
+
+    def events(self, method, url, json=None, params=None, headers=None):
+        """Yield Events from a stream, resuming with Last-Event-ID after a dropped connection"""
+        decoder = SSEDecoder()
+        reconnects = 0
+        job_url = None
+        while True:
+            request_method, request_url, body, query = _connection(method, url, json, params, job_url)
+            try:
+                with self.session.request(
+                    request_method, request_url, json=body, params=query,
+                    headers=_request_headers(decoder.last_event_id, headers),
+                    stream=True, timeout=(CONNECT_TIMEOUT, self.idle_timeout)
+                ) as response:
+                    if not 200 <= response.status_code < 300:
+                        raise SSEHTTPError(response.status_code, response.text)
+                    if response.headers.get(IDEMPOTENCY_HEADER):
+                        job_url = _job_events_url(url, response.headers[IDEMPOTENCY_HEADER])
+                    if response.headers.get('Content-Type', '').startswith('application/json'):
+                        yield Event(response.text, 'json')
+                        return
+                    for chunk in response.iter_content(chunk_size=None):
+                        for event in decoder.feed(chunk):
+                            reconnects = 0
+                            yield event
+                return
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                # Without a job to reattach to, reconnecting would start the generation again
+                if job_url is None or reconnects >= self.max_reconnects:
+                    if _is_idle_timeout(e):
+                        raise SSEIdleTimeout(f"No data from {url} for {self.idle_timeout:.0f}s") from e
+                    raise
+                reconnects += 1
+                time.sleep(decoder.retry or RECONNECT_DELAY * reconnects)
+
+    def json_events(self, method, url, **kwargs):
+        """Yield the JSON payload of each event, skipping events that aren't JSON"""
+        return _decode_json(self.events(method, url, **kwargs))
+
+    def job_events(self, method, url, key, headers=None, **kwargs):
+        """json_events of an idempotent submission: reattach to the job with this key if the server has one"""
+        try:
+            yield from self.json_events('GET', _job_events_url(url, key))
+            return
+        except SSEHTTPError as e:
+            # 404: no such job yet (or a server without /api/jobs), so submit it
+            if e.status != 404:
+                raise
+        yield from self.json_events(method, url, headers=_idempotent_headers(key, headers), **kwargs)
+
+
+class AsyncSSEClient:
+    """asyncio SSE client on a pooled aiohttp session; use with `async with`"""
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_reconnects=MAX_RECONNECTS, pool_size=POOL_SIZE):
+        self.idle_timeout = idle_timeout
+        self.max_reconnects = max_reconnects
+        self.pool_size = pool_size
+        self.session = None
+
+    async def __aenter__(self):
+        import aiohttp
+
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT, sock_read=self.idle_timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def events(self, method, url, json=None, params=None, headers=None):
+        """Yield Events from a stream, resuming with Last-Event-ID after a dropped connection"""
+        import aiohttp
+
+        decoder = SSEDecoder()
+        reconnects = 0
+        job_url = None
+        while True:
+            request_method, request_url, body, query = _connection(method, url, json, params, job_url)
+            try:
+                async with self.session.request(
+                    request_method, request_url, json=body, params=query,
+                    headers=_request_headers(decoder.last_event_id, headers)
+                ) as response:
+                    if not 200 <= response.status < 300:
+                        raise SSEHTTPError(response.status, await response.text())
+                    if response.headers.get(IDEMPOTENCY_HEADER):
+                        job_url = _job_events_url(url, response.headers[IDEMPOTENCY_HEADER])
+                    if response.content_type == 'application/json':
+                        yield Event(await response.text(), 'json')
+                        return
+                    async for chunk in response.content.iter_any():
+                        for event in decoder.feed(chunk):
+                            reconnects = 0
+                            yield event
+                return
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                if job_url is None or reconnects >= self.max_reconnects:
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise SSEIdleTimeout(f"No data from {url} for {self.idle_timeout:.0f}s") from e
+                    raise
+                reconnects += 1
+                await asyncio.sleep(decoder.retry or RECONNECT_DELAY * reconnects)
+
+    async def json_events(self, method, url, **kwargs):
+        """Yield the JSON payload of each event, skipping events that aren't JSON"""
+        async for event in self.events(method, url, **kwargs):
+            try:
+                yield event.json()
+            except ValueError:
+                pass
+
+    async def job_events(self, method, url, key, headers=None, **kwargs):
+        """json_events of an idempotent submission: reattach to the job with this key if the server has one"""
+        try:
+            async for data in self.json_events('GET', _job_events_url(url, key)):
+                yield data
+            return
+        except SSEHTTPError as e:
+            if e.status != 404:
+                raise
+        async for data in self.json_events(method, url, headers=_idempotent_headers(key, headers), **kwargs):
+            yield data
+
+
+# Shared blocking client, so one CLI run reuses its connections
+sse = SSEClient()
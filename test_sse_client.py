@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Reconnection tests for sse_client against a stand-in for src/utils/jobRegistry.ts
+The stand-in starts a job per submission (named in the Idempotency-Key response
+header, like a job started without a key), drops the first stream halfway and
+serves the rest from /api/jobs/<key>/events.
+
+Run: python3 -m pytest test_sse_client.py
+"""
+import asyncio
+import json
+import socket
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import sse_client
+from sse_client import AsyncSSEClient, SSEClient
+
+EVENTS = [{"type": "progress", "step": step} for step in range(1, 4)] + [{"type": "complete", "videoPath": "out.mp4"}]
+DROP_AFTER = 2
+MAX_JOBS = 3
+
+
+class JobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, name_jobs=True):
+        super().__init__(('127.0.0.1', 0), JobHandler)
+        self.name_jobs = name_jobs
+        self.jobs = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _start_stream(self, key):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        if key:
+            self.send_header('Idempotency-Key', key)
+        self.end_headers()
+
+    def _send_events(self, after, until):
+        for index, data in enumerate(EVENTS[:until], 1):
+            if index > after:
+                self._chunk(f"id: {index}\ndata: {json.dumps(data)}\n\n")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if len(self.server.jobs) >= MAX_JOBS:
+            # A client that keeps resubmitting would otherwise loop forever
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        # A submission always starts a new job, as serveJob does without a key
+        key = str(uuid.uuid4())
+        self.server.jobs.append(key)
+        self._start_stream(key if self.server.name_jobs else None)
+        # The client's ids belong to another job, so a new one streams from the start
+        self._send_events(0, DROP_AFTER)
+        # Connection lost mid-job: no terminating chunk
+        self.close_connection = True
+        self.connection.shutdown(socket.SHUT_RDWR)
+
+    def do_GET(self):
+        key = self.path.split('/')[3] if self.path.startswith('/api/jobs/') else None
+        if key not in self.server.jobs:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._start_stream(key)
+        self._send_events(int(self.headers.get('Last-Event-ID') or 0), len(EVENTS))
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def server(request):
+    job_server = JobServer(getattr(request, 'param', True))
+    thread = threading.Thread(target=job_server.serve_forever, daemon=True)
+    thread.start()
+    yield job_server
+    job_server.shutdown()
+    job_server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr(sse_client, 'RECONNECT_DELAY', 0.01)
+
+
+def test_dropped_unkeyed_stream_resumes_the_same_job(server):
+    events = list(SSEClient().json_events('POST', f"{server.url}/api/video/generate", json={"duration": 30}))
+    assert events == EVENTS
+    assert len(server.jobs) == 1
+
+
+@pytest.mark.parametrize('server', [False], indirect=True)
+def test_dropped_stream_without_a_job_name_is_not_resubmitted(server):
+    received = []
+    with pytest.raises(requests.RequestException):
+        for data in SSEClient().json_events('POST', f"{server.url}/api/video/generate", json={"duration": 30}):
+            received.append(data)
+    assert received == EVENTS[:DROP_AFTER]
+    assert len(server.jobs) == 1
+
+
+def test_async_dropped_unkeyed_stream_resumes_the_same_job(server):
+    pytest.importorskip('aiohttp')
+
+    async def collect():
+        async with AsyncSSEClient() as client:
+            return [data async for data in client.json_events('POST', f"{server.url}/api/video/generate", json={})]
+
+    assert asyncio.run(collect()) == EVENTS
+    assert len(server.jobs) == 1
@@ -6,10 +6,17 @@ import sys
 import json
 import time
 import asyncio
-import aiohttp
+import subprocess
 from datetime import datetime
 from pathlib import Path
 
+import requests
+
+import script_store
+from artifact_catalog import record_artifacts
+from pipeline import Pipeline, PipelineError, workspace_for
+from sse_client import SSEHTTPError, SSEIdleTimeout
+
 # Colores para la consola
 class Colors:
     RESET = '\033[0m'
@@ -26,29 +33,14 @@ def log(message, color=Colors.RESET):
     print(f"{color}[{timestamp}] {message}{Colors.RESET}")
 
 def load_script_data(script_id):
-    """Cargar datos del script desde archivo JSON"""
-    scripts_path = Path("data/viral-scripts.json")
-    
-    if not scripts_path.exists():
-        log(f"❌ No se encontró {scripts_path}", Colors.RED)
-        return None
-    
-    with open(scripts_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Buscar el script por ID
-    all_scripts = []
-    for channel in ['channel1_psychology', 'channel2_horror']:
-        all_scripts.extend(data.get(channel, []))
-    
-    for script in all_scripts:
-        if script.get('id') == script_id:
-            return script
-    
-    return None
+    """Cargar datos del script por ID desde el script store"""
+    script = script_store.load_script(script_id)
+    if script is None:
+        log(f"❌ Script {script_id} no encontrado en {script_store.DB_PATH} ni en data/viral-scripts.json", Colors.RED)
+    return script
 
 async def continue_video_generation(script_id=None):
-    """Continuar generación desde audios ya creados"""
+    """Continuar la generación de un script desde su último checkpoint válido (ver pipeline.py)"""
     
     log("=" * 60, Colors.CYAN)
     log("🎬 CONTINUANDO GENERACIÓN DE VIDEO VIRAL", Colors.BOLD)
@@ -69,122 +61,63 @@ async def continue_video_generation(script_id=None):
     log(f"   Duración: {script_data['duration']}s", Colors.BLUE)
     log(f"   Términos B-roll: {len(script_data.get('brollSearchTerms', []))}", Colors.BLUE)
     
-    # Verificar archivos de audio existentes
-    audio_dir = Path("output/audio")
-    if not audio_dir.exists():
-        log("❌ No se encontró el directorio de audio", Colors.RED)
-        return False
-    
-    audio_files = list(audio_dir.glob("*.wav"))
-    json_files = list(audio_dir.glob("*.json"))
+    # Retomar el último job de este script (o empezar uno): las etapas con checkpoint válido se saltan
+    workspace = workspace_for(script_id)
+    pipeline = Pipeline(workspace, script_id, on_event=log_pipeline_event)
     
-    log(f"\n📂 Archivos encontrados:", Colors.CYAN)
-    log(f"   • Audios WAV: {len(audio_files)}", Colors.GREEN)
-    log(f"   • Transcripciones JSON: {len(json_files)}", Colors.GREEN)
+    log(f"\n📂 Job: {workspace.id}", Colors.CYAN)
+    for stage, valid in pipeline.status().items():
+        log(f"   {'✅' if valid else '⏳'} {stage}", Colors.GREEN if valid else Colors.YELLOW)
     
-    # Verificar audio combinado
-    combined_audio = None
-    for audio_file in audio_files:
-        if "combined" in audio_file.name:
-            combined_audio = audio_file
-            break
-    
-    if not combined_audio:
-        log("❌ No se encontró el audio combinado", Colors.RED)
-        return False
-    
-    log(f"✅ Audio combinado: {combined_audio.name}", Colors.GREEN)
-    
-    # Preparar datos para la API
-    viral_script = {
-        "id": script_data["id"],
-        "title": script_data["title"],
-        "hook": script_data["hook"],
-        "script": script_data["script"],
-        "cta": script_data["cta"],
-        "tags": script_data["tags"],
-        "duration": script_data["duration"],
-        "brollSearchTerms": script_data.get("brollSearchTerms", [])
-    }
-    
-    # Paso 3: Generar video con la API
     log("\n" + "=" * 60, Colors.YELLOW)
-    log("📹 PASO 3: GENERANDO VIDEO", Colors.BOLD)
+    log("📹 GENERANDO VIDEO (desde la primera etapa pendiente)", Colors.BOLD)
     log("=" * 60, Colors.YELLOW)
     
     try:
-        async with aiohttp.ClientSession() as session:
-            # Usar el endpoint de debug para pruebas rápidas
-            url = "http://localhost:3000/api/viral-debug/generate"
-            
-            log(f"🔗 Enviando a: {url} [DEBUG MODE]", Colors.CYAN)
-            log(f"📊 Datos del script:", Colors.BLUE)
-            log(f"   • ID: {viral_script['id']}", Colors.BLUE)
-            log(f"   • Título: {viral_script['title'][:50]}...", Colors.BLUE)
-            log(f"   • Duración: {viral_script['duration']}s", Colors.BLUE)
-            log(f"   • B-roll términos: {len(viral_script['brollSearchTerms'])}", Colors.BLUE)
-            
-            # Enviar solicitud con el script viral (el debug processor usará los audios existentes)
-            async with session.post(
-                url,
-                json={
-                    "viralScript": viral_script
-                },
-                timeout=aiohttp.ClientTimeout(total=1800)  # 30 minutos timeout
-            ) as response:
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    log(f"❌ Error del servidor: {error_text}", Colors.RED)
-                    return False
-                
-                # Leer respuesta con Server-Sent Events
-                async for line in response.content:
-                    line = line.decode('utf-8').strip()
-                    if line.startswith('data: '):
-                        try:
-                            data = json.loads(line[6:])
-                            
-                            if data.get('type') == 'progress':
-                                progress = data.get('progress', 0)
-                                message = data.get('message', '')
-                                log(f"   [{progress}%] {message}", Colors.CYAN)
-                            
-                            elif data.get('type') == 'complete':
-                                video_path = data.get('videoPath', '')
-                                log(f"\n✅ Video generado exitosamente!", Colors.GREEN)
-                                log(f"📹 Ubicación: {video_path}", Colors.GREEN)
-                                
-                                # Guardar resultado
-                                result_file = Path(f"output/viral_result_{script_id}_{int(time.time())}.json")
-                                with open(result_file, 'w', encoding='utf-8') as f:
-                                    json.dump({
-                                        "script_id": script_id,
-                                        "video_path": video_path,
-                                        "timestamp": datetime.now().isoformat(),
-                                        "duration": viral_script["duration"],
-                                        "audio_used": str(combined_audio)
-                                    }, f, indent=2, ensure_ascii=False)
-                                
-                                log(f"💾 Resultado guardado en: {result_file}", Colors.GREEN)
-                                return True
-                            
-                            elif data.get('type') == 'error':
-                                log(f"❌ Error: {data.get('message', 'Error desconocido')}", Colors.RED)
-                                return False
-                                
-                        except json.JSONDecodeError:
-                            pass
-    
-    except asyncio.TimeoutError:
-        log("❌ Timeout al generar el video (30 minutos)", Colors.RED)
+        # El pipeline es síncrono (requests / SSEClient); no bloquear el event loop
+        manifest = await asyncio.to_thread(pipeline.run)
+    except (PipelineError, requests.RequestException, subprocess.CalledProcessError) as e:
+        log(f"❌ {e}", Colors.RED)
+        log("   Vuelve a ejecutar el mismo comando para retomar desde la etapa fallida", Colors.YELLOW)
         return False
-    except Exception as e:
-        log(f"❌ Error al generar video: {str(e)}", Colors.RED)
+    except SSEHTTPError as e:
+        log(f"❌ Error del servidor: {e.body}", Colors.RED)
+        return False
+    except SSEIdleTimeout as e:
+        log(f"❌ El servidor dejó de responder: {e}", Colors.RED)
         return False
     
+    video_path = workspace.path(next(iter(pipeline.checkpoints.stages['render']['outputs'])))
+    log(f"\n✅ Video generado exitosamente!", Colors.GREEN)
+    log(f"📹 Ubicación: {video_path}", Colors.GREEN)
+    
+    # Guardar resultado
+    result_file = Path(f"output/viral_result_{script_id}_{int(time.time())}.json")
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            "script_id": script_id,
+            "job_id": workspace.id,
+            "video_path": video_path,
+            "timestamp": datetime.now().isoformat(),
+            "duration": manifest.get("duration", script_data["duration"]),
+            "audio_used": workspace.path(manifest["audioPath"])
+        }, f, indent=2, ensure_ascii=False)
+    record_artifacts({str(result_file): 'metadata'}, job_id=workspace.id, script_id=script_id)
+    
+    log(f"💾 Resultado guardado en: {result_file}", Colors.GREEN)
     return True
 
+def log_pipeline_event(event):
+    """Eventos de pipeline.Pipeline en el formato de log de este script"""
+    if event['type'] == 'skip':
+        log(f"⏭️  {event['stage']}: checkpoint válido, se omite", Colors.BLUE)
+    elif event['type'] == 'start':
+        log(f"▶️  {event['stage']}...", Colors.CYAN)
+    elif event['type'] == 'done':
+        log(f"✅ {event['stage']} completado", Colors.GREEN)
+    elif event['type'] == 'progress':
+        log(f"   [{event['progress']}%] {event['message']}", Colors.CYAN)
+
 async def main():
     """Función principal"""
     
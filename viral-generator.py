@@ -4,12 +4,14 @@ Generador de Videos Virales - Cliente Final
 Usa los endpoints dedicados para contenido viral
 """
 
-import requests
 import json
+import os
 import sys
 import time
 from datetime import datetime
 
+from sse_client import SSEHTTPError, idempotency_key, sse
+
 # Colores ANSI
 class Colors:
     HEADER = '\033[95m'
@@ -24,14 +26,15 @@ class Colors:
     END = '\033[0m'
 
 class ViralVideoClient:
-    def __init__(self, base_url='http://localhost:3000'):
+    def __init__(self, base_url=os.environ.get('API_URL', 'http://localhost:3000'), regenerate=False):
         self.base_url = base_url
+        self.regenerate = regenerate
         self.scripts = None
         
     def check_server(self):
         """Verificar que el servidor esté activo"""
         try:
-            response = requests.get(f'{self.base_url}/health', timeout=2)
+            response = sse.request('GET', f'{self.base_url}/health', timeout=2)
             return response.status_code == 200
         except:
             return False
@@ -39,7 +42,7 @@ class ViralVideoClient:
     def load_scripts(self):
         """Cargar scripts virales desde el servidor"""
         try:
-            response = requests.get(f'{self.base_url}/api/viral/scripts')
+            response = sse.request('GET', f'{self.base_url}/api/viral/scripts')
             if response.status_code == 200:
                 self.scripts = response.json()
                 return True
@@ -118,75 +121,68 @@ class ViralVideoClient:
         
         try:
             # Usar endpoint con SSE para progreso
-            response = requests.get(
-                f'{self.base_url}/api/viral/generate/{script_id}',
-                stream=True,
-                timeout=1200
-            )
+            url = f'{self.base_url}/api/viral/generate/{script_id}'
             
-            if response.status_code == 404:
-                print(f"{Colors.RED}Script no encontrado{Colors.END}")
-                return False
+            # La misma clave para el mismo script: si se corta la conexión, volver a ejecutar
+            # se reengancha al job del servidor en lugar de renderizar otra vez
+            key = idempotency_key(script_id, self.regenerate, endpoint='viral/generate')
             
             # Procesar eventos SSE
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        try:
-                            data = json.loads(line[6:])
-                            
-                            if data['type'] == 'start':
-                                print(f"\n{Colors.GREEN}{data['message']}{Colors.END}")
-                                if 'script' in data:
-                                    script = data['script']
-                                    print(f"{Colors.YELLOW}Duración: {script['duration']}s{Colors.END}")
-                                    print(f"{Colors.YELLOW}Views esperadas: {script['expectedViews']}{Colors.END}")
-                                
-                            elif data['type'] == 'progress':
-                                progress = data.get('progress', 0)
-                                message = data.get('message', '')
-                                bar_width = 50
-                                filled = int(bar_width * progress / 100)
-                                bar = '█' * filled + '░' * (bar_width - filled)
-                                
-                                # Color según progreso
-                                if progress < 30:
-                                    color = Colors.RED
-                                elif progress < 70:
-                                    color = Colors.YELLOW
-                                else:
-                                    color = Colors.GREEN
-                                
-                                sys.stdout.write(f'\r{color}[{bar}] {progress:3d}% {Colors.WHITE}{message}{Colors.END}')
-                                sys.stdout.flush()
-                                
-                            elif data['type'] == 'complete':
-                                print(f"\n\n{Colors.GREEN}{'🎉' * 20}{Colors.END}")
-                                print(f"{Colors.BOLD}{Colors.GREEN}¡VIDEO VIRAL GENERADO EXITOSAMENTE!{Colors.END}")
-                                print(f"{Colors.GREEN}{'🎉' * 20}{Colors.END}\n")
-                                
-                                print(f"{Colors.WHITE}📁 Archivo: {data['videoPath']}{Colors.END}")
-                                
-                                if 'metadata' in data:
-                                    meta = data['metadata']
-                                    print(f"\n{Colors.CYAN}Metadata:{Colors.END}")
-                                    print(f"  • ID: {meta['scriptId']}")
-                                    print(f"  • Título: {meta['title']}")
-                                    print(f"  • Duración: {meta['duration']}s")
-                                    print(f"  • Views esperadas: {meta['expectedViews']}")
-                                
-                                return data['videoPath']
-                                
-                            elif data['type'] == 'error':
-                                print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
-                                return False
-                                
-                        except json.JSONDecodeError:
-                            pass
+            for data in sse.job_events('GET', url, key):
+                if data['type'] == 'start':
+                    print(f"\n{Colors.GREEN}{data['message']}{Colors.END}")
+                    if 'script' in data:
+                        script = data['script']
+                        print(f"{Colors.YELLOW}Duración: {script['duration']}s{Colors.END}")
+                        print(f"{Colors.YELLOW}Views esperadas: {script['expectedViews']}{Colors.END}")
+                    
+                elif data['type'] == 'progress':
+                    progress = data.get('progress', 0)
+                    message = data.get('message', '')
+                    bar_width = 50
+                    filled = int(bar_width * progress / 100)
+                    bar = '█' * filled + '░' * (bar_width - filled)
+                    
+                    # Color según progreso
+                    if progress < 30:
+                        color = Colors.RED
+                    elif progress < 70:
+                        color = Colors.YELLOW
+                    else:
+                        color = Colors.GREEN
+                    
+                    sys.stdout.write(f'\r{color}[{bar}] {progress:3d}% {Colors.WHITE}{message}{Colors.END}')
+                    sys.stdout.flush()
+                    
+                elif data['type'] == 'complete':
+                    print(f"\n\n{Colors.GREEN}{'🎉' * 20}{Colors.END}")
+                    print(f"{Colors.BOLD}{Colors.GREEN}¡VIDEO VIRAL GENERADO EXITOSAMENTE!{Colors.END}")
+                    print(f"{Colors.GREEN}{'🎉' * 20}{Colors.END}\n")
+                    
+                    print(f"{Colors.WHITE}📁 Archivo: {data['videoPath']}{Colors.END}")
+                    
+                    if 'metadata' in data:
+                        meta = data['metadata']
+                        print(f"\n{Colors.CYAN}Metadata:{Colors.END}")
+                        print(f"  • ID: {meta['scriptId']}")
+                        print(f"  • Título: {meta['title']}")
+                        print(f"  • Duración: {meta['duration']}s")
+                        print(f"  • Views esperadas: {meta['expectedViews']}")
+                    
+                    return data['videoPath']
+                    
+                elif data['type'] == 'error':
+                    print(f"\n\n{Colors.RED}❌ Error: {data['error']}{Colors.END}")
+                    return False
             
             return False
             
+        except SSEHTTPError as e:
+            if e.status == 404:
+                print(f"{Colors.RED}Script no encontrado{Colors.END}")
+            else:
+                print(f"\n{Colors.RED}Error del servidor: {e}{Colors.END}")
+            return False
         except Exception as e:
             print(f"\n{Colors.RED}Error de conexión: {e}{Colors.END}")
             return False
@@ -269,7 +265,8 @@ def main():
     print(f"{Colors.BOLD}{Colors.WHITE}Sistema de Generación de Videos Virales v2.0{Colors.END}")
     print(f"{Colors.CYAN}{'═' * 60}{Colors.END}")
     
-    client = ViralVideoClient()
+    # --regenerate: renderizar de nuevo aunque el servidor ya tenga el video de ese script
+    client = ViralVideoClient(regenerate='--regenerate' in sys.argv[1:])
     
     try:
         client.run()
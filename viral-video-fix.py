@@ -11,6 +11,9 @@ import subprocess
 import time
 from datetime import datetime
 
+import script_store
+from job_workspace import JobWorkspace
+
 # Colores
 class Colors:
     GREEN = '\033[92m'
@@ -22,9 +25,8 @@ class Colors:
     END = '\033[0m'
 
 def load_viral_scripts():
-    """Cargar scripts virales"""
-    with open('data/viral-scripts.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Cargar scripts virales desde el script store"""
+    return script_store.load_viral_scripts()
 
 def prepare_script_segments(script_text, duration):
     """Dividir el script en segmentos para el formato correcto"""
@@ -95,43 +97,56 @@ def save_demo_script(demo_script):
     
     return script_path
 
+def create_job_manifest(viral_script, style_num):
+    """Crear un job con el contenido viral en su manifiesto"""
+    segments = prepare_script_segments(viral_script['script'], viral_script['duration'])
+    segment_duration = viral_script['duration'] / len(segments)
+    
+    synced_data = {
+        "title": viral_script['title'],
+        "segments": [],
+        "totalDuration": viral_script['duration'],
+        "videoStyle": style_num,
+        "brollVideos": [],
+        "metadata": {
+            "scriptId": viral_script['id'],
+            "expectedViews": viral_script['expectedViews'],
+            "tags": viral_script['tags']
+        }
+    }
+    
+    for i, text in enumerate(segments):
+        synced_data['segments'].append({
+            "text": text,
+            "audioFile": f"/tmp/segment_{i}.wav",
+            "duration": segment_duration,
+            "startTime": i * segment_duration,
+            "endTime": (i + 1) * segment_duration,
+            "wordTimings": [],
+            "captions": []
+        })
+    
+    workspace = JobWorkspace.create(f"viral_{viral_script['id']}")
+    workspace.write_manifest(synced_data)
+    return workspace
+
 def generate_with_nodejs(viral_script, style_num):
     """Generar video usando un script Node.js personalizado"""
     
+    # El contenido viral va en el manifiesto de un job propio
+    workspace = create_job_manifest(viral_script, style_num)
+    
     # Crear script Node.js temporal
     node_script = f"""
 const {{ SyncedVideoGenerator }} = require('./dist/video/SyncedVideoGenerator');
-const fs = require('fs');
-const path = require('path');
+const {{ openJobWorkspace }} = require('./dist/utils/jobWorkspace');
 
 async function generateViral() {{
     console.log('🔥 Generating viral video with correct content...');
     
-    // Preparar el contenido viral
-    const viralContent = {{
-        title: "{viral_script['title'].replace('"', '\\"')}",
-        segments: {json.dumps(prepare_script_segments(viral_script['script'], viral_script['duration']))}.map((text, i) => ({{
-            text: text,
-            audioFile: `/tmp/segment_${{i}}.wav`,
-            duration: {viral_script['duration'] / len(prepare_script_segments(viral_script['script'], viral_script['duration']))},
-            startTime: i * {viral_script['duration'] / len(prepare_script_segments(viral_script['script'], viral_script['duration']))},
-            endTime: (i + 1) * {viral_script['duration'] / len(prepare_script_segments(viral_script['script'], viral_script['duration']))},
-            wordTimings: [],
-            captions: []
-        }})),
-        totalDuration: {viral_script['duration']},
-        videoStyle: {style_num},
-        brollVideos: []
-    }};
-    
-    // Guardar en synced-data.json
-    fs.writeFileSync(
-        path.join(__dirname, 'src/remotion/synced-data.json'),
-        JSON.stringify(viralContent, null, 2)
-    );
-    
-    // Generar video
-    const generator = new SyncedVideoGenerator({viral_script['duration']}, {style_num});
+    // Generar video desde el manifiesto del job
+    const workspace = await openJobWorkspace({json.dumps(workspace.manifest_path)});
+    const generator = new SyncedVideoGenerator({viral_script['duration']}, {style_num}, workspace);
     
     generator.on('progress', (data) => {{
         console.log(`[${{data.progress}}%] ${{data.message}}`);
@@ -144,9 +159,8 @@ async function generateViral() {{
 generateViral().catch(console.error);
 """
     
-    # Guardar script temporal
-    script_path = 'output/temp/generate-viral-temp.js'
-    os.makedirs('output/temp', exist_ok=True)
+    # Guardar script temporal en el job (dos ejecuciones no comparten archivo)
+    script_path = workspace.path('generate-viral.js')
     with open(script_path, 'w') as f:
         f.write(node_script)
     
@@ -220,48 +234,15 @@ def main():
     
     print(f"\n{Colors.CYAN}MÉTODO 1: Preparando script para generate.py...{Colors.END}")
     
-    # Preparar el contenido en synced-data.json
-    segments = prepare_script_segments(script['script'], script['duration'])
-    segment_duration = script['duration'] / len(segments)
-    
-    synced_data = {
-        "title": script['title'],
-        "segments": [],
-        "totalDuration": script['duration'],
-        "videoStyle": style_num,
-        "brollVideos": [],
-        "metadata": {
-            "scriptId": script['id'],
-            "expectedViews": script['expectedViews'],
-            "tags": script['tags']
-        }
-    }
-    
-    for i, text in enumerate(segments):
-        synced_data['segments'].append({
-            "text": text,
-            "audioFile": f"/tmp/segment_{i}.wav",
-            "duration": segment_duration,
-            "startTime": i * segment_duration,
-            "endTime": (i + 1) * segment_duration,
-            "wordTimings": [],
-            "captions": []
-        })
-    
-    # Guardar en synced-data.json
-    with open('src/remotion/synced-data.json', 'w', encoding='utf-8') as f:
-        json.dump(synced_data, f, indent=2, ensure_ascii=False)
+    # Preparar el contenido en el manifiesto de un job propio
+    workspace = create_job_manifest(script, style_num)
     
-    print(f"{Colors.GREEN}✅ Contenido viral guardado en synced-data.json{Colors.END}")
-    print(f"\n{Colors.YELLOW}IMPORTANTE:{Colors.END}")
-    print(f"El contenido está listo, pero generate.py lo sobrescribirá con contenido aleatorio.")
-    print(f"\n{Colors.CYAN}Opciones:{Colors.END}")
-    print(f"1. Usar el script TypeScript directamente (recomendado)")
-    print(f"2. Modificar SyncedVideoGenerator.ts para usar contenido existente")
-    print(f"3. Crear un nuevo endpoint que no genere script aleatorio")
+    print(f"{Colors.GREEN}✅ Contenido viral guardado en el job {workspace.id}{Colors.END}")
+    print(f"\n{Colors.CYAN}Para renderizarlo:{Colors.END}")
+    print(f"  python3 generate.py --manifest {workspace.manifest_path}")
     
-    print(f"\n{Colors.GREEN}Archivo preparado: src/remotion/synced-data.json{Colors.END}")
-    print(f"Puedes verificar el contenido y usar Remotion directamente para renderizar.")
+    print(f"\n{Colors.GREEN}Archivo preparado: {workspace.manifest_path}{Colors.END}")
+    print(f"Cada job tiene su propio manifiesto, así que varios pueden generarse a la vez.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file